@@ -0,0 +1,84 @@
+"""
+Shared set-up for the standalone benchmark scripts.
+
+Benchmarks run against a throwaway test database created from the
+configured ``DATABASE_URL`` (an on-disk SQLite file by default, so commit
+costs are realistic), so they never touch real data. Run them from the project root, e.g.::
+
+    python -m benchmarks.bench_import
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+
+
+def setup():
+    """Configure Django for a benchmark run."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "seasonwatch.settings")
+    os.environ.setdefault("DATABASE_URL", "sqlite://:memory:")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Create a migrated test database and destroy it afterwards."""
+    setup()
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    if connection.vendor == "sqlite":
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(
+            tempfile.mkdtemp(), "benchmark.sqlite3"
+        )
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def make_season(username="bench", team_name="Benchmark FC"):
+    """Create a contributor, team and season to load benchmark data into."""
+    from django.contrib.auth.models import User
+    from team.models import Season, Team
+
+    user = User.objects.create_user(username=username)
+    team = Team.objects.create(
+        name=team_name, city="Sheffield", country="England", contributor=user
+    )
+    return Season.objects.create(
+        team=team,
+        contributor=user,
+        start_date=date(2024, 8, 1),
+        end_date=date(2025, 5, 31),
+        competition_list="Championship, FA Cup, League Cup",
+    )
+
+
+def make_tsv_lines(count):
+    """Return a header plus ``count`` realistic TSV match rows."""
+    header = (
+        "date\ttime\tcompetition\tround\topponent\tis_home\t"
+        "team_score\topponent_score\tgoals\tattendance"
+    )
+    lines = [header]
+    for i in range(count):
+        day = date.fromordinal(date(1900, 8, 1).toordinal() + i)
+        lines.append(
+            f"{day}\t15:00\tChampionship\t\tOpponent {i % 23}\t"
+            f"{'H' if i % 2 else 'A'}\t{i % 4}\t{i % 3}\t"
+            f"Smith 45+2, 76, Windass 83\t{20000 + i % 9000}"
+        )
+    return lines
@@ -0,0 +1,98 @@
+"""
+Measure JSON API serialization throughput in matches per second.
+
+Reads and serializes every match of a 10,000-match season (by default)
+as the match list endpoint would, three ways:
+
+* model instances: ``Match`` objects converted to dicts field by field;
+* ``values()``: plain dict rows from :data:`team.api.MATCH_FIELDS`, with
+  no model instantiation, as the API does;
+* ``values()`` with the sparse fieldset
+  ``?fields=date,opponent,team_score,opponent_score``.
+
+Each time covers the query, building the dicts and encoding the JSON
+body, and the gzipped size of each body is reported. Usage::
+
+    python -m benchmarks.bench_api [matches] [repeats]
+"""
+
+import gzip
+import json
+import sys
+from time import perf_counter
+
+from benchmarks._django import make_season, test_database
+from benchmarks.bench_match_rows import make_matches
+
+SPARSE_FIELDS = "date,opponent,team_score,opponent_score"
+
+
+def encode(rows):
+    from django.core.serializers.json import DjangoJSONEncoder
+
+    return json.dumps(
+        {"results": rows}, cls=DjangoJSONEncoder, separators=(",", ":")
+    ).encode()
+
+
+def from_instances(season):
+    from team.api import MATCH_FIELDS
+
+    lookups = MATCH_FIELDS.fields.items()
+    matches = season.match_set.order_by("date", "id")
+    return encode(
+        [
+            {name: getattr(m, lookup) for name, lookup in lookups}
+            for m in matches
+        ]
+    )
+
+
+def from_values(season, fields=None):
+    from team.api import MATCH_FIELDS
+
+    names = MATCH_FIELDS.select(fields)
+    rows = MATCH_FIELDS.values(season.match_set.order_by("date", "id"), names)
+    return encode(list(MATCH_FIELDS.serialize(rows, names)))
+
+
+def timed(label, func, count, repeats):
+    started = perf_counter()
+    for _ in range(repeats):
+        body = func()
+    elapsed = (perf_counter() - started) / repeats
+    print(
+        f"{label:<22}{count / elapsed:12,.0f} matches/s   "
+        f"{len(body) / 1024:8.1f} KiB   "
+        f"{len(gzip.compress(body)) / 1024:7.1f} KiB gzipped"
+    )
+    return elapsed
+
+
+def main(matches=10_000, repeats=5):
+    with test_database():
+        season = make_season()
+        make_matches(season, matches)
+        print(f"matches:              {matches:,}")
+        instances = timed(
+            "model instances:",
+            lambda: from_instances(season),
+            matches,
+            repeats,
+        )
+        values = timed(
+            "values():", lambda: from_values(season), matches, repeats
+        )
+        sparse = timed(
+            "values(), sparse:",
+            lambda: from_values(season, SPARSE_FIELDS),
+            matches,
+            repeats,
+        )
+        print(f"values() speed-up:    {instances / values:8.2f}x")
+        print(f"sparse speed-up:      {instances / sparse:8.2f}x")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
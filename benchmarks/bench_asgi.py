@@ -0,0 +1,157 @@
+"""
+Compare concurrent-request throughput under WSGI and ASGI.
+
+Serves the season page and a match page, alternately, through Django's
+own handlers in this process:
+
+* WSGI: :class:`~django.core.handlers.wsgi.WSGIHandler` called from a
+  pool of ``workers`` threads, the way gunicorn's sync workers each take
+  one request at a time;
+* ASGI: :class:`~django.core.handlers.asgi.ASGIHandler` on one event
+  loop with ``concurrency`` requests in flight, the way a uvicorn worker
+  accepts every open connection.
+
+Each mode uses the ``CONN_MAX_AGE`` the settings default to for it (600
+for WSGI, 0 for ASGI). Every query sleeps for ``latency_ms`` first, to
+stand in for the network round trip to a PostgreSQL server; on a local
+SQLite file queries are so fast that the handlers' own overhead
+dominates. Usage::
+
+    python -m benchmarks.bench_asgi [requests] [concurrency] [workers] \\
+        [latency_ms]
+"""
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter, sleep
+
+from benchmarks._django import make_season, test_database
+from benchmarks.bench_db_connections import make_environ, serve
+from benchmarks.bench_match_rows import make_matches
+
+
+def add_latency(seconds):
+    """Delay every query on every connection opened from now on."""
+    from django.db.backends.signals import connection_created
+
+    def delay(execute, sql, params, many, context):
+        sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if delay not in connection.execute_wrappers:
+            connection.execute_wrappers.append(delay)
+
+    connection_created.connect(install, weak=False)
+
+
+def run_wsgi(paths, cookie, requests, workers):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+    environs = [make_environ(path, cookie) for path in paths]
+
+    def one(i):
+        return serve(handler, dict(environs[i % len(environs)]))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        started = perf_counter()
+        statuses = list(pool.map(one, range(requests)))
+        elapsed = perf_counter() - started
+    assert set(statuses) == {200}, set(statuses)
+    return elapsed
+
+
+async def serve_asgi(handler, path, cookie):
+    """Run one request through ``handler`` and return its status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await handler(scope, receive, send)
+    return messages[0]["status"]
+
+
+async def run_asgi(paths, cookie, requests, concurrency):
+    from django.core.handlers.asgi import ASGIHandler
+
+    handler = ASGIHandler()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with slots:
+            return await serve_asgi(handler, paths[i % len(paths)], cookie)
+
+    started = perf_counter()
+    statuses = await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = perf_counter() - started
+    assert set(statuses) == {200}, set(statuses)
+    return elapsed
+
+
+def main(requests=400, concurrency=32, workers=4, latency_ms=2):
+    with test_database() as connection:
+        from django.core.cache import cache
+        from django.test import Client
+        from django.test.utils import override_settings
+        from django.urls import reverse
+
+        season = make_season()
+        make_matches(season, 100)
+        match = season.match_set.order_by("id").first()
+        client = Client()
+        client.force_login(season.contributor)
+        cookie = f"sessionid={client.cookies['sessionid'].value}"
+        match_url = reverse(
+            "match_detail",
+            args=[season.team.slug, season.slug, match.pk],
+        )
+        paths = [season.get_absolute_url(), match_url]
+        add_latency(latency_ms / 1000)
+        connection.close()
+
+        print(f"database:         {connection.vendor}")
+        print(f"query latency:    {latency_ms} ms")
+        print(f"requests:         {requests:,}")
+        print(f"wsgi workers:     {workers}")
+        print(f"asgi concurrency: {concurrency}")
+
+        settings_dict = connection.settings_dict
+        results = {}
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            for label, max_age in (("wsgi:", 600), ("asgi:", 0)):
+                cache.clear()
+                settings_dict["CONN_MAX_AGE"] = max_age
+                if label == "wsgi:":
+                    elapsed = run_wsgi(paths, cookie, requests, workers)
+                else:
+                    elapsed = asyncio.run(
+                        run_asgi(paths, cookie, requests, concurrency)
+                    )
+                results[label] = requests / elapsed
+                print(f"{label:<18}{results[label]:8.1f} requests/s")
+        print(f"asgi / wsgi:      {results['asgi:'] / results['wsgi:']:8.2f}x")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,108 @@
+"""
+Measure match writes per second, one request per match vs. one batch.
+
+For each batch size (1,000 and 10,000 by default) a fresh season gets:
+
+* per-item: one ``POST`` to the create match form per match, each saved
+  with ``Match.save()`` and its signals (timed on at most 1,000 matches);
+* batch create, update and delete: one ``POST`` of every operation to
+  the batch API, applied with bulk writes in one transaction.
+
+Requests go through Django's test client, so the cost includes
+middleware, authentication and JSON parsing but not the network. Usage::
+
+    python -m benchmarks.bench_batch_api [sizes...]
+"""
+
+import json
+import sys
+from datetime import timedelta
+from time import perf_counter
+
+from benchmarks._django import make_season, test_database
+
+PER_ITEM_LIMIT = 1_000
+
+
+def match_data(season, number):
+    return {
+        "date": str(season.start_date + timedelta(days=number)),
+        "opponent": f"Opponent {number}",
+        "competition": "Championship",
+        "team_score": number % 4,
+        "opponent_score": number % 3,
+        "goals": "Smith 45+2, 76, Windass 83",
+    }
+
+
+def per_item(season, count):
+    from django.test import Client
+    from django.urls import reverse
+
+    client = Client()
+    client.force_login(season.contributor)
+    url = reverse("create_match", args=[season.team.slug, season.slug])
+    started = perf_counter()
+    for number in range(count):
+        response = client.post(url, match_data(season, number))
+        assert response.status_code == 302, response.status_code
+    return count / (perf_counter() - started)
+
+
+def batch(client, season, operations):
+    from django.urls import reverse
+
+    url = reverse("api_match_batch", args=[season.team.slug, season.slug])
+    body = json.dumps({"operations": operations})
+    started = perf_counter()
+    response = client.post(url, body, content_type="application/json")
+    elapsed = perf_counter() - started
+    assert response.status_code == 200, response.content[:200]
+    return json.loads(response.content)["results"], len(operations) / elapsed
+
+
+def main(*sizes):
+    with test_database():
+        from django.test import Client
+
+        for size in sizes or (1_000, 10_000):
+            season = make_season(f"bench{size}", f"Benchmark {size}")
+            client = Client()
+            client.force_login(season.contributor)
+            baseline = per_item(
+                make_season(f"item{size}", f"Item {size}"),
+                min(size, PER_ITEM_LIMIT),
+            )
+
+            results, created = batch(
+                client,
+                season,
+                [
+                    {"op": "create", "data": match_data(season, number)}
+                    for number in range(size)
+                ],
+            )
+            ids = [result["id"] for result in results]
+            _, updated = batch(
+                client,
+                season,
+                [
+                    {"op": "update", "id": pk, "data": {"team_score": 5}}
+                    for pk in ids
+                ],
+            )
+            _, deleted = batch(
+                client, season, [{"op": "delete", "id": pk} for pk in ids]
+            )
+            print(f"operations:       {size:,}")
+            print(f"per-item create:  {baseline:10,.0f} matches/s")
+            print(
+                f"batch create:     {created:10,.0f} matches/s"
+                f"  ({created / baseline:.1f}x)"
+            )
+            print(f"batch update:     {updated:10,.0f} matches/s")
+            print(f"batch delete:     {deleted:10,.0f} matches/s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
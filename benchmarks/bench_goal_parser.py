@@ -0,0 +1,87 @@
+"""
+Measure how many ``Match.goals`` strings the goal parser reads per second.
+
+The uncached parser, the cached per-string entry point and the batch API
+are timed over distinct strings built from the sample seasons in
+``data/``, and over the goals column of those seasons repeated, where
+blanks and repeated strings are common.
+
+Usage::
+
+    python -m benchmarks.bench_goal_parser [strings]
+"""
+
+import csv
+import gc
+import glob
+import sys
+from time import perf_counter
+
+from team.goal_parser import (
+    _check_goals,
+    check_goals,
+    parse_goals,
+    parse_goals_batch,
+)
+
+SCORERS = ["Smith", "Windass", "J. Lowe", "Dele-Bashiru", "Börner"]
+
+
+def sample_goals():
+    """Return the goals column of the sample data, including blanks."""
+    goals = []
+    for path in sorted(glob.glob("data/*.tsv")):
+        with open(path, encoding="utf-8") as file:
+            for row in csv.DictReader(file, delimiter="\t"):
+                goals.append(row.get("goals") or "")
+    return goals or ["Smith 45+2, 76, Windass 83 (pen)"]
+
+
+def make_strings(count):
+    """Return ``count`` distinct goals strings."""
+    samples = [text for text in sample_goals() if text] or ["Smith 9"]
+    return [
+        f"{samples[i % len(samples)]}, {SCORERS[i % len(SCORERS)]} "
+        f"{i % 90 + 1}+{i % 7}, {i}"
+        for i in range(count)
+    ]
+
+
+def measure(label, parse, strings):
+    """Time ``parse(strings)`` and print its throughput."""
+    gc.collect()
+    started = perf_counter()
+    parse(strings)
+    elapsed = perf_counter() - started
+    print(
+        f"{label:<24}{elapsed:8.3f}s  "
+        f"{len(strings) / elapsed:12,.0f} strings/s"
+    )
+
+
+def parse_each(parse):
+    return lambda strings: [parse(text) for text in strings]
+
+
+def main(count=100_000):
+    distinct = make_strings(count)
+    columns = sample_goals()
+    column = (columns * (count // len(columns) + 1))[:count]
+    print(f"strings:                {count:,}")
+
+    print("distinct strings")
+    measure("  uncached:", parse_each(_check_goals), distinct)
+    check_goals.cache_clear()
+    measure("  cached (cold):", parse_each(parse_goals), distinct)
+    measure("  batch:", parse_goals_batch, distinct)
+
+    print(f"sample goals column ({len(set(column)):,} distinct)")
+    measure("  uncached:", parse_each(_check_goals), column)
+    check_goals.cache_clear()
+    measure("  cached:", parse_each(parse_goals), column)
+    measure("  batch:", parse_goals_batch, column)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
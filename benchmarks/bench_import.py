@@ -0,0 +1,54 @@
+"""
+Compare per-row ``Match.objects.create`` with the bulk import engine.
+
+Usage::
+
+    python -m benchmarks.bench_import [rows] [batch_size]
+"""
+
+import sys
+from time import perf_counter
+
+from benchmarks._django import make_season, make_tsv_lines, test_database
+
+
+def per_row_create(season, lines):
+    """Import the rows the way the view did before the bulk engine."""
+    from team.importer import parse_tsv
+    from team.models import Match
+
+    rows, _ = parse_tsv(lines)
+    for fields in rows:
+        Match.objects.create(season=season, **fields)
+    return len(rows)
+
+
+def main(rows=10_000, batch_size=None):
+    with test_database():
+        from team.importer import import_matches
+        from team.models import Match
+
+        lines = make_tsv_lines(rows)
+        season = make_season()
+
+        started = perf_counter()
+        per_row_create(season, lines)
+        naive = perf_counter() - started
+        Match.objects.all().delete()
+
+        result = import_matches(season, lines, batch_size=batch_size)
+
+        print(f"rows:            {rows:,}")
+        print(
+            f"per-row create:  {naive:8.3f}s  " f"{rows / naive:12,.0f} rows/s"
+        )
+        print(
+            f"bulk import:     {result.elapsed:8.3f}s  "
+            f"{result.rows_per_second:12,.0f} rows/s"
+        )
+        print(f"speed-up:        {naive / result.elapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
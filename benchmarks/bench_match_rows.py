@@ -0,0 +1,105 @@
+"""
+Time rendering the season match table with the row fragment cache.
+
+Renders ``team/season_detail.html`` for a 500-row season (by default)
+with an empty cache, then again with every row cached, and reports the
+time per render for each. Finally one row is saved before each render,
+showing the cost of re-rendering a single changed row.
+
+Usage::
+
+    python -m benchmarks.bench_match_rows [rows] [repeats]
+"""
+
+import sys
+from datetime import timedelta
+from time import perf_counter
+
+from benchmarks._django import make_season, test_database
+
+
+def make_matches(season, count):
+    from team.models import Match
+
+    Match.objects.bulk_create(
+        Match(
+            season=season,
+            date=season.start_date + timedelta(days=i),
+            opponent=f"Opponent {i}",
+            is_home=i % 2 == 0,
+            competition="Championship",
+            team_score=i % 4,
+            opponent_score=i % 3,
+            goals="Smith 45+2, 76, Windass 83",
+            attendance=20000 + i,
+        )
+        for i in range(count)
+    )
+
+
+def render_table(season):
+    """Render the season page with all of its matches on one page."""
+    from django.conf import settings
+    from django.template.loader import render_to_string
+    from django.test import RequestFactory
+    from team.forms import MatchFilterForm
+    from team.pagination import KeysetPage
+
+    request = RequestFactory().get(season.get_absolute_url())
+    request.user = season.contributor
+    matches = list(season.match_set.order_by("date", "id"))
+    return render_to_string(
+        "team/season_detail.html",
+        {
+            "season": season,
+            "matches": matches,
+            "page": KeysetPage(items=matches),
+            "filter_form": MatchFilterForm(request.GET, season=season),
+            "row_cache_timeout": settings.MATCH_ROW_CACHE_TIMEOUT,
+        },
+        request=request,
+    )
+
+
+def timed(label, func, repeats):
+    started = perf_counter()
+    for _ in range(repeats):
+        result = func()
+    elapsed = (perf_counter() - started) / repeats
+    print(f"{label:<22}{elapsed * 1000:8.1f} ms/render")
+    return result, elapsed
+
+
+def main(rows=500, repeats=20):
+    with test_database():
+        from django.core.cache import cache
+        from team.models import Match, Season
+
+        season = make_season()
+        make_matches(season, rows)
+        season = Season.objects.select_related("team").get(pk=season.pk)
+        print(f"rows:                 {rows:,}")
+
+        def cold():
+            cache.clear()
+            return render_table(season)
+
+        cold_html, cold_elapsed = timed("cold cache:", cold, repeats)
+        render_table(season)
+        warm_html, warm_elapsed = timed(
+            "warm cache:", lambda: render_table(season), repeats
+        )
+        assert cold_html == warm_html
+
+        def one_edited():
+            match = Match.objects.filter(season=season).first()
+            match.save(update_fields=["attendance"])
+            return render_table(season)
+
+        timed("edit one, render:", one_edited, repeats)
+        print(f"speed-up warm:        {cold_elapsed / warm_elapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
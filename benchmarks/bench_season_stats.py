@@ -0,0 +1,137 @@
+"""
+Compare season statistics computed in Python with the database service.
+
+Builds 1,000 seasons (10 teams of 100 seasons, 46 matches each) and times:
+
+* the naive loop, loading every match and using ``Match.outcome``;
+* :func:`team.stats.season_stats`, one aggregate query per season;
+* :func:`team.stats.stats_by_season`, one aggregate query for all seasons.
+
+Usage::
+
+    python -m benchmarks.bench_season_stats [seasons] [matches_per_season]
+"""
+
+import sys
+from datetime import date, timedelta
+from time import perf_counter
+
+from benchmarks._django import test_database
+
+COMPETITIONS = ["Championship", "Championship", "Championship", "FA Cup"]
+SEASONS_PER_TEAM = 100
+
+
+def make_seasons(count, matches_per_season):
+    """Create ``count`` seasons with their matches; return the seasons."""
+    from django.contrib.auth.models import User
+    from team.models import Match, Season, Team
+
+    user = User.objects.create_user(username="bench")
+    seasons = []
+    for index in range(count):
+        if index % SEASONS_PER_TEAM == 0:
+            team = Team.objects.create(
+                name=f"Benchmark FC {index // SEASONS_PER_TEAM}",
+                city="Sheffield",
+                country="England",
+                contributor=user,
+            )
+        year = 1900 + index % SEASONS_PER_TEAM
+        seasons.append(
+            Season(
+                team=team,
+                contributor=user,
+                start_date=date(year, 8, 1),
+                end_date=date(year + 1, 5, 31),
+            )
+        )
+    for season in seasons:
+        season.save()
+
+    matches = []
+    for season in seasons:
+        for i in range(matches_per_season):
+            played = i < matches_per_season - 2
+            matches.append(
+                Match(
+                    season=season,
+                    date=season.start_date + timedelta(days=i * 6),
+                    opponent=f"Opponent {i}",
+                    is_home=i % 2 == 0,
+                    competition=COMPETITIONS[i % len(COMPETITIONS)],
+                    team_score=i % 4 if played else None,
+                    opponent_score=i % 3 if played else None,
+                )
+            )
+    Match.objects.bulk_create(matches, batch_size=2000)
+    return seasons
+
+
+def naive_stats(season):
+    """Compute a season's stats by loading and looping over its matches."""
+    from team.stats import Record, SeasonStats
+
+    stats = SeasonStats()
+    for match in season.match_set.order_by("competition"):
+        outcome = match.outcome
+        if not outcome:
+            continue
+        stats.add(
+            match.competition,
+            match.is_home,
+            Record(
+                1,
+                int(outcome == "W"),
+                int(outcome == "D"),
+                int(outcome == "L"),
+                match.team_score,
+                match.opponent_score,
+            ),
+        )
+    return stats
+
+
+def timed(label, func, count):
+    started = perf_counter()
+    result = func()
+    elapsed = perf_counter() - started
+    print(f"{label:<26}{elapsed:8.3f}s  {count / elapsed:10,.0f} seasons/s")
+    return result, elapsed
+
+
+def main(seasons=1000, matches_per_season=46):
+    with test_database():
+        from team.stats import season_stats, stats_by_season
+
+        season_list = make_seasons(seasons, matches_per_season)
+        print(f"seasons:                  {seasons:,}")
+        print(f"matches:                  {seasons * matches_per_season:,}")
+
+        naive, naive_elapsed = timed(
+            "python loop:",
+            lambda: [naive_stats(season) for season in season_list],
+            seasons,
+        )
+        per_season, per_season_elapsed = timed(
+            "aggregate per season:",
+            lambda: [season_stats(season) for season in season_list],
+            seasons,
+        )
+        grouped, grouped_elapsed = timed(
+            "aggregate all seasons:",
+            lambda: stats_by_season(season_list),
+            seasons,
+        )
+        assert naive == per_season == list(grouped.values())
+        print(
+            f"speed-up per season:      {naive_elapsed / per_season_elapsed:8.1f}x"
+        )
+        print(
+            f"speed-up all seasons:     {naive_elapsed / grouped_elapsed:8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
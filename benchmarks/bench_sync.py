@@ -0,0 +1,75 @@
+"""
+Compare a full download with a delta sync as the dataset grows.
+
+For seasons of 1,000, 10,000 and 100,000 matches (by default), reports
+the time to read every match through the changes endpoint without a
+cursor, following ``more`` page by page, and then the time of a delta
+sync after 10 matches are edited and 10 deleted. The delta should stay
+flat while the full download grows with the data. Usage::
+
+    python -m benchmarks.bench_sync [sizes...]
+"""
+
+import json
+import sys
+from time import perf_counter
+
+from benchmarks._django import make_season, test_database
+from benchmarks.bench_match_rows import make_matches
+
+CHANGED = 10
+
+
+def sync(client, cursor=None):
+    """Follow the changes endpoint until ``more`` is false."""
+    from django.urls import reverse
+
+    url = reverse("api_changes")
+    rows = 0
+    started = perf_counter()
+    while True:
+        params = {"limit": 500}
+        if cursor:
+            params["since"] = cursor
+        data = json.loads(client.get(url, params).content)
+        rows += len(data["matches"]) + len(data["deleted"])
+        cursor = data["cursor"]
+        if not data["more"]:
+            return cursor, rows, perf_counter() - started
+
+
+def main(*sizes):
+    with test_database():
+        from django.test import Client
+        from django.test.utils import override_settings
+        from team.bulk import write_matches
+
+        with override_settings(SYNC_SETTLE_SECONDS=0):
+            for size in sizes or (1_000, 10_000, 100_000):
+                season = make_season(f"bench{size}", f"Benchmark {size}")
+                make_matches(season, size)
+                client = Client()
+                client.force_login(season.contributor)
+                cursor, rows, full = sync(client)
+
+                matches = list(season.match_set.order_by("?")[: 2 * CHANGED])
+                for match in matches[:CHANGED]:
+                    match.attendance = 1
+                write_matches(
+                    season,
+                    changed=[(m, ["attendance"]) for m in matches[:CHANGED]],
+                    deleted=matches[CHANGED:],
+                )
+                _, changed, delta = sync(client, cursor)
+                print(f"matches:          {size:,}")
+                print(
+                    f"full download:    {full * 1000:10.1f} ms  ({rows:,} rows)"
+                )
+                print(
+                    f"delta sync:       {delta * 1000:10.1f} ms  "
+                    f"({changed:,} rows)"
+                )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
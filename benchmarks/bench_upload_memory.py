@@ -0,0 +1,88 @@
+"""
+Measure peak RSS while parsing uploads of increasing size.
+
+Each measurement runs in a fresh subprocess, because peak RSS only ever
+grows within a process. The figures are the growth in peak RSS over the
+process's footprint once Django is loaded. ``read`` is the old whole-file path
+(``file.read().decode().splitlines()``); ``stream`` decodes the upload
+chunk by chunk with :func:`team.importer.iter_text_lines`.
+
+Usage::
+
+    python -m benchmarks.bench_upload_memory [rows ...]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+DEFAULT_SIZES = [10_000, 100_000, 500_000]
+
+
+def peak_rss_mb():
+    """Return this process's peak resident set size in MiB."""
+    try:
+        # Unlike ru_maxrss, VmHWM is not inherited from the parent process.
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and KiB elsewhere.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def measure(mode, path):
+    """Parse the file at ``path`` and print the RSS growth in MiB."""
+    from benchmarks._django import setup
+
+    setup()
+    from django.core.files.uploadedfile import UploadedFile
+    from team.importer import iter_text_lines, iter_tsv
+
+    baseline = peak_rss_mb()
+    with open(path, "rb") as fh:
+        size = os.path.getsize(path)
+        file = UploadedFile(fh, name="matches.tsv", size=size)
+        if mode == "read":
+            lines = file.read().decode("utf-8").splitlines()
+        else:
+            lines = iter_text_lines(file)
+        for _ in iter_tsv(lines):
+            pass
+    print(peak_rss_mb() - baseline)
+
+
+def main(sizes):
+    from benchmarks._django import make_tsv_lines
+
+    print(f"{'rows':>10} {'size MiB':>9} {'read MiB':>9} {'stream MiB':>11}")
+    for rows in sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".tsv") as tmp:
+            tmp.write("\n".join(make_tsv_lines(rows)))
+            tmp.flush()
+            results = []
+            for mode in ("read", "stream"):
+                out = subprocess.run(
+                    [sys.executable, "-m", __spec__.name, mode, tmp.name],
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                )
+                results.append(float(out.stdout))
+            size = os.path.getsize(tmp.name) / (1024 * 1024)
+            print(
+                f"{rows:>10,} {size:>9.1f} "
+                f"{results[0]:>9.1f} {results[1]:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] in ("read", "stream"):
+        measure(sys.argv[1], sys.argv[2])
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
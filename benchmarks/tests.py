@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+# Each benchmark with arguments small enough to run in a few seconds.
+SMOKE_RUNS = {
+    "bench_api": ["20", "1"],
+    "bench_asgi": ["8", "2", "2", "0"],
+    "bench_batch_api": ["5"],
+    "bench_db_connections": ["5"],
+    "bench_goal_parser": ["100"],
+    "bench_import": ["50"],
+    "bench_match_rows": ["20", "1"],
+    "bench_season_stats": ["3", "5"],
+    "bench_sync": ["30"],
+    "bench_upload_memory": ["100"],
+}
+
+
+class TestBenchmarksRun(SimpleTestCase):
+    """Run every benchmark on a tiny dataset, so changes cannot break one."""
+
+    def test_every_benchmark_is_covered(self):
+        """Each benchmark script has a smoke run."""
+        scripts = {
+            name[:-3]
+            for name in os.listdir(os.path.dirname(__file__))
+            if name.startswith("bench_") and name.endswith(".py")
+        }
+        self.assertEqual(scripts, set(SMOKE_RUNS))
+
+    def test_benchmarks_run(self):
+        """Each benchmark exits cleanly on a tiny dataset."""
+        env = {
+            key: value
+            for key, value in os.environ.items()
+            if key not in ("DATABASE_URL", "DJANGO_SETTINGS_MODULE")
+        }
+        for name, args in SMOKE_RUNS.items():
+            with self.subTest(benchmark=name):
+                result = subprocess.run(
+                    [sys.executable, "-m", f"benchmarks.{name}", *args],
+                    cwd=settings.BASE_DIR,
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    timeout=300,
+                )
+                self.assertEqual(result.returncode, 0, result.stderr)
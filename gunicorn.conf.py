@@ -0,0 +1,20 @@
+"""
+Gunicorn configuration, read automatically when ``gunicorn`` is started
+from the project root (see the ``Procfile``).
+
+``SERVER_MODE=wsgi`` (the default) serves :mod:`seasonwatch.wsgi` with
+gunicorn's sync workers. ``SERVER_MODE=asgi`` serves
+:mod:`seasonwatch.asgi` with uvicorn workers, so the async views can
+wait on the database without holding a worker. ``WEB_CONCURRENCY`` sets
+the number of worker processes in either mode.
+"""
+
+import os
+
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+
+if SERVER_MODE == "asgi":
+    wsgi_app = "seasonwatch.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "seasonwatch.wsgi:application"
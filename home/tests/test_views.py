@@ -1,7 +1,9 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth.models import User
-from team.models import Team, Season
+from team.models import Team, Season, Match
 import datetime
 
 
@@ -47,3 +49,54 @@ class TestHomeViews(TestCase):
         self.assertEqual(response.context["team"], team)
         self.assertIn("seasons", response.context)
         self.assertIn(season, response.context["seasons"])
+
+
+class TestDashboardQueries(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        self.client.login(username="testuser", password="testpass")
+        self.team = Team.objects.create(
+            name="Test Team",
+            city="Nowhere",
+            country="Neverland",
+            contributor=self.user,
+        )
+
+    def add_seasons(self, count):
+        existing = Season.objects.count()
+        for year in range(1900 + existing, 1900 + existing + count):
+            season = Season.objects.create(
+                team=self.team,
+                contributor=self.user,
+                start_date=datetime.date(year, 8, 1),
+                end_date=datetime.date(year + 1, 5, 20),
+            )
+            Match.objects.create(
+                season=season,
+                date=datetime.date(year, 8, 10),
+                opponent="Rivals",
+                team_score=2,
+                opponent_score=1,
+            )
+
+    def count_dashboard_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_seasons(self):
+        """The dashboard issues the same queries for 1 or 30 seasons."""
+        self.add_seasons(1)
+        one_season = self.count_dashboard_queries()
+        self.add_seasons(29)
+        self.assertEqual(self.count_dashboard_queries(), one_season)
+
+    def test_season_cards_show_records(self):
+        """Each season card shows its record from the stored summary."""
+        self.add_seasons(1)
+        response = self.client.get(reverse("dashboard"))
+        self.assertContains(response, "P1 · W1 · D0 · L0")
+        self.assertContains(response, "Goals 2–1 · 3 pts")
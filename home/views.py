@@ -1,10 +1,47 @@
-from django.contrib.auth.decorators import login_required
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
+from seasonwatch.decorators import login_required
+from team.caches import season_list_cache, season_list_version
 from team.models import Season, Team
 
 
+def dashboard_seasons(user):
+    """
+    Return the user's seasons with their team and summary joined in.
+
+    Everything the dashboard shows for a season, including its record from
+    :model:`team.SeasonSummary`, comes from this one query, however many
+    seasons there are.
+    """
+    return (
+        Season.objects.filter(contributor=user)
+        .select_related("team", "summary")
+        .order_by("-start_date")
+    )
+
+
+def dashboard_data(user):
+    """
+    Return the user's first team and their seasons, cached.
+
+    Entries are keyed on the user's id and join time, so a reused id never
+    sees another account's entry, and on :func:`team.caches.season_list_version`,
+    so any change to the user's teams, seasons or matches is seen at once.
+    """
+    version = season_list_version(user)
+    return season_list_cache.get_or_set(
+        user.pk,
+        user.date_joined.timestamp(),
+        version.timestamp() if version else 0,
+        compute=lambda: {
+            "team": Team.objects.filter(contributor=user).first(),
+            "seasons": list(dashboard_seasons(user)),
+        },
+    )
+
+
 @login_required
-def dashboard_view(request):
+async def dashboard_view(request):
     """
     Display the contributor's dashboard view.
 
@@ -13,25 +50,18 @@ def dashboard_view(request):
     ``team``
         The first :model:`team.Team` instance belonging to the logged-in user.
     ``seasons``
-        A queryset of :model:`team.Season` instances linked to the logged-in user,
-        ordered by descending start date.
+        A list of :model:`team.Season` instances linked to the logged-in user,
+        ordered by descending start date, with their :model:`team.Team` and
+        :model:`team.SeasonSummary` loaded in the same query.
+
+    Both are cached by :func:`dashboard_data`.
 
     **Template:**
 
     :template:`home/dashboard.html`
     """
-    team = Team.objects.filter(contributor=request.user).first()
-    seasons = Season.objects.filter(contributor=request.user).order_by(
-        "-start_date"
-    )
-    return render(
-        request,
-        "home/dashboard.html",
-        {
-            "team": team,
-            "seasons": seasons,
-        },
-    )
+    data = await sync_to_async(dashboard_data)(request.user)
+    return await sync_to_async(render)(request, "home/dashboard.html", data)
 
 
 def home_view(request):
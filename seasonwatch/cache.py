@@ -0,0 +1,123 @@
+"""
+Project cache API for expensive reads.
+
+A :class:`CacheNamespace` groups related entries under a common prefix.
+Keys are built from parts, which should include a version of the data
+they describe (e.g. :meth:`team.models.Season.etag`), so a changed
+object is simply looked up under a new key. A namespace also has a
+generation, replaced by :meth:`CacheNamespace.invalidate`, which retires
+every entry in it at once when no per-object version is available.
+
+:meth:`CacheNamespace.get_or_set` protects against cache stampedes: when
+a value is missing, only the process holding a short-lived lock computes
+it; others wait for it to appear, for up to ``settings.CACHE_LOCK_TIMEOUT``
+seconds, before computing it themselves.
+
+All backends configured through ``CACHE_URL`` are supported, since only
+``get``, ``set``, ``add`` and ``delete`` are used.
+"""
+
+import uuid
+from time import monotonic, sleep
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+_MISSING = object()
+POLL_INTERVAL = 0.05
+
+
+class CacheNamespace:
+    """
+    A named group of cache entries with versioned keys.
+
+    ``timeout`` is the default lifetime of entries, in seconds, falling
+    back to the cache's own default.
+    """
+
+    def __init__(
+        self, name, timeout=DEFAULT_TIMEOUT, alias=DEFAULT_CACHE_ALIAS
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def _generation_key(self):
+        return f"{self.name}:generation"
+
+    def generation(self):
+        """Return the namespace's current generation, starting one if needed."""
+        key = self._generation_key
+        generation = self.cache.get(key)
+        if generation is None:
+            self.cache.add(key, uuid.uuid4().hex, None)
+            generation = self.cache.get(key)
+        return generation
+
+    def invalidate(self):
+        """Retire every entry in the namespace by starting a new generation."""
+        self.cache.set(self._generation_key, uuid.uuid4().hex, None)
+
+    def key(self, *parts):
+        """Return the full cache key for ``parts`` in this generation."""
+        return ":".join(
+            [self.name, self.generation(), *(str(part) for part in parts)]
+        )
+
+    def get(self, *parts, default=None):
+        """Return the value cached for ``parts``, or ``default``."""
+        return self.cache.get(self.key(*parts), default)
+
+    def set(self, *parts, value, timeout=DEFAULT_TIMEOUT):
+        """Cache ``value`` for ``parts``."""
+        self._set(self.key(*parts), value, timeout)
+
+    def delete(self, *parts):
+        """Remove the value cached for ``parts``."""
+        self.cache.delete(self.key(*parts))
+
+    def _set(self, key, value, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.timeout
+        self.cache.set(key, value, timeout)
+
+    def get_or_set(self, *parts, compute, timeout=DEFAULT_TIMEOUT):
+        """
+        Return the value cached for ``parts``, calling ``compute`` on a miss.
+
+        Concurrent misses for the same key are collapsed: one caller takes
+        a lock and computes the value while the others wait for it. A
+        caller that waits longer than ``settings.CACHE_LOCK_TIMEOUT``
+        computes the value itself without storing it.
+        """
+        key = self.key(*parts)
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        lock_key = f"{key}:lock"
+        lock_timeout = settings.CACHE_LOCK_TIMEOUT
+        if self.cache.add(lock_key, 1, lock_timeout):
+            try:
+                value = compute()
+                self._set(key, value, timeout)
+            finally:
+                self.cache.delete(lock_key)
+            return value
+
+        deadline = monotonic() + lock_timeout
+        while monotonic() < deadline:
+            sleep(POLL_INTERVAL)
+            value = self.cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            if self.cache.get(lock_key) is None:
+                break
+        value = self.cache.get(key, _MISSING)
+        return compute() if value is _MISSING else value
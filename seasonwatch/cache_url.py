@@ -0,0 +1,69 @@
+"""
+Build a ``CACHES`` entry from a URL, as ``dj_database_url`` does for
+``DATABASES``.
+
+Supported URLs:
+
+* ``locmem://`` or ``locmem://<name>``: a cache private to each process;
+* ``file:///absolute/path``: a directory shared by processes on one host;
+* ``redis://host:port/db`` or ``rediss://...``: a Redis-protocol server
+  shared by every process (needs the ``redis`` package);
+* ``dummy://``: no caching at all.
+
+Query parameters set common options: ``timeout`` (seconds, or ``none``
+to never expire), ``max_entries``, ``key_prefix`` and, for locmem and
+file caches, ``cull_frequency``.
+
+This module must not import Django, since it is used from the settings.
+"""
+
+from urllib.parse import parse_qs, urlsplit
+
+BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "rediss": "django.core.cache.backends.redis.RedisCache",
+    "dummy": "django.core.cache.backends.dummy.DummyCache",
+}
+DEFAULT_MAX_ENTRIES = 20000
+
+
+def parse(url):
+    """Return the ``CACHES`` entry described by ``url``."""
+    parts = urlsplit(url)
+    scheme = parts.scheme
+    if scheme not in BACKENDS:
+        raise ValueError(
+            f"Unsupported cache URL scheme '{scheme}' in {url!r}; use one "
+            f"of {', '.join(sorted(BACKENDS))}."
+        )
+    params = {
+        name: values[-1] for name, values in parse_qs(parts.query).items()
+    }
+    config = {"BACKEND": BACKENDS[scheme]}
+    options = {}
+
+    if scheme == "locmem":
+        config["LOCATION"] = parts.netloc or parts.path.strip("/")
+    elif scheme == "file":
+        if not parts.path:
+            raise ValueError(f"File cache URL {url!r} has no path.")
+        config["LOCATION"] = parts.path
+    elif scheme in ("redis", "rediss"):
+        config["LOCATION"] = parts._replace(query="", fragment="").geturl()
+
+    if scheme in ("locmem", "file"):
+        options["MAX_ENTRIES"] = int(
+            params.get("max_entries", DEFAULT_MAX_ENTRIES)
+        )
+        if "cull_frequency" in params:
+            options["CULL_FREQUENCY"] = int(params["cull_frequency"])
+    if "timeout" in params:
+        timeout = params["timeout"]
+        config["TIMEOUT"] = None if timeout.lower() == "none" else int(timeout)
+    if "key_prefix" in params:
+        config["KEY_PREFIX"] = params["key_prefix"]
+    if options:
+        config["OPTIONS"] = options
+    return config
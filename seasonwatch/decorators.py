@@ -0,0 +1,38 @@
+"""
+View decorators that work on both sync and async views.
+
+Django 4.2's own decorators only wrap synchronous views. These delegate
+to them for sync views and provide equivalent coroutine wrappers for
+``async def`` views, so the same decorator can be used whichever kind of
+view it is applied to.
+"""
+
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth.decorators import (
+    login_required as sync_login_required,
+)
+from django.contrib.auth.views import redirect_to_login
+
+
+def login_required(view):
+    """
+    Redirect anonymous users to the login page, as Django's decorator does.
+
+    For async views the user is loaded from the session in a thread, so
+    the view can then read ``request.user`` without database access.
+    """
+    if not iscoroutinefunction(view):
+        return sync_login_required(view)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        is_authenticated = await sync_to_async(
+            lambda: request.user.is_authenticated
+        )()
+        if not is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+
+    return wrapper
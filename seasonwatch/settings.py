@@ -14,6 +14,9 @@ from pathlib import Path
 import os
 import sys
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
+
+from seasonwatch import cache_url
 
 if os.path.isfile("env.py"):
     import env
@@ -94,6 +97,15 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "seasonwatch.wsgi.application"
+ASGI_APPLICATION = "seasonwatch.asgi.application"
+
+# "wsgi" (default) or "asgi"; read by gunicorn.conf.py to choose the
+# worker class, and here to pick defaults that suit it.
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+if SERVER_MODE not in ("wsgi", "asgi"):
+    raise ImproperlyConfigured(
+        f"Unknown SERVER_MODE '{SERVER_MODE}'; use 'wsgi' or 'asgi'."
+    )
 
 
 # Database
@@ -106,7 +118,40 @@ WSGI_APPLICATION = "seasonwatch.wsgi.application"
 #     }
 # }
 
-DATABASES = {"default": dj_database_url.parse(os.environ.get("DATABASE_URL"))}
+# Connections are kept open between requests for DATABASE_CONN_MAX_AGE
+# seconds (0 closes them after every request) and checked before reuse, so
+# a connection dropped by the server is replaced instead of failing the
+# request. Each gunicorn worker holds at most one connection.
+#
+# Under ASGI, Django runs ORM calls in per-request threads whose
+# connections are not returned between requests, so persistent
+# connections default to off there; use DATABASE_POOL instead.
+#
+# With DATABASE_POOL=pgbouncer, DATABASE_URL points at a PgBouncer (or
+# other transaction-mode pooler) shared by all workers. Server-side cursors
+# do not survive transaction pooling, so they are disabled and
+# QuerySet.iterator() fetches in chunks on the client instead.
+
+DATABASE_CONN_MAX_AGE = int(
+    os.environ.get(
+        "DATABASE_CONN_MAX_AGE", 0 if SERVER_MODE == "asgi" else 600
+    )
+)
+DATABASE_POOL = os.environ.get("DATABASE_POOL", "")
+
+DATABASES = {
+    "default": dj_database_url.parse(
+        os.environ.get("DATABASE_URL"), conn_max_age=DATABASE_CONN_MAX_AGE
+    )
+}
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+if DATABASE_POOL == "pgbouncer":
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+elif DATABASE_POOL:
+    raise ImproperlyConfigured(
+        f"Unknown DATABASE_POOL '{DATABASE_POOL}'; use 'pgbouncer' or leave "
+        "it unset."
+    )
 
 if "test" in sys.argv:
     DATABASES["default"]["ENGINE"] = "django.db.backends.sqlite3"
@@ -156,3 +201,73 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Match import
+# Number of rows written per INSERT when bulk loading TSV data.
+
+MATCH_IMPORT_BATCH_SIZE = int(os.environ.get("MATCH_IMPORT_BATCH_SIZE", 500))
+
+# Uploads larger than this many bytes are queued for the background worker
+# (``manage.py run_import_worker``) instead of being imported in the request.
+
+MATCH_IMPORT_BACKGROUND_THRESHOLD = int(
+    os.environ.get("MATCH_IMPORT_BACKGROUND_THRESHOLD", 1024 * 1024)
+)
+
+# A running import job whose worker has not reported in for this many
+# seconds is presumed dead and claimed again, up to MATCH_IMPORT_JOB_ATTEMPTS
+# claims in all.
+
+MATCH_IMPORT_JOB_TIMEOUT = int(os.environ.get("MATCH_IMPORT_JOB_TIMEOUT", 900))
+MATCH_IMPORT_JOB_ATTEMPTS = int(os.environ.get("MATCH_IMPORT_JOB_ATTEMPTS", 3))
+
+# Zip archives of season files: the largest total uncompressed size
+# accepted, and the number of processes used to parse the files (0 means
+# one per CPU).
+
+MATCH_ARCHIVE_MAX_SIZE = int(
+    os.environ.get("MATCH_ARCHIVE_MAX_SIZE", 50 * 1024 * 1024)
+)
+MATCH_IMPORT_PARSE_WORKERS = int(
+    os.environ.get("MATCH_IMPORT_PARSE_WORKERS", 0)
+)
+
+# Batches of match changes posted to the API: the largest request body in
+# bytes, and the most operations, accepted in one batch.
+
+MATCH_BATCH_MAX_SIZE = int(
+    os.environ.get("MATCH_BATCH_MAX_SIZE", 10 * 1024 * 1024)
+)
+MATCH_BATCH_MAX_OPERATIONS = int(
+    os.environ.get("MATCH_BATCH_MAX_OPERATIONS", 10_000)
+)
+
+# Delta sync (``/api/v1/changes/``): cursors never move past rows changed
+# in the last SYNC_SETTLE_SECONDS, so writes still being committed are
+# sent on the next sync rather than skipped; tombstones of deleted rows are
+# kept for SYNC_TOMBSTONE_DAYS, after which older cursors must resync.
+
+SYNC_SETTLE_SECONDS = int(os.environ.get("SYNC_SETTLE_SECONDS", 60))
+SYNC_TOMBSTONE_DAYS = int(os.environ.get("SYNC_TOMBSTONE_DAYS", 90))
+
+# Cache
+# ``CACHE_URL`` selects the backend: ``locmem://`` (the default, private to
+# each process), ``file:///path`` (shared on one host) or
+# ``redis://host:6379/0`` (shared by every worker). See
+# ``seasonwatch/cache_url.py`` for the options. Rendered match rows are
+# cached one entry per row, so local caches hold up to 20,000 entries
+# rather than Django's default of 300.
+
+CACHES = {"default": cache_url.parse(os.environ.get("CACHE_URL", "locmem://"))}
+
+# Seconds cached reads made through ``seasonwatch.cache`` wait for another
+# process already computing the same value, before computing it too.
+
+CACHE_LOCK_TIMEOUT = int(os.environ.get("CACHE_LOCK_TIMEOUT", 10))
+
+# Seconds a rendered row of the season match table stays cached. Rows are
+# keyed on the match version, so edits show at once whatever the timeout.
+
+MATCH_ROW_CACHE_TIMEOUT = int(
+    os.environ.get("MATCH_ROW_CACHE_TIMEOUT", 60 * 60 * 24)
+)
@@ -22,5 +22,6 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("accounts/", include("allauth.urls")),
     path("team/", include("team.urls")),
+    path("api/v1/", include("team.api_urls")),
     path("", include("home.urls")),
 ]
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Team, Season, Match
+from .models import Team, Season, Match, GoalEvent, ImportJob, Tombstone
 
 
 @admin.register(Team)
@@ -32,3 +32,30 @@ class MatchAdmin(admin.ModelAdmin):
     list_display = ("date", "opponent", "season", "competition", "is_home")
     list_filter = ("season", "is_home")
     search_fields = ("opponent", "competition")
+
+
+@admin.register(GoalEvent)
+class GoalEventAdmin(admin.ModelAdmin):
+    list_display = ("scorer", "minute", "stoppage", "match", "season")
+    list_filter = ("season", "is_penalty", "is_own_goal")
+    search_fields = ("scorer",)
+    list_select_related = ("match__season__team", "season__team")
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "season",
+        "contributor",
+        "status",
+        "rows_processed",
+        "created_at",
+    )
+    list_filter = ("status",)
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ("kind", "object_id", "contributor", "deleted_at")
+    list_filter = ("kind",)
@@ -0,0 +1,426 @@
+"""
+Read-only JSON API for teams, seasons and matches (version 1).
+
+Every resource is read with ``QuerySet.values()``, so responses are built
+from plain dicts without instantiating models. Clients choose the fields
+they need with ``?fields=a,b,c``; only those columns are selected. Lists
+are paginated with keyset cursors (see :mod:`team.pagination`) and return
+``{"results": [...], "next": url, "previous": url}``.
+
+Responses carry an ``ETag`` and are gzipped for clients that accept it.
+Season, match list and match responses take their ``ETag`` from the
+season's version stamp, so an unchanged season is answered with 304 Not
+Modified after one indexed lookup. As in the HTML views, only the
+logged-in user's own teams are visible.
+
+The one write endpoint, :func:`match_batch_api`, applies a batch of match
+creates, updates and deletes in one transaction (see :mod:`team.bulk`).
+:func:`changes_api` returns what changed since a client's last sync (see
+:mod:`team.sync`).
+"""
+
+from dataclasses import dataclass, field
+from functools import wraps
+
+import json
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.http import Http404, JsonResponse
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import (
+    conditional_page,
+    require_POST,
+    require_safe,
+)
+
+from .bulk import BatchInvalid, apply_batch
+from .forms import MatchFilterForm
+from .models import Match, Season, Team, Tombstone
+from .pagination import InvalidCursor, paginate_keyset
+from .resolvers import resolve_route, route_queryset, season_condition
+from .sync import CursorExpired, read_changes
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class InvalidParameter(ValueError):
+    """Raised for a query string parameter the API cannot honour."""
+
+
+def _competitions(value):
+    return [c.strip() for c in value.split(",") if c.strip()]
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    """
+    The fields of one API resource.
+
+    ``fields`` maps each API field name to the ``values()`` lookup it is
+    read from; ``converters`` optionally maps a field name to a function
+    applied to the value read.
+    """
+
+    fields: dict
+    converters: dict = field(default_factory=dict)
+
+    def select(self, value):
+        """
+        Return the field names requested by a ``?fields=`` value.
+
+        Every field is returned when ``value`` is empty. Raises
+        :class:`InvalidParameter` for an unknown name.
+        """
+        if not value:
+            return list(self.fields)
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise InvalidParameter(
+                f"Unknown field(s): {', '.join(unknown)}. Choose from: "
+                f"{', '.join(self.fields)}."
+            )
+        return list(dict.fromkeys(names))
+
+    def values(self, queryset, names, extra=()):
+        """Return ``queryset.values()`` reading ``names`` and ``extra``."""
+        lookups = [self.fields[name] for name in names]
+        return queryset.values(*dict.fromkeys([*lookups, *extra]))
+
+    def serialize(self, rows, names):
+        """Yield each ``values()`` row as a dict of the fields in ``names``."""
+        columns = [
+            (name, self.fields[name], self.converters.get(name))
+            for name in names
+        ]
+        for row in rows:
+            yield {
+                name: convert(row[lookup]) if convert else row[lookup]
+                for name, lookup, convert in columns
+            }
+
+
+TEAM_FIELDS = Fieldset(
+    {
+        "id": "id",
+        "slug": "slug",
+        "name": "name",
+        "short_name": "short_name",
+        "city": "city",
+        "country": "country",
+        "is_public": "is_public",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
+)
+SEASON_FIELDS = Fieldset(
+    {
+        "id": "id",
+        "team": "team_id",
+        "slug": "slug",
+        "start_date": "start_date",
+        "end_date": "end_date",
+        "competitions": "competition_list",
+        "version": "version",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+        "played": "summary__played",
+        "won": "summary__won",
+        "drawn": "summary__drawn",
+        "lost": "summary__lost",
+        "goals_for": "summary__goals_for",
+        "goals_against": "summary__goals_against",
+    },
+    converters={"competitions": _competitions},
+)
+MATCH_FIELDS = Fieldset(
+    {
+        "id": "id",
+        "season": "season_id",
+        "date": "date",
+        "time": "time",
+        "competition": "competition",
+        "round": "round",
+        "opponent": "opponent",
+        "is_home": "is_home",
+        "team_score": "team_score",
+        "opponent_score": "opponent_score",
+        "goals": "goals",
+        "attendance": "attendance",
+        "version": "version",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
+)
+TOMBSTONE_FIELDS = Fieldset(
+    {"type": "kind", "id": "object_id", "deleted_at": "deleted_at"}
+)
+
+
+def _json(data, status=200):
+    return JsonResponse(
+        data, status=status, json_dumps_params={"separators": (",", ":")}
+    )
+
+
+def _error(status, message):
+    return _json({"error": message}, status=status)
+
+
+def _json_errors(view):
+    """Refuse anonymous users and report errors as JSON."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return _error(401, "Authentication required.")
+        try:
+            return view(request, *args, **kwargs)
+        except Http404:
+            return _error(404, "Not found.")
+        except InvalidParameter as e:
+            return _error(400, str(e))
+        except InvalidCursor:
+            return _error(400, "Invalid cursor.")
+        except CursorExpired:
+            return _error(410, "The cursor has expired; sync from scratch.")
+
+    return wrapper
+
+
+def api_view(view):
+    """
+    Serve ``view`` as a read-only API endpoint.
+
+    Only GET and HEAD are allowed. Anonymous requests get 401, and
+    missing objects and bad parameters get 404 and 400, all as JSON.
+    Responses get an ``ETag`` (from the body unless the view set one),
+    304 when it matches ``If-None-Match``, and gzip.
+    """
+    return gzip_page(require_safe(_json_errors(conditional_page(view))))
+
+
+def _page_size(request):
+    value = request.GET.get("limit")
+    if not value:
+        return PAGE_SIZE
+    try:
+        size = int(value)
+    except ValueError:
+        size = 0
+    if not 1 <= size <= MAX_PAGE_SIZE:
+        raise InvalidParameter(
+            f"limit must be a whole number from 1 to {MAX_PAGE_SIZE}."
+        )
+    return size
+
+
+def _page_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query["cursor"] = cursor
+    return request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+
+
+def _list(request, queryset, fieldset, ordering):
+    names = fieldset.select(request.GET.get("fields"))
+    keys = [name.lstrip("-") for name in ordering]
+    page = paginate_keyset(
+        fieldset.values(queryset, names, extra=keys),
+        ordering,
+        cursor=request.GET.get("cursor"),
+        page_size=_page_size(request),
+    )
+    return _json(
+        {
+            "results": list(fieldset.serialize(page.items, names)),
+            "next": _page_url(request, page.next_cursor),
+            "previous": _page_url(request, page.previous_cursor),
+        }
+    )
+
+
+def _detail(request, queryset, fieldset):
+    names = fieldset.select(request.GET.get("fields"))
+    row = fieldset.values(queryset, names).first()
+    if row is None:
+        raise Http404
+    (data,) = fieldset.serialize([row], names)
+    return _json(data)
+
+
+@api_view
+def team_list_api(request):
+    """The logged-in user's teams, by name."""
+    return _list(
+        request,
+        Team.objects.filter(contributor=request.user),
+        TEAM_FIELDS,
+        ("name", "id"),
+    )
+
+
+@api_view
+def team_api(request, team_slug):
+    """One of the user's teams."""
+    return _detail(
+        request, route_queryset(request.user, team_slug), TEAM_FIELDS
+    )
+
+
+@api_view
+@resolve_route
+def season_list_api(request, team):
+    """A team's seasons, newest first, with their records."""
+    return _list(
+        request,
+        team.season_set.all(),
+        SEASON_FIELDS,
+        ("-start_date", "-id"),
+    )
+
+
+@api_view
+@season_condition
+def season_api(request, team_slug, season_slug):
+    """One season with its record."""
+    return _detail(
+        request,
+        route_queryset(request.user, team_slug, season_slug),
+        SEASON_FIELDS,
+    )
+
+
+@api_view
+@season_condition
+@resolve_route
+def match_list_api(request, team, season):
+    """
+    A season's matches, sorted and filtered with the same ``sort``,
+    ``competition``, ``outcome`` and ``venue`` parameters as the season
+    page.
+    """
+    filter_form = MatchFilterForm(request.GET, season=season)
+    return _list(
+        request,
+        filter_form.filter(season.match_set.all()),
+        MATCH_FIELDS,
+        filter_form.ordering,
+    )
+
+
+@api_view
+@season_condition
+def match_api(request, team_slug, season_slug, match_id):
+    """One match."""
+    return _detail(
+        request,
+        route_queryset(request.user, team_slug, season_slug, match_id),
+        MATCH_FIELDS,
+    )
+
+
+@api_view
+def changes_api(request):
+    """
+    The user's teams, seasons and matches changed since ``?since=``.
+
+    Returns ``{"teams": [...], "seasons": [...], "matches": [...],
+    "deleted": [...], "cursor": ..., "more": ...}``: the rows created or
+    changed since the cursor, and a ``{"type", "id", "deleted_at"}``
+    tombstone for each team, season or match deleted (the seasons and
+    matches of a deleted team or season go with it). Without ``since``
+    everything is returned. At most ``?limit=`` rows of each kind are
+    returned; while ``more`` is true, call again with the new cursor.
+    """
+    user = request.user
+    streams = {
+        "teams": (
+            TEAM_FIELDS,
+            Team.objects.filter(contributor=user),
+            "updated_at",
+        ),
+        "seasons": (
+            SEASON_FIELDS,
+            Season.objects.filter(team__contributor=user),
+            "updated_at",
+        ),
+        "matches": (
+            MATCH_FIELDS,
+            Match.objects.filter(season__team__contributor=user),
+            "updated_at",
+        ),
+        "deleted": (
+            TOMBSTONE_FIELDS,
+            Tombstone.objects.filter(contributor=user),
+            "deleted_at",
+        ),
+    }
+    changes = read_changes(
+        {
+            name: (
+                fieldset.values(
+                    queryset, fieldset.fields, extra=(stamp, "id")
+                ),
+                stamp,
+            )
+            for name, (fieldset, queryset, stamp) in streams.items()
+        },
+        cursor=request.GET.get("since"),
+        limit=_page_size(request),
+    )
+    data = {
+        name: list(fieldset.serialize(changes.rows[name], fieldset.fields))
+        for name, (fieldset, _, _) in streams.items()
+    }
+    return _json({**data, "cursor": changes.cursor, "more": changes.more})
+
+
+@require_POST
+@_json_errors
+@resolve_route
+def match_batch_api(request, team, season):
+    """
+    Apply ``{"operations": [...]}`` to a season's matches, all or none.
+
+    See :func:`team.bulk.apply_batch` for the operations. Responds 200
+    with ``{"results": [...]}`` when the batch was applied, 400 with the
+    same shape and the errors of each invalid operation when nothing was,
+    409 if a concurrent write conflicted, and 413 when the batch is over
+    ``settings.MATCH_BATCH_MAX_SIZE`` bytes or
+    ``settings.MATCH_BATCH_MAX_OPERATIONS`` operations.
+    """
+    limit = settings.MATCH_BATCH_MAX_SIZE
+    if int(request.META.get("CONTENT_LENGTH") or 0) > limit:
+        return _error(413, "The batch is too large.")
+    # Read from the stream: request.body is capped at
+    # DATA_UPLOAD_MAX_MEMORY_SIZE, which a full batch can exceed. A body
+    # sent without a Content-Length is only read up to the limit.
+    body = request.read(limit + 1)
+    if len(body) > limit:
+        return _error(413, "The batch is too large.")
+    try:
+        payload = json.loads(body)
+        operations = payload["operations"]
+    except (ValueError, TypeError, KeyError):
+        return _error(400, 'Send a JSON object with an "operations" list.')
+    if not isinstance(operations, list):
+        return _error(400, '"operations" must be a list.')
+    if len(operations) > settings.MATCH_BATCH_MAX_OPERATIONS:
+        return _error(
+            413,
+            f"At most {settings.MATCH_BATCH_MAX_OPERATIONS} operations are "
+            "accepted per batch.",
+        )
+    try:
+        results = apply_batch(season, operations)
+    except BatchInvalid as e:
+        return _json({"results": e.results}, status=400)
+    except IntegrityError:
+        return _error(
+            409, "Another change to this season conflicted; retry the batch."
+        )
+    return _json({"results": results})
@@ -0,0 +1,43 @@
+from django.urls import path
+from .api import (
+    team_list_api,
+    team_api,
+    season_list_api,
+    season_api,
+    match_list_api,
+    match_api,
+    match_batch_api,
+    changes_api,
+)
+
+urlpatterns = [
+    path("changes/", changes_api, name="api_changes"),
+    path("teams/", team_list_api, name="api_team_list"),
+    path("teams/<slug:team_slug>/", team_api, name="api_team"),
+    path(
+        "teams/<slug:team_slug>/seasons/",
+        season_list_api,
+        name="api_season_list",
+    ),
+    path(
+        "teams/<slug:team_slug>/seasons/<slug:season_slug>/",
+        season_api,
+        name="api_season",
+    ),
+    path(
+        "teams/<slug:team_slug>/seasons/<slug:season_slug>/matches/",
+        match_list_api,
+        name="api_match_list",
+    ),
+    path(
+        "teams/<slug:team_slug>/seasons/<slug:season_slug>/matches/batch/",
+        match_batch_api,
+        name="api_match_batch",
+    ),
+    path(
+        "teams/<slug:team_slug>/seasons/<slug:season_slug>/matches/"
+        "<int:match_id>/",
+        match_api,
+        name="api_match",
+    ),
+]
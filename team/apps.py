@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TeamConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "team"
+
+    def ready(self):
+        from . import signals  # noqa: F401
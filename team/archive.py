@@ -0,0 +1,258 @@
+"""
+Import of a club's history from a zip archive of season TSV files.
+
+Each archive member is one season, in the same format as the single-season
+import (see :mod:`team.importer`) and the files in the repository's
+``data/`` directory. The season is inferred from the file name (e.g.
+``Sheffield_Wednesday_24-25.tsv``) or, failing that, from the dates of its
+matches, and missing :model:`team.Season` rows are created. Files are
+parsed in a process pool, then every season is written with one bulk
+import inside a single transaction.
+"""
+
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from time import perf_counter
+
+import django
+from django.conf import settings
+from django.db import connection, transaction
+
+from .importer import (
+    INSERT,
+    MatchImportError,
+    copy_rows,
+    import_rows,
+    iter_tsv,
+)
+from .models import Season
+
+SEASON_LABEL = re.compile(r"(?<!\d)(\d{4}|\d{2})(?:[-_](\d{4}|\d{2}))?$")
+DEFAULT_MAX_SIZE = 50 * 1024 * 1024
+
+
+@dataclass
+class ArchiveSeasonResult:
+    """Outcome of importing one archive member into a season."""
+
+    file_name: str
+    season: Season
+    season_created: bool
+    result: object
+
+
+@dataclass
+class ArchiveResult:
+    """Outcome of an archive import, one entry per season file."""
+
+    seasons: list = field(default_factory=list)
+    parse_elapsed: float = 0.0
+
+
+def parse_member(name, data):
+    """
+    Parse one archive member's bytes into a list of rows.
+
+    Runs in a worker process, so it only returns picklable values. Errors
+    are raised as :class:`MatchImportError` naming the file.
+    """
+    try:
+        lines = data.decode("utf-8").splitlines(keepends=True)
+        return list(iter_tsv(lines))
+    except (MatchImportError, UnicodeDecodeError) as e:
+        raise MatchImportError(f"{name}: {e}") from e
+
+
+def _expand_year(value, reference):
+    """Return a two-digit year in the century closest below ``reference``."""
+    return reference - (reference - value) % 100
+
+
+def infer_season_years(name, dates):
+    """
+    Return ``(start_year, end_year)`` for an archive member.
+
+    Uses a trailing ``YY-YY``, ``YYYY-YY``, ``YYYY-YYYY`` or ``YYYY`` label
+    in the file name, expanding two-digit years to the century of the
+    matches. Without a label, the years of the earliest and latest match
+    are used.
+    """
+    stem = os.path.splitext(os.path.basename(name))[0]
+    label = SEASON_LABEL.search(stem)
+    if label is None:
+        if not dates:
+            raise MatchImportError(
+                f"{name}: cannot tell which season this file is for."
+            )
+        return min(dates).year, max(dates).year
+
+    first, second = label.groups()
+    reference = min(dates).year if dates else date.today().year
+    start = int(first)
+    if len(first) == 2:
+        start = _expand_year(start, reference)
+    if second is None:
+        end = start
+    elif len(second) == 2:
+        end = start + (int(second) - start) % 100
+    else:
+        end = int(second)
+    if not 0 <= end - start <= 1:
+        raise MatchImportError(f"{name}: '{label.group()}' is not a season.")
+    return start, end
+
+
+def season_slug(start_year, end_year):
+    """Return the slug :model:`team.Season` would generate for its years."""
+    if start_year == end_year:
+        return f"{start_year}"
+    return f"{start_year % 100}-{end_year % 100}"
+
+
+def get_or_create_season(team, contributor, start_year, end_year, rows):
+    """
+    Return ``(season, created)`` for the team's season covering the years.
+
+    A new season spans the matches' dates, defaulting to 1 July to 30 June
+    (or the calendar year for single-year seasons), and lists the
+    competitions found in the file.
+    """
+    slug = season_slug(start_year, end_year)
+    season = Season.objects.filter(team=team, slug=slug).first()
+    if season is not None:
+        return season, False
+
+    if start_year == end_year:
+        start_date, end_date = date(start_year, 1, 1), date(end_year, 12, 31)
+    else:
+        start_date, end_date = date(start_year, 7, 1), date(end_year, 6, 30)
+    dates = [fields["date"] for _, fields, _ in rows]
+    if dates:
+        start_date = min(start_date, min(dates))
+        end_date = max(end_date, max(dates))
+    competitions = dict.fromkeys(
+        fields["competition"] for _, fields, _ in rows if fields["competition"]
+    )
+    season = Season.objects.create(
+        team=team,
+        contributor=contributor,
+        start_date=start_date,
+        end_date=end_date,
+        competition_list=", ".join(competitions),
+        slug=slug,
+    )
+    return season, True
+
+
+def read_members(file, max_size=None):
+    """
+    Return ``(name, bytes)`` for every TSV file in a zip archive.
+
+    Raises :class:`MatchImportError` if the upload is not a zip file, holds
+    no TSV files, or would expand beyond ``max_size`` bytes.
+    """
+    if max_size is None:
+        max_size = getattr(
+            settings, "MATCH_ARCHIVE_MAX_SIZE", DEFAULT_MAX_SIZE
+        )
+    try:
+        archive = zipfile.ZipFile(file)
+    except zipfile.BadZipFile as e:
+        raise MatchImportError(
+            "The uploaded file is not a zip archive."
+        ) from e
+    with archive:
+        infos = [
+            info
+            for info in archive.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(".tsv")
+            and not os.path.basename(info.filename).startswith(".")
+        ]
+        if not infos:
+            raise MatchImportError("The archive contains no .tsv files.")
+        if sum(info.file_size for info in infos) > max_size:
+            raise MatchImportError(
+                f"The archive expands to more than {max_size:,} bytes."
+            )
+        return [
+            (info.filename, archive.read(info))
+            for info in sorted(infos, key=lambda info: info.filename)
+        ]
+
+
+def parse_members(members, workers=None):
+    """
+    Parse archive members, in a process pool when there are several.
+
+    ``workers`` defaults to ``settings.MATCH_IMPORT_PARSE_WORKERS`` or the
+    number of CPUs. Returns a list of row lists, in member order.
+    """
+    if workers is None:
+        workers = getattr(settings, "MATCH_IMPORT_PARSE_WORKERS", None)
+    workers = min(workers or os.cpu_count() or 1, len(members))
+    names = [name for name, _ in members]
+    contents = [data for _, data in members]
+    if workers <= 1:
+        return list(map(parse_member, names, contents))
+    # Workers started with "spawn" or "forkserver" must set up Django
+    # before they can import this module.
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=django.setup
+    ) as executor:
+        return list(executor.map(parse_member, names, contents))
+
+
+def import_archive(team, contributor, file, mode=INSERT, workers=None):
+    """
+    Import every season file in a zip archive into ``team``.
+
+    See :func:`import_season_files`.
+    """
+    return import_season_files(
+        team, contributor, read_members(file), mode=mode, workers=workers
+    )
+
+
+def import_season_files(
+    team, contributor, members, mode=INSERT, workers=None, use_copy=False
+):
+    """
+    Import ``(name, bytes)`` season files into ``team``.
+
+    All files are parsed before anything is written. Seasons are then
+    created as needed and each is written with a single bulk import, all
+    in one transaction, so a failure leaves the database unchanged. With
+    ``use_copy`` on PostgreSQL, new matches are streamed with ``COPY``
+    instead of ``INSERT`` (insert mode only).
+    """
+    if use_copy and mode != INSERT:
+        raise ValueError("COPY can only be used to insert new matches.")
+    use_copy = use_copy and connection.vendor == "postgresql"
+
+    archive_result = ArchiveResult()
+    started = perf_counter()
+    parsed = parse_members(members, workers)
+    archive_result.parse_elapsed = perf_counter() - started
+    with transaction.atomic():
+        for (name, _), rows in zip(members, parsed):
+            dates = [fields["date"] for _, fields, _ in rows]
+            start_year, end_year = infer_season_years(name, dates)
+            season, created = get_or_create_season(
+                team, contributor, start_year, end_year, rows
+            )
+            try:
+                if use_copy:
+                    result = copy_rows(season, rows)
+                else:
+                    result = import_rows(season, rows, mode=mode)
+            except MatchImportError as e:
+                raise MatchImportError(f"{name}: {e}") from e
+            archive_result.seasons.append(
+                ArchiveSeasonResult(name, season, created, result)
+            )
+    return archive_result
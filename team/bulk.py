@@ -0,0 +1,309 @@
+"""
+Bulk writes of :model:`team.Match` records.
+
+``bulk_create`` and ``bulk_update`` neither call ``Match.save()`` nor send
+signals, and the per-match ``post_delete`` bookkeeping is skipped while
+:func:`write_matches` deletes. The work the signals do for a single match
+is done here once for the whole batch: written matches get a new
+``version`` and ``updated_at``, goal events are rebuilt for matches whose
+goals changed, deleted matches get tombstones, the change in results is
+added to the season's summary with one ``UPDATE``, and the season is
+touched once.
+
+:func:`apply_batch` validates a list of create, update and delete
+operations with :form:`team.MatchForm` and applies them all, or none.
+"""
+
+import uuid
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.forms.models import model_to_dict
+from django.utils import timezone
+
+from .forms import MatchForm
+from .fragments import forget_match_rows
+from .goals import sync_goal_events, sync_written_matches
+from .importer import get_batch_size
+from .models import Match, Season, Tombstone
+from .stats import Record
+from .summaries import rebuild_summaries, record_change
+from .sync import bury
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+OPERATIONS = (CREATE, UPDATE, DELETE)
+
+_writing = ContextVar("writing_matches_in_bulk", default=False)
+
+
+def writing_in_bulk():
+    """Return True while :func:`write_matches` is deleting matches."""
+    return _writing.get()
+
+
+class BatchInvalid(ValueError):
+    """
+    Raised by :func:`apply_batch` when any operation is invalid.
+
+    ``results`` holds the outcome of every operation; nothing was written.
+    """
+
+    def __init__(self, results):
+        super().__init__("The batch has invalid operations.")
+        self.results = results
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _loaded_record(match):
+    loaded = getattr(match, "_loaded_result", None)
+    return None if loaded is None else Record.for_score(*loaded[1:])
+
+
+def write_matches(season, created=(), changed=(), deleted=(), batch_size=None):
+    """
+    Create, update and delete matches of ``season`` in one transaction.
+
+    ``created`` are unsaved matches, ``changed`` is a sequence of
+    ``(match, changed_fields)`` pairs, such as a model formset's
+    ``changed_objects``, and ``deleted`` are matches loaded from the
+    database. Writes use ``bulk_create``, ``bulk_update`` (of only the
+    changed fields) and ``DELETE ... WHERE id IN``, in batches of
+    ``batch_size`` (default ``settings.MATCH_IMPORT_BATCH_SIZE``).
+    Returns the number of matches created, updated and deleted.
+    """
+    batch_size = get_batch_size(batch_size)
+    created = list(created)
+    changed = [(match, set(names)) for match, names in changed if names]
+    deleted = list(deleted)
+    if not (created or changed or deleted):
+        return 0, 0, 0
+    for match in [*created, *(m for m, _ in changed), *deleted]:
+        if match.season_id != season.pk:
+            raise ValueError(f"Match {match.pk} is not in season {season}.")
+
+    delta = Record()
+    rebuild = False
+    now = timezone.now()
+    for match in created:
+        delta.add(Record.for_score(match.team_score, match.opponent_score))
+    for match, _ in changed:
+        match.version = uuid.uuid4()
+        match.updated_at = now
+        old = _loaded_record(match)
+        rebuild = rebuild or old is None
+        delta.subtract(old or Record())
+        delta.add(Record.for_score(match.team_score, match.opponent_score))
+    for match in deleted:
+        old = _loaded_record(match)
+        rebuild = rebuild or old is None
+        delta.subtract(old or Record())
+
+    fields = sorted(set().union(*(names for _, names in changed)))
+    with transaction.atomic():
+        token = _writing.set(True)
+        try:
+            for batch in _batches([match.pk for match in deleted], batch_size):
+                Match.objects.filter(pk__in=batch).delete()
+        finally:
+            _writing.reset(token)
+        if deleted:
+            bury(
+                Tombstone.Kind.MATCH,
+                season.team.contributor_id,
+                [match.pk for match in deleted],
+                deleted_at=now,
+            )
+        if changed:
+            Match.objects.bulk_update(
+                [match for match, _ in changed],
+                [*fields, "version", "updated_at"],
+                batch_size=batch_size,
+            )
+            sync_goal_events(
+                (match.pk, match.season_id, match.goals)
+                for match, names in changed
+                if "goals" in names
+            )
+        if created:
+            Match.objects.bulk_create(created, batch_size=batch_size)
+            sync_written_matches(season, created, replace=False)
+        if rebuild:
+            rebuild_summaries([season.pk])
+        else:
+            record_change(season.pk, delta)
+        Season.objects.filter(pk=season.pk).touch()
+
+    if deleted and "team" in season._state.fields_cache:
+        forget_match_rows(deleted, season)
+    for match in [*created, *(match for match, _ in changed)]:
+        match._loaded_result = (
+            match.season_id,
+            match.team_score,
+            match.opponent_score,
+        )
+    return len(created), len(changed), len(deleted)
+
+
+def update_matches(season, changes, batch_size=None):
+    """
+    Save edited matches of ``season`` in one transaction.
+
+    ``changes`` is a sequence of ``(match, changed_fields)`` pairs; see
+    :func:`write_matches`. Returns the number of matches written.
+    """
+    _, updated, _ = write_matches(
+        season, changed=changes, batch_size=batch_size
+    )
+    return updated
+
+
+def _form_data(match):
+    return model_to_dict(match, fields=MatchForm.Meta.fields)
+
+
+def _error(message, code, field="__all__"):
+    return {field: [{"message": message, "code": code}]}
+
+
+def _validate(season, operations):
+    """
+    Return ``(results, forms, matches)`` for a batch of operations.
+
+    ``forms`` maps the index of each valid create or update to its bound
+    :form:`team.MatchForm`; ``matches`` are the existing matches named by
+    id, loaded in one query.
+    """
+    results = [{"index": index} for index in range(len(operations))]
+    ids = {
+        operation.get("id")
+        for operation in operations
+        if isinstance(operation, dict)
+        and operation.get("op") in (UPDATE, DELETE)
+        and isinstance(operation.get("id"), int)
+    }
+    matches = season.match_set.in_bulk(ids)
+    forms = {}
+    seen = set()
+    for result, operation in zip(results, operations):
+        if not isinstance(operation, dict):
+            result["errors"] = _error("Must be an object.", "invalid")
+            continue
+        op = result["op"] = operation.get("op")
+        if op not in OPERATIONS:
+            result["errors"] = _error(
+                "Must be create, update or delete.", "invalid", "op"
+            )
+            continue
+        data = operation.get("data", {})
+        if op != DELETE and not isinstance(data, dict):
+            result["errors"] = _error("Must be an object.", "invalid", "data")
+            continue
+        if op == CREATE:
+            form = MatchForm(data, season=season)
+        else:
+            match = matches.get(operation.get("id"))
+            if match is None:
+                result["errors"] = _error(
+                    "No such match in this season.", "not_found", "id"
+                )
+                continue
+            result["id"] = match.pk
+            if match.pk in seen:
+                result["errors"] = _error(
+                    "The match appears more than once in the batch.",
+                    "duplicate",
+                    "id",
+                )
+                continue
+            seen.add(match.pk)
+            if op == DELETE:
+                continue
+            form = MatchForm(
+                {**_form_data(match), **data}, instance=match, season=season
+            )
+        if form.is_valid():
+            form.instance.season = season
+            forms[result["index"]] = form
+        else:
+            result["errors"] = form.errors.get_json_data()
+    return results, forms, matches
+
+
+def _check_keys(season, results, forms):
+    """Flag creates and updates that would leave two matches with one key."""
+    dates = {form.cleaned_data["date"] for form in forms.values()}
+    # Valid updates and deletes give up their match's current key.
+    released = {
+        result["id"]
+        for result in results
+        if "id" in result and "errors" not in result
+    }
+    taken = {
+        (match_date, opponent)
+        for match_date, opponent, pk in season.match_set.filter(
+            date__in=dates
+        ).values_list("date", "opponent", "pk")
+        if pk not in released
+    }
+    for index, form in sorted(forms.items()):
+        key = (form.cleaned_data["date"], form.cleaned_data["opponent"])
+        if key in taken:
+            results[index]["errors"] = _error(
+                "Another match in this season has this date and opponent.",
+                "unique",
+            )
+        taken.add(key)
+
+
+def apply_batch(season, operations, batch_size=None):
+    """
+    Validate and apply a batch of match operations to ``season``.
+
+    Each operation is a dict: ``{"op": "create", "data": {...}}``,
+    ``{"op": "update", "id": 1, "data": {...}}`` (only the fields given
+    change) or ``{"op": "delete", "id": 1}``. ``data`` is validated with
+    :form:`team.MatchForm`. Returns one result per operation, each with
+    its ``index``, ``op``, ``id`` and ``status`` (``created``,
+    ``updated``, ``unchanged`` or ``deleted``).
+
+    Nothing is written unless every operation is valid; otherwise
+    :class:`BatchInvalid` is raised with the errors of the invalid
+    operations. Deletes are applied first, then updates, then creates.
+    """
+    results, forms, matches = _validate(season, operations)
+    _check_keys(season, results, forms)
+    if any("errors" in result for result in results):
+        for result in results:
+            result["status"] = "invalid" if "errors" in result else "valid"
+        raise BatchInvalid(results)
+
+    created, changed, deleted = [], [], []
+    for result in results:
+        form = forms.get(result["index"])
+        if result["op"] == DELETE:
+            deleted.append(matches[result["id"]])
+            result["status"] = "deleted"
+        elif result["op"] == CREATE:
+            created.append((result, form.instance))
+            result["status"] = "created"
+        elif form.changed_data:
+            changed.append((form.instance, form.changed_data))
+            result["status"] = "updated"
+        else:
+            result["status"] = "unchanged"
+    write_matches(
+        season,
+        created=[match for _, match in created],
+        changed=changed,
+        deleted=deleted,
+        batch_size=batch_size,
+    )
+    for result, match in created:
+        result["id"] = match.pk
+    return results
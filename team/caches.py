@@ -0,0 +1,41 @@
+"""
+Cache namespaces for team data (see :mod:`seasonwatch.cache`).
+
+Season statistics are keyed on :meth:`team.models.Season.etag`, so they
+are never stale and need no invalidation. Lists of a contributor's
+seasons with their summaries are keyed on :func:`season_list_version`,
+read from the database on every request, so a change is seen by every
+process as soon as it commits and only retires that contributor's list.
+"""
+
+from django.db.models import Max
+
+from seasonwatch.cache import CacheNamespace
+
+season_stats_cache = CacheNamespace("season-stats")
+season_list_cache = CacheNamespace("season-list")
+
+
+def season_list_version(user):
+    """
+    Return the time of the latest change to ``user``'s teams and seasons.
+
+    Saving a team or season, or any of a season's matches, stamps its
+    ``updated_at``; deleting one leaves a :model:`team.Tombstone`. The
+    latest of these stamps is read with a single query.
+    """
+    from .models import Season, Team, Tombstone
+
+    latest = [
+        model.objects.filter(contributor=user)
+        .order_by()
+        .values("contributor")
+        .annotate(latest=Max(stamp))
+        .values_list("latest", flat=True)
+        for model, stamp in (
+            (Team, "updated_at"),
+            (Season, "updated_at"),
+            (Tombstone, "deleted_at"),
+        )
+    ]
+    return max(latest[0].union(*latest[1:], all=True), default=None)
@@ -0,0 +1,175 @@
+"""
+Streaming export of :model:`team.Match` records.
+
+Exports use the same columns and value formats as the TSV import (see
+:mod:`team.importer`), so an exported season can be imported again
+unchanged, and a team export (a zip of one file per season) can be loaded
+with the archive import. Rows are read with ``QuerySet.iterator()`` and
+written as they are produced, so memory use does not grow with the size
+of the export.
+"""
+
+import csv
+import zipfile
+from itertools import groupby
+from operator import itemgetter
+
+from .models import Match
+
+EXPORT_COLUMNS = [
+    "date",
+    "time",
+    "competition",
+    "round",
+    "opponent",
+    "is_home",
+    "team_score",
+    "opponent_score",
+    "goals",
+    "attendance",
+]
+EXPORT_FORMATS = {
+    "tsv": ("\t", "text/tab-separated-values"),
+    "csv": (",", "text/csv"),
+}
+CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """Pseudo-buffer that returns what is written instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+class _ZipBuffer:
+    """Unseekable buffer collecting the bytes written by :mod:`zipfile`."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        """Return and clear everything written so far."""
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _format_time(value):
+    if value is None:
+        return ""
+    return value.strftime("%H:%M" if not value.second else "%H:%M:%S")
+
+
+def _format_int(value):
+    return "" if value is None else str(value)
+
+
+def _format_rows(matches):
+    for (
+        match_date,
+        match_time,
+        competition,
+        match_round,
+        opponent,
+        is_home,
+        team_score,
+        opponent_score,
+        goals,
+        attendance,
+    ) in matches:
+        yield [
+            match_date.isoformat(),
+            _format_time(match_time),
+            competition,
+            match_round,
+            opponent,
+            "H" if is_home else "A",
+            _format_int(team_score),
+            _format_int(opponent_score),
+            goals,
+            _format_int(attendance),
+        ]
+
+
+def iter_season_rows(season, chunk_size=CHUNK_SIZE):
+    """Yield each match in ``season`` as a list of export values."""
+    return _format_rows(
+        season.match_set.order_by("date", "id")
+        .values_list(*EXPORT_COLUMNS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def iter_team_rows(team, chunk_size=CHUNK_SIZE):
+    """
+    Yield ``(season, rows)`` for every season of ``team``, oldest first.
+
+    The matches of all seasons are read with one query, so the number of
+    queries does not grow with the number of seasons. Seasons without
+    matches are yielded with no rows.
+    """
+    seasons = list(
+        team.season_set.select_related("team").order_by("start_date", "id")
+    )
+    matches = (
+        Match.objects.filter(season__team=team)
+        .order_by("season__start_date", "season_id", "date", "id")
+        .values_list("season_id", *EXPORT_COLUMNS)
+        .iterator(chunk_size=chunk_size)
+    )
+    groups = groupby(matches, key=itemgetter(0))
+    season_id, group = next(groups, (None, None))
+    for season in seasons:
+        if season.pk != season_id:
+            yield season, iter(())
+            continue
+        yield season, _format_rows(row[1:] for row in group)
+        season_id, group = next(groups, (None, None))
+
+
+def iter_delimited(rows, delimiter="\t"):
+    """Yield a header line followed by ``rows`` as delimited text lines."""
+    writer = csv.writer(_Echo(), delimiter=delimiter, lineterminator="\n")
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def season_file_name(season, extension="tsv"):
+    """Return the export file name for ``season``, e.g. ``swfc_24-25.tsv``."""
+    return f"{season.team.slug}_{season.slug}.{extension}"
+
+
+def iter_season_export(season, export_format="tsv"):
+    """Yield a season's matches as lines of TSV or CSV text."""
+    delimiter, _ = EXPORT_FORMATS[export_format]
+    return iter_delimited(iter_season_rows(season), delimiter)
+
+
+def iter_team_export(team, export_format="tsv"):
+    """
+    Yield a zip archive of every season of ``team``, one file per season.
+
+    The archive is produced incrementally: compressed bytes are yielded as
+    each season's rows are written.
+    """
+    delimiter, _ = EXPORT_FORMATS[export_format]
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for season, rows in iter_team_rows(team):
+            name = season_file_name(season, export_format)
+            with archive.open(name, "w") as member:
+                for line in iter_delimited(rows, delimiter):
+                    member.write(line.encode("utf-8"))
+                    data = buffer.pop()
+                    if data:
+                        yield data
+    yield buffer.pop()
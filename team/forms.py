@@ -1,6 +1,8 @@
 from django import forms
+from django.db.models import F, Q
 from django.forms import DateInput, TimeInput
 from .models import Team, Season, Match
+from .importer import IMPORT_MODES, INSERT
 
 
 class TeamSelectionForm(forms.ModelForm):
@@ -62,10 +64,207 @@ class MatchForm(forms.ModelForm):
     def __init__(self, *args, season=None, **kwargs):
         super().__init__(*args, **kwargs)
         if season:
-            self.fields["competition"].choices = [
-                (c, c) for c in season.competitions
-            ]
+            choices = [(c, c) for c in season.competitions]
+            # A match keeps a competition that is not in the season's list,
+            # e.g. one it was imported with.
+            current = self.initial.get("competition")
+            if current and (current, current) not in choices:
+                choices.append((current, current))
+            self.fields["competition"].choices = choices
+
+
+class MatchBulkForm(MatchForm):
+    """One row of the bulk edit table: a :form:`team.MatchForm` with compact inputs."""
+
+    class Meta(MatchForm.Meta):
+        widgets = {
+            "date": DateInput(
+                attrs={"type": "date", "class": "form-control form-control-sm"}
+            ),
+            "time": TimeInput(
+                attrs={"type": "time", "class": "form-control form-control-sm"}
+            ),
+            "is_home": forms.CheckboxInput(
+                attrs={"class": "form-check-input"}
+            ),
+            "goals": forms.TextInput(),
+        }
+
+    def __init__(self, *args, season=None, **kwargs):
+        super().__init__(*args, season=season, **kwargs)
+        # Untouched rows must stay valid, so allow a blank competition.
+        self.fields["competition"].choices = [
+            ("", "—"),
+            *self.fields["competition"].choices,
+        ]
+        self.fields["competition"].widget.attrs[
+            "class"
+        ] = "form-select form-select-sm"
+        for field in self.fields.values():
+            field.widget.attrs.setdefault(
+                "class", "form-control form-control-sm"
+            )
+
+
+class LoadedChoiceField(forms.ModelChoiceField):
+    """A model choice among objects already loaded, keyed by primary key."""
+
+    def __init__(self, objects, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.objects = objects
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            return self.objects[str(value)]
+        except KeyError:
+            raise forms.ValidationError(
+                self.error_messages["invalid_choice"], code="invalid_choice"
+            )
+
+
+class BaseMatchBulkFormSet(forms.BaseModelFormSet):
+    """Bulk edit of existing matches, rejecting duplicate date and opponent."""
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        # Django looks each posted id up with its own query; the matches
+        # are already loaded, so look them up there instead.
+        if not hasattr(self, "_loaded"):
+            self._loaded = {str(obj.pk): obj for obj in self.get_queryset()}
+        name = self._pk_field.name
+        field = form.fields[name]
+        form.fields[name] = LoadedChoiceField(
+            self._loaded,
+            field.queryset,
+            initial=field.initial,
+            required=False,
+            widget=field.widget,
+        )
+
+    def clean(self):
+        super().clean()
+        seen = set()
+        for form in self.forms:
+            data = getattr(form, "cleaned_data", None)
+            if not data:
+                continue
+            key = (data.get("date"), data.get("opponent"))
+            if key in seen:
+                raise forms.ValidationError(
+                    f"More than one match against {key[1]} on {key[0]}."
+                )
+            seen.add(key)
+
+
+MatchBulkFormSet = forms.modelformset_factory(
+    Match,
+    form=MatchBulkForm,
+    formset=BaseMatchBulkFormSet,
+    extra=0,
+    edit_only=True,
+)
 
 
 class MatchImportForm(forms.Form):
     tsv_file = forms.FileField(label="Select TSV File")
+    mode = forms.ChoiceField(
+        choices=IMPORT_MODES,
+        initial=INSERT,
+        required=False,
+        widget=forms.RadioSelect,
+        label="Existing matches",
+        help_text=(
+            "Matches are identified by date and opponent. Choose update to "
+            "re-import a corrected file without creating duplicates."
+        ),
+    )
+
+
+class ArchiveImportForm(forms.Form):
+    zip_file = forms.FileField(
+        label="Select Zip Archive",
+        help_text="A .zip file with one TSV file per season.",
+    )
+    mode = forms.ChoiceField(
+        choices=IMPORT_MODES,
+        initial=INSERT,
+        required=False,
+        widget=forms.RadioSelect,
+        label="Existing matches",
+    )
+
+
+class MatchFilterForm(forms.Form):
+    """
+    Sorting and filtering of a season's match table.
+
+    Bind it to the query string; invalid values are ignored rather than
+    reported.
+    """
+
+    SORTS = {
+        "date": ("date", "id"),
+        "-date": ("-date", "-id"),
+        "opponent": ("opponent", "id"),
+        "-opponent": ("-opponent", "-id"),
+    }
+    OUTCOMES = {
+        "W": Q(team_score__gt=F("opponent_score")),
+        "D": Q(team_score=F("opponent_score")),
+        "L": Q(team_score__lt=F("opponent_score")),
+    }
+
+    sort = forms.ChoiceField(
+        choices=[
+            ("date", "Oldest first"),
+            ("-date", "Newest first"),
+            ("opponent", "Opponent A–Z"),
+            ("-opponent", "Opponent Z–A"),
+        ],
+        required=False,
+    )
+    competition = forms.ChoiceField(choices=[], required=False)
+    outcome = forms.ChoiceField(
+        choices=[
+            ("", "Any result"),
+            ("W", "Won"),
+            ("D", "Drawn"),
+            ("L", "Lost"),
+        ],
+        required=False,
+    )
+    venue = forms.ChoiceField(
+        choices=[("", "Home and away"), ("home", "Home"), ("away", "Away")],
+        required=False,
+    )
+
+    def __init__(self, *args, season=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if season:
+            self.fields["competition"].choices = [("", "All competitions")] + [
+                (c, c) for c in season.competitions
+            ]
+
+    def _value(self, name):
+        self.is_valid()
+        return self.cleaned_data.get(name) or ""
+
+    @property
+    def ordering(self):
+        """Return the keyset ordering for the chosen sort, by date by default."""
+        return self.SORTS[self._value("sort") or "date"]
+
+    def filter(self, matches):
+        """Return ``matches`` narrowed by the chosen filters."""
+        competition = self._value("competition")
+        if competition:
+            matches = matches.filter(competition=competition)
+        outcome = self._value("outcome")
+        if outcome:
+            matches = matches.filter(self.OUTCOMES[outcome])
+        venue = self._value("venue")
+        if venue:
+            matches = matches.filter(is_home=venue == "home")
+        return matches
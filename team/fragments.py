@@ -0,0 +1,44 @@
+"""
+Cached template fragments.
+
+Each row of the season match table is cached with ``{% cache %}`` under
+the key from :func:`match_row_key`. The key includes the match's
+``version``, which changes on every write, so an edited row is rendered
+afresh while unchanged rows are served from the cache. It also includes
+the team and season names and slugs the row shows or links to.
+"""
+
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+MATCH_ROW_FRAGMENT = "match_row"
+
+
+def match_row_vary_on(match, season):
+    """Return the values the cached row of ``match`` is keyed on."""
+    team = season.team
+    return [match.pk, match.version, season.slug, team.slug, team.name]
+
+
+def match_row_key(match, season):
+    """Return the cache key of the rendered table row for ``match``."""
+    return make_template_fragment_key(
+        MATCH_ROW_FRAGMENT, match_row_vary_on(match, season)
+    )
+
+
+def forget_match_row(match):
+    """
+    Drop the cached row of ``match``, if its season and team are loaded.
+
+    Otherwise the entry is left to expire: its version can never be shown
+    again.
+    """
+    season = match._state.fields_cache.get("season")
+    if season is not None and "team" in season._state.fields_cache:
+        cache.delete(match_row_key(match, season))
+
+
+def forget_match_rows(matches, season):
+    """Drop the cached rows of ``matches`` in ``season``, with its team loaded."""
+    cache.delete_many([match_row_key(match, season) for match in matches])
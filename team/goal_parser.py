@@ -0,0 +1,144 @@
+"""
+Parser for the ``Match.goals`` text.
+
+The text lists scorers followed by the minutes they scored in, separated
+by commas, e.g. ``Smith 45+2, 76, Windass 83 (pen)``. A bare minute is
+credited to the previous scorer, ``45+2`` is a goal in the second minute of
+added time, and ``(pen)`` or ``(og)`` mark penalties and own goals.
+
+:func:`check_goals` returns the goals together with a :class:`GoalIssue`
+for every fragment it could not read, giving the fragment's position in
+the text. Results are cached per string, since the same goals text is
+parsed on every save, import and validation of a match. For bulk work,
+:func:`parse_goals_batch` parses many strings in one call without
+filling the cache. The module does not depend on Django, so it can be
+used from migrations and import worker processes.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+# Each match consumes one comma-separated fragment. A readable fragment
+# fills the ``goal`` groups; anything else is captured whole as ``bad``.
+FRAGMENT_PATTERN = re.compile(
+    r"""
+    \s*
+    (?:
+        (?P<goal>
+            (?:(?P<scorer>[^\d(),+]*?[^\d(),+\s])\s*)?
+            (?:(?P<minute>\d{1,3})(?:\s*\+\s*(?P<stoppage>\d{1,2}))?)?
+            (?:\s*\((?:(?P<pen>pen)|(?P<og>og))\))?
+        )
+        \s*(?=,|$)
+    |
+        (?P<bad>[^,]*?)\s*(?=,|$)
+    )
+    ,?
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+CACHE_SIZE = 4096
+
+
+class ParsedGoal(NamedTuple):
+    """One goal read from a ``Match.goals`` string."""
+
+    scorer: str
+    minute: int = None
+    stoppage: int = None
+    is_penalty: bool = False
+    is_own_goal: bool = False
+
+
+class GoalIssue(NamedTuple):
+    """A fragment of a ``Match.goals`` string that could not be read."""
+
+    start: int
+    end: int
+    fragment: str
+    message: str
+
+    def __str__(self):
+        return (
+            f"'{self.fragment}' (characters {self.start + 1}-{self.end}) "
+            f"{self.message}"
+        )
+
+
+def _check_goals(text):
+    """Parse ``text`` without using the cache. See :func:`check_goals`."""
+    goals = []
+    issues = []
+    scorer = None
+    for match in FRAGMENT_PATTERN.finditer(text):
+        goal, name, minute, stoppage, pen, og, bad = match.groups()
+        if bad:
+            issues.append(
+                GoalIssue(
+                    *match.span("bad"), bad, "is not a scorer and minute."
+                )
+            )
+            continue
+        if not goal:
+            continue
+        if name:
+            scorer = name
+        elif minute is None:
+            issues.append(
+                GoalIssue(
+                    *match.span("goal"), goal, "is not a scorer and minute."
+                )
+            )
+            continue
+        elif scorer is None:
+            issues.append(
+                GoalIssue(
+                    *match.span("goal"), goal, "has no scorer before it."
+                )
+            )
+            continue
+        goals.append(
+            ParsedGoal(
+                scorer,
+                int(minute) if minute else None,
+                int(stoppage) if stoppage else None,
+                pen is not None,
+                og is not None,
+            )
+        )
+    return tuple(goals), tuple(issues)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def check_goals(text):
+    """
+    Return ``(goals, issues)`` for a ``Match.goals`` string.
+
+    ``goals`` is a tuple of :class:`ParsedGoal` and ``issues`` a tuple of
+    :class:`GoalIssue` for fragments that were skipped: text that is not a
+    scorer and minute, or a bare minute with no scorer before it.
+    """
+    return _check_goals(text)
+
+
+def parse_goals(text):
+    """Return the goals in a ``Match.goals`` string as :class:`ParsedGoal`."""
+    return check_goals(text)[0]
+
+
+def parse_goals_batch(texts):
+    """
+    Return the goals of each string in ``texts``, in order.
+
+    Repeated strings are parsed once. The per-string cache is bypassed, so
+    a large batch does not evict the strings cached for interactive use.
+    """
+    parsed = {}
+    results = []
+    for text in texts:
+        goals = parsed.get(text)
+        if goals is None:
+            goals = parsed[text] = _check_goals(text)[0] if text else ()
+        results.append(goals)
+    return results
@@ -0,0 +1,109 @@
+"""
+Syncing of :model:`team.GoalEvent` rows with the ``Match.goals`` text.
+
+Goal events are derived from the goals text, read with
+:mod:`team.goal_parser`. :func:`sync_goal_events` rebuilds them with one
+delete and one bulk insert per batch of matches. It is called from
+``post_save`` when a match is saved and by the importer after each batch,
+since ``bulk_create`` does not send signals. Deleting a match deletes its
+events by cascade.
+"""
+
+from .goal_parser import parse_goals_batch
+from .models import GoalEvent, Match
+
+SYNC_BATCH_SIZE = 500
+
+
+def build_goal_events(match_id, season_id, goals):
+    """Return unsaved :model:`team.GoalEvent` objects for parsed goals."""
+    return [
+        GoalEvent(
+            match_id=match_id,
+            season_id=season_id,
+            scorer=goal.scorer[:100],
+            minute=goal.minute,
+            stoppage=goal.stoppage,
+            is_penalty=goal.is_penalty,
+            is_own_goal=goal.is_own_goal,
+            order=order,
+        )
+        for order, goal in enumerate(goals)
+    ]
+
+
+def _sync_chunk(matches, replace):
+    if replace:
+        GoalEvent.objects.filter(
+            match_id__in=[match_id for match_id, _, _ in matches]
+        ).delete()
+    events = []
+    parsed = parse_goals_batch([text for _, _, text in matches])
+    for (match_id, season_id, _), goals in zip(matches, parsed):
+        events.extend(build_goal_events(match_id, season_id, goals))
+    GoalEvent.objects.bulk_create(events)
+    return len(events)
+
+
+def sync_goal_events(matches, batch_size=SYNC_BATCH_SIZE, replace=True):
+    """
+    Rebuild the goal events of ``matches``.
+
+    ``matches`` is an iterable of ``(id, season_id, goals)`` tuples, such
+    as ``Match.objects.values_list("id", "season_id", "goals")``. Existing
+    events are deleted and replaced in bulk, ``batch_size`` matches at a
+    time; pass ``replace=False`` for new matches that cannot have events
+    yet. Returns the number of events written.
+    """
+    written = 0
+    chunk = []
+    for row in matches:
+        chunk.append(row)
+        if len(chunk) == batch_size:
+            written += _sync_chunk(chunk, replace)
+            chunk = []
+    if chunk:
+        written += _sync_chunk(chunk, replace)
+    return written
+
+
+def sync_season_goal_events(season, keys=None, replace=True):
+    """
+    Rebuild goal events for a season's matches.
+
+    With ``keys``, a collection of ``(date, opponent)`` natural keys, only
+    those matches are rebuilt.
+    """
+    matches = Match.objects.filter(season=season)
+    if keys is not None:
+        matches = matches.filter(
+            date__in={match_date for match_date, _ in keys}
+        )
+    rows = matches.values_list("id", "season_id", "goals", "date", "opponent")
+    return sync_goal_events(
+        (
+            (match_id, season_id, text)
+            for match_id, season_id, text, *key in rows.iterator()
+            if keys is None or tuple(key) in keys
+        ),
+        replace=replace,
+    )
+
+
+def sync_written_matches(season, matches, replace=True):
+    """
+    Rebuild goal events for matches just written with ``bulk_create``.
+
+    Primary keys are used when the database returned them; otherwise (for
+    example after an upsert) the matches are found by natural key.
+    """
+    if not matches:
+        return 0
+    if all(match.pk is not None for match in matches):
+        return sync_goal_events(
+            ((match.pk, match.season_id, match.goals) for match in matches),
+            replace=replace,
+        )
+    return sync_season_goal_events(
+        season, {(match.date, match.opponent) for match in matches}, replace
+    )
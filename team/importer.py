@@ -0,0 +1,696 @@
+"""
+Parsing and bulk loading of :model:`team.Match` records from TSV data.
+
+Uploads are decoded incrementally from the file's chunks and parsed row by
+row, so memory use does not grow with the size of the file. Parsed rows are
+written with batched ``bulk_create`` calls inside a single transaction, so a
+bad row aborts the whole import instead of leaving a partial season behind.
+
+Matches are identified by their natural key ``(season, date, opponent)``.
+In ``insert`` mode every row must be new; in ``upsert`` mode rows matching
+an existing match update it, and rows identical to it are skipped, so
+re-importing a corrected file only writes the rows that changed.
+"""
+
+import codecs
+import csv
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, time
+from time import perf_counter
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .goal_parser import check_goals
+from .goals import sync_goal_events, sync_written_matches
+from .models import Match, Season
+from .stats import Record
+from .summaries import record_change
+
+REQUIRED_FIELDS = {"date", "opponent"}
+KNOWN_FIELDS = REQUIRED_FIELDS | {
+    "time",
+    "is_home",
+    "competition",
+    "round",
+    "attendance",
+    "team_score",
+    "opponent_score",
+    "goals",
+}
+HOME_VALUES = {"home", "h", "true", "yes", "1"}
+AWAY_VALUES = {"away", "a", "false", "no", "0"}
+DEFAULT_BATCH_SIZE = 500
+
+INSERT = "insert"
+UPSERT = "upsert"
+IMPORT_MODES = [
+    (INSERT, "Add new matches only"),
+    (UPSERT, "Add new matches and update existing ones"),
+]
+KEY_FIELDS = ["season", "date", "opponent"]
+UPDATE_FIELDS = [
+    "is_home",
+    "competition",
+    "round",
+    "goals",
+    "attendance",
+    "team_score",
+    "opponent_score",
+    "time",
+]
+GOALS_INDEX = UPDATE_FIELDS.index("goals")
+TEAM_SCORE_INDEX = UPDATE_FIELDS.index("team_score")
+OPPONENT_SCORE_INDEX = UPDATE_FIELDS.index("opponent_score")
+
+
+ERROR = "error"
+WARNING = "warning"
+REPORT_COLUMNS = ["row", "column", "level", "message", "value"]
+
+
+class MatchImportError(ValueError):
+    """Raised when TSV data cannot be imported."""
+
+
+@dataclass
+class RowIssue:
+    """A problem found in one row (or the header) of a TSV file."""
+
+    row: int
+    column: str
+    level: str
+    message: str
+    value: str = ""
+
+    def __str__(self):
+        return f"Row {self.row}: {self.message}"
+
+
+@dataclass
+class ImportResult:
+    """Outcome of an import: rows written, warnings and timing."""
+
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    warnings: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def processed(self):
+        """Return the number of rows read from the file."""
+        return self.created + self.updated + self.unchanged
+
+    @property
+    def rows_per_second(self):
+        """Return the throughput of the import."""
+        if not self.elapsed:
+            return 0.0
+        return self.processed / self.elapsed
+
+
+def get_batch_size(batch_size=None):
+    """Return the batch size to use for ``bulk_create``."""
+    if batch_size is None:
+        batch_size = getattr(
+            settings, "MATCH_IMPORT_BATCH_SIZE", DEFAULT_BATCH_SIZE
+        )
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
+    return batch_size
+
+
+def _value(row, name):
+    """Return the stripped value of a column, or '' if absent."""
+    return (row.get(name) or "").strip()
+
+
+def _parse_int(value, column, line_num, issues):
+    """Return value as an int, warning and returning None if malformed."""
+    if value.isdigit():
+        return int(value)
+    if value:
+        issues.append(
+            RowIssue(
+                line_num,
+                column,
+                WARNING,
+                f"'{value}' is not a whole number for {column}. "
+                "Leaving it blank.",
+                value,
+            )
+        )
+    return None
+
+
+def _parse_time(value, line_num, issues):
+    """Return value as a time, warning and returning None if malformed."""
+    try:
+        return time.fromisoformat(value) if value else None
+    except ValueError:
+        issues.append(
+            RowIssue(
+                line_num,
+                "time",
+                WARNING,
+                f"'{value}' is not a valid time. Leaving it blank.",
+                value,
+            )
+        )
+        return None
+
+
+def check_match_row(row, line_num):
+    """
+    Convert one TSV row into Match fields, collecting every problem found.
+
+    Returns a ``(fields, issues)`` tuple, where ``issues`` is a list of
+    :class:`RowIssue`. ``fields`` is None if the row has any errors.
+    """
+    issues = []
+    if None in row:
+        issues.append(
+            RowIssue(
+                line_num,
+                "",
+                WARNING,
+                "Row has more values than the header. Extra values are "
+                "ignored.",
+            )
+        )
+    short = [name for name, value in row.items() if value is None]
+    if short:
+        issues.append(
+            RowIssue(
+                line_num,
+                ", ".join(short),
+                WARNING,
+                "Row has fewer values than the header.",
+            )
+        )
+
+    value = _value(row, "date")
+    try:
+        match_date = date.fromisoformat(value)
+    except ValueError:
+        match_date = None
+        issues.append(
+            RowIssue(
+                line_num,
+                "date",
+                ERROR,
+                f"Invalid date '{value}'. Use YYYY-MM-DD.",
+                value,
+            )
+        )
+
+    opponent = _value(row, "opponent")
+    if not opponent:
+        issues.append(
+            RowIssue(line_num, "opponent", ERROR, "Opponent is missing.")
+        )
+
+    home_field = _value(row, "is_home").lower()
+    if home_field in HOME_VALUES:
+        is_home = True
+    elif home_field in AWAY_VALUES:
+        is_home = False
+    else:
+        is_home = False
+        issues.append(
+            RowIssue(
+                line_num,
+                "is_home",
+                WARNING,
+                f"Unrecognized value '{home_field}' for is_home. "
+                "Defaulting to away.",
+                home_field,
+            )
+        )
+
+    goals = _value(row, "goals")
+    for goal_issue in check_goals(goals)[1] if goals else ():
+        issues.append(
+            RowIssue(
+                line_num,
+                "goals",
+                WARNING,
+                f"Goal {goal_issue} It is kept in the text but not counted.",
+                goal_issue.fragment,
+            )
+        )
+
+    fields = {
+        "date": match_date,
+        "opponent": opponent,
+        "is_home": is_home,
+        "competition": _value(row, "competition"),
+        "round": _value(row, "round"),
+        "goals": goals,
+        "attendance": _parse_int(
+            _value(row, "attendance"), "attendance", line_num, issues
+        ),
+        "team_score": _parse_int(
+            _value(row, "team_score"), "team_score", line_num, issues
+        ),
+        "opponent_score": _parse_int(
+            _value(row, "opponent_score"), "opponent_score", line_num, issues
+        ),
+        "time": _parse_time(_value(row, "time"), line_num, issues),
+    }
+    if any(issue.level == ERROR for issue in issues):
+        fields = None
+    return fields, issues
+
+
+def parse_match_row(row, line_num):
+    """
+    Convert one TSV row into keyword arguments for :model:`team.Match`.
+
+    Returns a ``(fields, warnings)`` tuple, with each warning as a string.
+    Raises :class:`MatchImportError` for the first error in the row.
+    """
+    fields, issues = check_match_row(row, line_num)
+    for issue in issues:
+        if issue.level == ERROR:
+            raise MatchImportError(str(issue))
+    return fields, [str(issue) for issue in issues]
+
+
+def check_header(fieldnames):
+    """Return a list of :class:`RowIssue` for a TSV header row."""
+    if not fieldnames:
+        return [
+            RowIssue(
+                1,
+                "",
+                ERROR,
+                "The uploaded file is empty or missing a header row.",
+            )
+        ]
+    issues = []
+    missing = REQUIRED_FIELDS - set(fieldnames)
+    if missing:
+        issues.append(
+            RowIssue(
+                1,
+                ", ".join(sorted(missing)),
+                ERROR,
+                f"Missing required fields: {', '.join(sorted(missing))}",
+            )
+        )
+    for name in fieldnames:
+        if name not in KNOWN_FIELDS:
+            issues.append(
+                RowIssue(
+                    1,
+                    name,
+                    WARNING,
+                    f"Unknown column '{name}' will be ignored.",
+                    name,
+                )
+            )
+    return issues
+
+
+def iter_text_lines(file, encoding="utf-8", chunk_size=None):
+    """
+    Yield decoded lines from an uploaded file, one chunk at a time.
+
+    Bytes are read with ``file.chunks()`` and decoded incrementally, so
+    multi-byte characters and line endings split across chunk boundaries
+    are handled without ever holding the whole file in memory. Lines keep
+    their endings, as the :mod:`csv` module expects.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in file.chunks(chunk_size):
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        # Hold back the last line unless it is complete; a trailing "\r"
+        # may be the first half of a "\r\n" pair.
+        pending = lines.pop() if lines and lines[-1][-1] != "\n" else ""
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    yield from pending.splitlines(keepends=True)
+
+
+def iter_tsv(lines):
+    """
+    Yield ``(line_num, fields, warnings)`` for each row of TSV lines.
+
+    Raises :class:`MatchImportError` if the header is missing or
+    incomplete, or when an invalid row is reached.
+    """
+    reader = csv.DictReader(lines, delimiter="\t")
+    for issue in check_header(reader.fieldnames):
+        if issue.level == ERROR:
+            raise MatchImportError(issue.message)
+
+    for row in reader:
+        fields, warnings = parse_match_row(row, reader.line_num)
+        yield reader.line_num, fields, warnings
+
+
+def parse_tsv(lines):
+    """
+    Parse an iterable of TSV lines into Match field dictionaries.
+
+    Returns a ``(rows, warnings)`` tuple. Raises :class:`MatchImportError`
+    if the header is missing or incomplete, or if any row is invalid.
+    """
+    rows = []
+    warnings = []
+    for _, fields, row_warnings in iter_tsv(lines):
+        rows.append(fields)
+        warnings.extend(row_warnings)
+    return rows, warnings
+
+
+def _existing_matches(season):
+    """Map the natural key of every match in ``season`` to its values."""
+    rows = Match.objects.filter(season=season).values_list(
+        "date", "opponent", *UPDATE_FIELDS
+    )
+    return {(row[0], row[1]): row[2:] for row in rows}
+
+
+def _write(season, batch, goal_batch, mode, batch_size):
+    """
+    Insert, or in upsert mode insert-or-update, a batch of matches.
+
+    ``bulk_create`` sends no signals, so goal events are rebuilt here for
+    ``goal_batch``, the matches in the batch whose goals have changed.
+    """
+    if mode == UPSERT:
+        Match.objects.bulk_create(
+            batch,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=KEY_FIELDS,
+            # Each new Match carries a fresh version and stamp, so changed
+            # rows get them.
+            update_fields=[*UPDATE_FIELDS, "version", "updated_at"],
+        )
+    else:
+        Match.objects.bulk_create(batch, batch_size=batch_size)
+    sync_written_matches(season, goal_batch, replace=mode == UPSERT)
+
+
+def import_matches(season, lines, batch_size=None, mode=INSERT):
+    """
+    Import TSV lines into ``season`` as :model:`team.Match` records.
+
+    ``lines`` may be any iterable, including :func:`iter_text_lines` over
+    an upload. Rows are written in one transaction using ``bulk_create`` in
+    batches of ``batch_size`` (default ``settings.MATCH_IMPORT_BATCH_SIZE``)
+    as they are parsed; an invalid row rolls back everything written so far.
+
+    In :data:`UPSERT` mode the season's existing matches are loaded in one
+    query, unchanged rows are skipped and new or changed rows are written
+    with ``bulk_create(update_conflicts=True)``. If a key repeats within the
+    file, the last row wins.
+
+    The change in the season's results is added up as rows are read and
+    applied to its :model:`team.SeasonSummary` once, at the end.
+    """
+    return import_rows(season, iter_tsv(lines), batch_size, mode)
+
+
+def import_rows(season, rows, batch_size=None, mode=INSERT):
+    """
+    Write already parsed rows into ``season``.
+
+    ``rows`` is an iterable of ``(line_num, fields, warnings)`` tuples as
+    produced by :func:`iter_tsv`. See :func:`import_matches`.
+    """
+    if mode not in (INSERT, UPSERT):
+        raise ValueError(f"Unknown import mode: {mode}")
+    batch_size = get_batch_size(batch_size)
+    started = perf_counter()
+    result = ImportResult()
+    batch = []
+    batch_keys = set()
+    goal_batch = []
+    summary_delta = Record()
+    try:
+        with transaction.atomic():
+            existing = _existing_matches(season) if mode == UPSERT else {}
+            for _, fields, warnings in rows:
+                result.warnings.extend(warnings)
+                key = (fields["date"], fields["opponent"])
+                if mode == UPSERT:
+                    values = tuple(fields[name] for name in UPDATE_FIELDS)
+                    if key not in existing:
+                        result.created += 1
+                        goals_changed = bool(fields["goals"])
+                    elif existing[key] == values:
+                        result.unchanged += 1
+                        continue
+                    else:
+                        result.updated += 1
+                        goals_changed = (
+                            existing[key][GOALS_INDEX] != fields["goals"]
+                        )
+                        summary_delta.subtract(
+                            Record.for_score(
+                                existing[key][TEAM_SCORE_INDEX],
+                                existing[key][OPPONENT_SCORE_INDEX],
+                            )
+                        )
+                    existing[key] = values
+                else:
+                    result.created += 1
+                    goals_changed = bool(fields["goals"])
+                summary_delta.add(
+                    Record.for_score(
+                        fields["team_score"], fields["opponent_score"]
+                    )
+                )
+                if len(batch) == batch_size or key in batch_keys:
+                    # A key may not be upserted twice in one statement.
+                    _write(season, batch, goal_batch, mode, batch_size)
+                    batch = []
+                    batch_keys = set()
+                    goal_batch = []
+                match = Match(season=season, **fields)
+                batch.append(match)
+                batch_keys.add(key)
+                if goals_changed:
+                    goal_batch.append(match)
+            if batch:
+                _write(season, batch, goal_batch, mode, batch_size)
+            record_change(season.pk, summary_delta)
+            if result.created or result.updated:
+                Season.objects.filter(pk=season.pk).touch()
+    except IntegrityError as e:
+        raise MatchImportError(
+            "Some matches already exist in this season. Import in update "
+            f"mode to change them instead. ({e})"
+        ) from e
+    result.elapsed = perf_counter() - started
+    return result
+
+
+COPY_COLUMNS = ["date", "opponent", *UPDATE_FIELDS]
+COPY_STAMPS = ["created_at", "updated_at"]
+COPY_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+)
+
+
+def _copy_value(value):
+    """Return a value in PostgreSQL's COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value).translate(COPY_ESCAPES)
+
+
+def iter_copy_lines(season, rows, result):
+    """
+    Yield parsed rows as lines of COPY text for ``season``.
+
+    Each line ends with a fresh match version and the ``created_at`` and
+    ``updated_at`` stamps, which ``COPY`` does not fill in. Row warnings
+    are collected on ``result`` as the rows are consumed.
+    """
+    stamp = _copy_value(timezone.now())
+    for _, fields, warnings in rows:
+        result.warnings.extend(warnings)
+        result.created += 1
+        yield "\t".join(
+            [str(season.pk)]
+            + [_copy_value(fields[name]) for name in COPY_COLUMNS]
+            + [str(uuid.uuid4()), stamp, stamp]
+        ) + "\n"
+
+
+class _LineReader:
+    """Minimal file-like object over an iterator of text lines."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.buffer = ""
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            line = next(self.lines, None)
+            if line is None:
+                break
+            self.buffer += line
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+def copy_rows(season, rows):
+    """
+    Write parsed rows into ``season`` with PostgreSQL ``COPY FROM STDIN``.
+
+    Rows are streamed to the server as they are produced, bypassing the
+    ORM entirely; goal events and the season summary are then updated for
+    the new matches. Only available on PostgreSQL; see :func:`import_rows`
+    for other databases. Conflicting rows fail the whole COPY.
+    """
+    started = perf_counter()
+    result = ImportResult()
+    table = connection.ops.quote_name(Match._meta.db_table)
+    columns = ", ".join(
+        connection.ops.quote_name(Match._meta.get_field(name).column)
+        for name in ["season", *COPY_COLUMNS, "version", *COPY_STAMPS]
+    )
+    sql = f"COPY {table} ({columns}) FROM STDIN"
+    summary_delta = Record()
+
+    def counted(rows):
+        for row in rows:
+            fields = row[1]
+            summary_delta.add(
+                Record.for_score(
+                    fields["team_score"], fields["opponent_score"]
+                )
+            )
+            yield row
+
+    lines = iter_copy_lines(season, counted(rows), result)
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            if hasattr(cursor, "copy_expert"):
+                # psycopg2
+                cursor.copy_expert(sql, _LineReader(lines))
+            else:
+                # psycopg 3
+                with cursor.copy(sql) as copy:
+                    for line in lines:
+                        copy.write(line)
+            sync_goal_events(
+                Match.objects.filter(season=season, goal_events__isnull=True)
+                .exclude(goals="")
+                .values_list("id", "season_id", "goals")
+                .iterator(),
+                replace=False,
+            )
+            record_change(season.pk, summary_delta)
+            if result.created:
+                Season.objects.filter(pk=season.pk).touch()
+    except IntegrityError as e:
+        raise MatchImportError(
+            f"Some matches already exist in this season. ({e})"
+        ) from e
+    result.elapsed = perf_counter() - started
+    return result
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of a dry run: rows checked and every issue found."""
+
+    rows: int = 0
+    issues: list = field(default_factory=list)
+
+    @property
+    def errors(self):
+        return [issue for issue in self.issues if issue.level == ERROR]
+
+    @property
+    def warnings(self):
+        return [issue for issue in self.issues if issue.level == WARNING]
+
+    @property
+    def is_valid(self):
+        """Return True if the file could be imported."""
+        return not self.errors
+
+
+def iter_issues(lines):
+    """
+    Yield a :class:`RowIssue` for every problem in an iterable of TSV lines.
+
+    Unlike :func:`iter_tsv` this never stops at the first error and never
+    touches the database. Rows whose natural key ``(date, opponent)``
+    repeats an earlier row are reported as warnings.
+    """
+    line_num = 1
+    try:
+        reader = csv.DictReader(lines, delimiter="\t")
+        header_issues = check_header(reader.fieldnames)
+        yield from header_issues
+        if any(issue.level == ERROR for issue in header_issues):
+            return
+        seen = {}
+        for row in reader:
+            line_num = reader.line_num
+            fields, issues = check_match_row(row, line_num)
+            yield from issues
+            if fields is None:
+                continue
+            key = (fields["date"], fields["opponent"])
+            if key in seen:
+                yield RowIssue(
+                    line_num,
+                    "date, opponent",
+                    WARNING,
+                    f"Duplicate of row {seen[key]}. Only the last copy is "
+                    "kept when updating; adding new matches will fail.",
+                )
+            seen[key] = line_num
+    except (UnicodeDecodeError, csv.Error) as e:
+        yield RowIssue(line_num + 1, "", ERROR, f"Unreadable file: {e}")
+
+
+def validate_tsv(lines):
+    """
+    Check every row of an iterable of TSV lines without writing anything.
+
+    Returns a :class:`ValidationReport` listing all errors and warnings.
+    """
+    report = ValidationReport()
+
+    def counted():
+        for line in lines:
+            if line.strip():
+                report.rows += 1
+            yield line
+
+    report.issues = list(iter_issues(counted()))
+    # The header is not a data row.
+    report.rows = max(report.rows - 1, 0)
+    return report
+
+
+def iter_report_tsv(issues):
+    """Yield a validation report as TSV lines, header first."""
+    yield "\t".join(REPORT_COLUMNS) + "\n"
+    for issue in issues:
+        yield "\t".join(
+            str(getattr(issue, name)).replace("\t", " ").replace("\n", " ")
+            for name in REPORT_COLUMNS
+        ) + "\n"
@@ -0,0 +1,226 @@
+"""
+Database-backed queue for running :model:`team.ImportJob` imports.
+
+Uploads are stored in the database with the job, in
+:model:`team.ImportChunk` rows, and imported by a separate worker process
+(``manage.py run_import_worker``), so no message broker or shared
+filesystem is needed. The worker validates the whole file first,
+reporting progress as it goes, and then writes it with
+:func:`team.importer.import_matches`.
+
+Workers record a heartbeat on the job as they go. A running job whose
+heartbeat is older than ``settings.MATCH_IMPORT_JOB_TIMEOUT`` is taken to
+belong to a worker that died and is claimed again, until it has been
+claimed ``settings.MATCH_IMPORT_JOB_ATTEMPTS`` times; then it fails.
+Each claim is an attempt, numbered by ``attempts``: a worker only records
+progress or imports while the job's attempt is still its own, so a job
+is never imported twice.
+"""
+
+from datetime import timedelta
+from time import sleep
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .importer import (
+    INSERT,
+    get_batch_size,
+    import_matches,
+    iter_text_lines,
+    iter_tsv,
+)
+from .models import ImportChunk, ImportJob
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _pieces(file):
+    """Yield the bytes of an uploaded file in pieces of ``CHUNK_SIZE``."""
+    size = CHUNK_SIZE
+    buffer = b""
+    for chunk in file.chunks():
+        buffer += chunk
+        while len(buffer) >= size:
+            yield buffer[:size]
+            buffer = buffer[size:]
+    if buffer:
+        yield buffer
+
+
+class StoredUpload:
+    """
+    A job's stored upload, read back one :model:`team.ImportChunk` at a time.
+
+    Provides the ``chunks()`` method that
+    :func:`team.importer.iter_text_lines` reads uploads with.
+    """
+
+    def __init__(self, job):
+        self.job = job
+
+    def chunks(self, chunk_size=None):
+        indexes = list(
+            self.job.chunks.order_by("index").values_list("index", flat=True)
+        )
+        # One query per piece, so only one piece is held in memory.
+        for index in indexes:
+            yield bytes(
+                ImportChunk.objects.values_list("data", flat=True).get(
+                    job=self.job, index=index
+                )
+            )
+
+
+def enqueue_import(season, file, contributor, mode=INSERT):
+    """Store an uploaded file as a pending import job for ``season``."""
+    with transaction.atomic():
+        job = ImportJob.objects.create(
+            season=season, contributor=contributor, mode=mode
+        )
+        for index, data in enumerate(_pieces(file)):
+            ImportChunk.objects.create(job=job, index=index, data=data)
+    return job
+
+
+def claim_next_job():
+    """
+    Mark the oldest claimable job as running and return it.
+
+    Pending jobs can be claimed, and so can running jobs whose heartbeat
+    is older than ``settings.MATCH_IMPORT_JOB_TIMEOUT``. A stale job
+    already claimed ``settings.MATCH_IMPORT_JOB_ATTEMPTS`` times is marked
+    failed instead. Returns None if the queue is empty. Rows locked by
+    another worker, including a job whose import is being written, are
+    skipped, so several workers can share the queue on PostgreSQL. The
+    claim only succeeds if the job is unchanged since it was read, so two
+    workers never claim the same attempt.
+    """
+    while True:
+        now = timezone.now()
+        stale = Q(
+            status=ImportJob.Status.RUNNING,
+            heartbeat_at__lt=now
+            - timedelta(seconds=settings.MATCH_IMPORT_JOB_TIMEOUT),
+        )
+        with transaction.atomic():
+            job = (
+                ImportJob.objects.select_for_update(skip_locked=True)
+                .filter(Q(status=ImportJob.Status.PENDING) | stale)
+                .order_by("created_at", "pk")
+                .first()
+            )
+            if job is None:
+                return None
+            unchanged = ImportJob.objects.filter(
+                pk=job.pk, status=job.status, attempts=job.attempts
+            )
+            if job.attempts >= settings.MATCH_IMPORT_JOB_ATTEMPTS:
+                error = (
+                    f"The worker running this import stopped "
+                    f"{job.attempts} times."
+                )
+                if unchanged.update(
+                    status=ImportJob.Status.FAILED,
+                    error=error,
+                    finished_at=now,
+                ):
+                    job.chunks.all().delete()
+                continue
+            if not unchanged.update(
+                status=ImportJob.Status.RUNNING,
+                started_at=now,
+                heartbeat_at=now,
+                attempts=job.attempts + 1,
+            ):
+                continue
+            job.status = ImportJob.Status.RUNNING
+            job.started_at = job.heartbeat_at = now
+            job.attempts += 1
+            return job
+
+
+def _claimed(job):
+    """The job's row, as long as this worker's claim on it still stands."""
+    return ImportJob.objects.filter(
+        pk=job.pk, status=ImportJob.Status.RUNNING, attempts=job.attempts
+    )
+
+
+def _report_progress(job, rows):
+    """Record progress and a heartbeat; return False if the job was reclaimed."""
+    job.rows_processed = rows
+    job.heartbeat_at = timezone.now()
+    return bool(
+        _claimed(job).update(
+            rows_processed=rows, heartbeat_at=job.heartbeat_at
+        )
+    )
+
+
+def _finish(job):
+    job.finished_at = timezone.now()
+    job.chunks.all().delete()
+    job.save()
+
+
+def run_job(job):
+    """
+    Validate and import a claimed job's file, recording the outcome.
+
+    Progress and the heartbeat are committed every batch while the file
+    is validated. The import itself runs in a single transaction that
+    holds the job's row locked, so its rows only become visible once it
+    has succeeded and, on PostgreSQL, the job cannot be reclaimed while
+    it runs. A worker whose job was reclaimed by another, because its
+    heartbeat went stale, stops without importing or recording anything.
+    """
+    batch_size = get_batch_size()
+    upload = StoredUpload(job)
+    try:
+        rows = 0
+        for rows, _ in enumerate(iter_tsv(iter_text_lines(upload)), 1):
+            if rows % batch_size == 0 and not _report_progress(job, rows):
+                return job
+        if not _report_progress(job, rows):
+            return job
+        with transaction.atomic():
+            if not _claimed(job).select_for_update().exists():
+                return job
+            result = import_matches(
+                job.season, iter_text_lines(upload), mode=job.mode
+            )
+            job.rows_processed = result.processed
+            job.warnings = result.warnings
+            job.status = ImportJob.Status.SUCCEEDED
+            _finish(job)
+        return job
+    except Exception as e:
+        job.error = str(e)
+        job.status = ImportJob.Status.FAILED
+    with transaction.atomic():
+        if _claimed(job).select_for_update().exists():
+            _finish(job)
+    return job
+
+
+def run_worker(poll_interval=2.0, once=False):
+    """
+    Process queued jobs until stopped.
+
+    With ``once`` the worker returns as soon as the queue is empty.
+    Returns the number of jobs processed.
+    """
+    processed = 0
+    while True:
+        close_old_connections()
+        job = claim_next_job()
+        if job is None:
+            if once:
+                return processed
+            sleep(poll_interval)
+            continue
+        run_job(job)
+        processed += 1
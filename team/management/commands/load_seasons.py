@@ -0,0 +1,95 @@
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from team.archive import import_season_files
+from team.importer import MatchImportError
+from team.models import Team
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk load a directory of season TSV files (one file per season, "
+        "like data/) into a team. Uses COPY on PostgreSQL and batched "
+        "INSERTs elsewhere."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", help="Directory of .tsv files.")
+        parser.add_argument(
+            "--team", required=True, help="Slug of the team to load into."
+        )
+        parser.add_argument(
+            "--user",
+            help="Username of the team's contributor, if the slug is shared.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Processes used to parse the files (default: one per CPU).",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use batched INSERTs even on PostgreSQL.",
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(options["directory"])
+        if not directory.is_dir():
+            raise CommandError(f"{directory} is not a directory.")
+        files = sorted(directory.glob("*.tsv"))
+        if not files:
+            raise CommandError(f"No .tsv files found in {directory}.")
+
+        teams = Team.objects.filter(slug=options["team"])
+        if options["user"]:
+            teams = teams.filter(contributor__username=options["user"])
+        teams = list(teams.select_related("contributor")[:2])
+        if len(teams) != 1:
+            raise CommandError(
+                f"Expected one team with slug '{options['team']}', found "
+                f"{len(teams) or 'none'}. Use --user to choose."
+            )
+        team = teams[0]
+
+        use_copy = not options["no_copy"]
+        method = (
+            "COPY"
+            if use_copy and connection.vendor == "postgresql"
+            else "INSERT"
+        )
+        started = perf_counter()
+        members = [(path.name, path.read_bytes()) for path in files]
+        try:
+            result = import_season_files(
+                team,
+                team.contributor,
+                members,
+                workers=options["workers"],
+                use_copy=use_copy,
+            )
+        except MatchImportError as e:
+            raise CommandError(str(e)) from e
+        elapsed = perf_counter() - started
+
+        self.stdout.write(
+            f"Parsed {len(files)} file(s) in {result.parse_elapsed:.3f}s."
+        )
+        total = 0
+        for item in result.seasons:
+            total += item.result.created
+            self.stdout.write(
+                f"{item.file_name}: {item.result.created} rows into "
+                f"{item.season}{' (new season)' if item.season_created else ''}"
+                f" in {item.result.elapsed:.3f}s "
+                f"({item.result.rows_per_second:,.0f} rows/s)"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {total} matches with {method} in {elapsed:.3f}s "
+                f"({total / elapsed if elapsed else 0:,.0f} rows/s)."
+            )
+        )
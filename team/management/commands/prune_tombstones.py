@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from team.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete tombstones of deleted teams, seasons and matches older than "
+        "SYNC_TOMBSTONE_DAYS. Sync cursors older than that must resync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.SYNC_TOMBSTONE_DAYS,
+            help="Keep tombstones from this many days (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        count, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {count} tombstone(s)."))
@@ -0,0 +1,50 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from team.models import Season
+from team.summaries import check_summaries, rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild every season summary from its matches, or with --check "
+        "report summaries that differ from the live aggregates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only compare summaries with the matches; change nothing.",
+        )
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        if options["check"]:
+            mismatches = check_summaries()
+            for season_id, stored, live in mismatches:
+                self.stdout.write(
+                    f"Season {season_id}: stored {stored}, expected {live}"
+                )
+            if mismatches:
+                raise CommandError(
+                    f"{len(mismatches)} season summary(ies) are out of date. "
+                    "Run rebuild_summaries to fix them."
+                )
+            self.stdout.write(
+                self.style.SUCCESS("All season summaries are up to date.")
+            )
+            return
+
+        # Seasons whose totals change are touched, so cached pages and
+        # season lists keyed on their stamps are recomputed.
+        changed = [season_id for season_id, _, _ in check_summaries()]
+        count = rebuild_summaries()
+        Season.objects.filter(pk__in=changed).touch()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {count} season summary(ies) in "
+                f"{perf_counter() - started:.2f}s."
+            )
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from team.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = "Run queued TSV match imports in the background."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between checks of an empty queue.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit as soon as the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        processed = run_worker(
+            poll_interval=options["poll_interval"], once=options["once"]
+        )
+        self.stdout.write(f"Processed {processed} import job(s).")
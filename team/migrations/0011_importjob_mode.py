@@ -0,0 +1,18 @@
+# Generated by Django 4.2.21 on 2026-10-17 01:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("team", "0010_importjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="mode",
+            field=models.CharField(default="insert", max_length=10),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.21 on 2026-10-17 01:57
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_matches(apps, schema_editor):
+    """
+    Refuse to migrate while two matches share a natural key.
+
+    Duplicates were created by re-importing the same season file. Which
+    copy to keep is the operator's decision, so every duplicate is listed
+    and nothing is deleted.
+    """
+    Match = apps.get_model("team", "Match")
+    duplicates = (
+        Match.objects.values("season", "date", "opponent")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .order_by("season", "date", "opponent")
+    )
+    lines = []
+    for duplicate in duplicates:
+        ids = Match.objects.filter(
+            season=duplicate["season"],
+            date=duplicate["date"],
+            opponent=duplicate["opponent"],
+        ).values_list("id", flat=True)
+        lines.append(
+            f"  season {duplicate['season']}, {duplicate['date']} "
+            f"v {duplicate['opponent']}: matches "
+            f"{', '.join(str(pk) for pk in sorted(ids))}"
+        )
+    if lines:
+        raise RuntimeError(
+            "Matches must be unique by season, date and opponent, but "
+            f"{len(lines)} such key(s) are shared by several matches:\n"
+            + "\n".join(lines)
+            + "\nDelete the unwanted copies, e.g. in the admin, then run "
+            "migrate again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("team", "0011_importjob_mode"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            check_duplicate_matches, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="match",
+            constraint=models.UniqueConstraint(
+                fields=("season", "date", "opponent"),
+                name="unique_season_match_date_opponent",
+            ),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 4.2.21 on 2026-10-17 02:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_goal_events(apps, schema_editor):
+    """Create goal events for every match recorded before this migration."""
+    from team.goal_parser import parse_goals
+
+    Match = apps.get_model("team", "Match")
+    GoalEvent = apps.get_model("team", "GoalEvent")
+    events = []
+    matches = Match.objects.exclude(goals="").values_list(
+        "id", "season_id", "goals"
+    )
+    for match_id, season_id, text in matches.iterator():
+        for order, goal in enumerate(parse_goals(text)):
+            events.append(
+                GoalEvent(
+                    match_id=match_id,
+                    season_id=season_id,
+                    scorer=goal.scorer[:100],
+                    minute=goal.minute,
+                    stoppage=goal.stoppage,
+                    is_penalty=goal.is_penalty,
+                    is_own_goal=goal.is_own_goal,
+                    order=order,
+                )
+            )
+    GoalEvent.objects.bulk_create(events, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("team", "0011_match_natural_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GoalEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scorer", models.CharField(max_length=100)),
+                (
+                    "minute",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+                (
+                    "stoppage",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+                ("is_penalty", models.BooleanField(default=False)),
+                ("is_own_goal", models.BooleanField(default=False)),
+                ("order", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "match",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="goal_events",
+                        to="team.match",
+                    ),
+                ),
+                (
+                    "season",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="goal_events",
+                        to="team.season",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["match", "order"],
+                "indexes": [
+                    models.Index(
+                        fields=["scorer"], name="goalevent_scorer_idx"
+                    ),
+                    models.Index(
+                        fields=["season", "scorer"],
+                        name="goalevent_season_scorer_idx",
+                    ),
+                    models.Index(
+                        fields=["minute", "stoppage"],
+                        name="goalevent_minute_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(build_goal_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.21 on 2026-10-17 02:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, F, Q, Sum
+
+
+def build_summaries(apps, schema_editor):
+    """Summarise the played matches of every existing season."""
+    Season = apps.get_model("team", "Season")
+    Match = apps.get_model("team", "Match")
+    SeasonSummary = apps.get_model("team", "SeasonSummary")
+    totals = {
+        row.pop("season_id"): row
+        for row in Match.objects.filter(
+            team_score__isnull=False, opponent_score__isnull=False
+        )
+        .values("season_id")
+        .annotate(
+            played=Count("id"),
+            won=Count("id", filter=Q(team_score__gt=F("opponent_score"))),
+            drawn=Count("id", filter=Q(team_score=F("opponent_score"))),
+            lost=Count("id", filter=Q(team_score__lt=F("opponent_score"))),
+            goals_for=Sum("team_score"),
+            goals_against=Sum("opponent_score"),
+        )
+        .order_by()
+    }
+    SeasonSummary.objects.bulk_create(
+        [
+            SeasonSummary(season_id=season_id, **totals.get(season_id, {}))
+            for season_id in Season.objects.values_list("pk", flat=True)
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("team", "0012_goalevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeasonSummary",
+            fields=[
+                (
+                    "season",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="team.season",
+                    ),
+                ),
+                ("played", models.IntegerField(default=0)),
+                ("won", models.IntegerField(default=0)),
+                ("drawn", models.IntegerField(default=0)),
+                ("lost", models.IntegerField(default=0)),
+                ("goals_for", models.IntegerField(default=0)),
+                ("goals_against", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(build_summaries, migrations.RunPython.noop),
+    ]
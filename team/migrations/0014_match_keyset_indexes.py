@@ -0,0 +1,40 @@
+# Generated by Django 4.2.21 on 2026-10-17 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("team", "0013_seasonsummary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="match",
+            index=models.Index(
+                fields=["season", "date", "id"], name="match_season_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="match",
+            index=models.Index(
+                fields=["season", "opponent", "id"],
+                name="match_season_opponent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="match",
+            index=models.Index(
+                fields=["season", "competition", "date", "id"],
+                name="match_season_comp_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="match",
+            index=models.Index(
+                fields=["season", "is_home", "date", "id"],
+                name="match_season_venue_date_idx",
+            ),
+        ),
+    ]
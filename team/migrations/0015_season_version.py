@@ -0,0 +1,23 @@
+# Generated by Django 4.2.21 on 2026-10-17 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("team", "0014_match_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="season",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="season",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
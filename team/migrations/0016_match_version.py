@@ -0,0 +1,19 @@
+# Generated by Django 4.2.21 on 2026-10-17 02:38
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("team", "0015_season_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="match",
+            name="version",
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+    ]
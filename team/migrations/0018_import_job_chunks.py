@@ -0,0 +1,58 @@
+# Generated by Django 4.2.21 on 2026-10-17 03:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("team", "0017_change_tracking"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="importjob",
+            name="file",
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="ImportChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index", models.PositiveIntegerField()),
+                ("data", models.BinaryField()),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunks",
+                        to="team.importjob",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="importchunk",
+            constraint=models.UniqueConstraint(
+                fields=("job", "index"), name="unique_importchunk_index"
+            ),
+        ),
+    ]
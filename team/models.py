@@ -1,8 +1,11 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils.text import slugify
 from django.utils.safestring import mark_safe
 from django.urls import reverse
+from django.utils import timezone
 
 
 # Create your models here.
@@ -17,10 +20,15 @@ class Team(models.Model):
     - ``contributor``: ForeignKey to :model:`auth.User`, identifying the user who created the team
     - ``slug``: URL-safe identifier auto-generated from the team name
     - ``is_public``: Visibility flag (future use)
+    - ``created_at`` and ``updated_at``: When the team was added and last
+      changed, for delta sync
 
     **Constraints**
     - Enforces uniqueness of team slug per contributor
 
+    **Indexes**
+    - ``(contributor, updated_at, id)``, for delta sync
+
     **Methods**
     - ``get_display_name``: Returns the short name if available, otherwise the full name
     - ``get_create_season_url``: Constructs the URL to initiate a new season for this team
@@ -35,6 +43,8 @@ class Team(models.Model):
     )
     is_public = models.BooleanField(default=True)
     slug = models.SlugField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         """Return the team name."""
@@ -60,6 +70,20 @@ class Team(models.Model):
                 name="unique_contributor_team_slug",
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["contributor", "updated_at", "id"],
+                name="team_sync_idx",
+            )
+        ]
+
+
+class SeasonQuerySet(models.QuerySet):
+    def touch(self):
+        """Mark the seasons as changed: bump their version and stamp."""
+        return self.update(
+            version=models.F("version") + 1, updated_at=timezone.now()
+        )
 
 
 class Season(models.Model):
@@ -72,16 +96,23 @@ class Season(models.Model):
     - ``contributor``: ForeignKey to :model:`auth.User`, denoting the creator of this season
     - ``competition_list``: Comma-separated competitions (parsed as property)
     - ``slug``: URL slug, derived from season year range
+    - ``version`` and ``updated_at``: Bumped whenever the season or any of
+      its matches change, for conditional GETs of its pages and delta sync
+    - ``created_at``: When the season was added
 
     **Constraints**
     - Enforces uniqueness of season per team by date and slug
 
+    **Indexes**
+    - ``(team, updated_at, id)``, for delta sync
+
     **Properties**
     - ``competitions``: Parses and returns a list of trimmed competition names
 
     **Methods**
     - ``get_absolute_url``: Returns the URL to this season’s overview
     - ``get_create_match_url``: Returns the URL to create a new match for this season
+    - ``etag``: Returns an entity tag that changes with every change to the season
     """
 
     team = models.ForeignKey(Team, on_delete=models.CASCADE)
@@ -94,6 +125,11 @@ class Season(models.Model):
         help_text="Comma-separated list of competitions the team has entered for this season.",
     )
     slug = models.SlugField(max_length=10, blank=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SeasonQuerySet.as_manager()
 
     def __str__(self):
         """Return season string showing team and date range."""
@@ -131,6 +167,10 @@ class Season(models.Model):
         """Return URL for creating a new match in this season."""
         return reverse("create_match", args=[self.team.slug, self.slug])
 
+    def etag(self):
+        """Return an entity tag for pages showing this season's matches."""
+        return f"season-{self.pk}-{self.version}-{self.updated_at.timestamp():.6f}"
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -141,6 +181,11 @@ class Season(models.Model):
                 fields=["team", "slug"], name="unique_team_season_slug"
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["team", "updated_at", "id"], name="season_sync_idx"
+            )
+        ]
 
 
 class Match(models.Model):
@@ -156,6 +201,18 @@ class Match(models.Model):
     - ``attendance``: Optional attendance figure
     - ``team_score`` and ``opponent_score``: Final scores
     - ``goals``: Formatted string denoting goal scorers and timings
+    - ``version``: Random tag replaced on every write, used to key cached
+      renderings of the match
+    - ``created_at`` and ``updated_at``: When the match was added and last
+      written, for delta sync
+
+    **Constraints**
+    - Enforces uniqueness of match per season by date and opponent
+
+    **Indexes**
+    - Season-scoped ``(date, id)`` and ``(opponent, id)`` orders, also by
+      competition and venue, for keyset pagination
+    - ``(season, updated_at, id)``, for delta sync
 
     **Methods**
     - ``__str__``: Returns a concise textual summary of the match
@@ -182,6 +239,33 @@ class Match(models.Model):
             "List scorer names followed by goal minutes. Separate players with commas."
         ),
     )
+    version = models.UUIDField(default=uuid.uuid4, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded result so saves can apply only the change."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        result_fields = ("season_id", "team_score", "opponent_score")
+        if all(name in loaded for name in result_fields):
+            instance._loaded_result = tuple(
+                loaded[name] for name in result_fields
+            )
+        return instance
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version = uuid.uuid4()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    "version",
+                    "updated_at",
+                }
+        super().save(*args, **kwargs)
 
     def __str__(self):
         """Return human-readable match summary."""
@@ -229,3 +313,314 @@ class Match(models.Model):
             if self.is_home
             else mark_safe(f"<strong>{self.season.team.name}</strong>")
         )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["season", "date", "opponent"],
+                name="unique_season_match_date_opponent",
+            )
+        ]
+        # Keyset pagination of the season match table (see team.pagination)
+        # reads rows in these orders, with and without the usual filters.
+        indexes = [
+            models.Index(
+                fields=["season", "date", "id"], name="match_season_date_idx"
+            ),
+            models.Index(
+                fields=["season", "opponent", "id"],
+                name="match_season_opponent_idx",
+            ),
+            models.Index(
+                fields=["season", "competition", "date", "id"],
+                name="match_season_comp_date_idx",
+            ),
+            models.Index(
+                fields=["season", "is_home", "date", "id"],
+                name="match_season_venue_date_idx",
+            ),
+            # Delta sync (see team.sync) reads the rows of each season
+            # changed since a stamp.
+            models.Index(
+                fields=["season", "updated_at", "id"], name="match_sync_idx"
+            ),
+        ]
+
+
+class GoalEventQuerySet(models.QuerySet):
+    def top_scorers(self):
+        """Return scorers with their goal counts, most goals first."""
+        return (
+            self.filter(is_own_goal=False)
+            .values("scorer")
+            .annotate(goals=models.Count("id"))
+            .order_by("-goals", "scorer")
+        )
+
+    def after(self, minute):
+        """Return goals scored after ``minute``, including stoppage time."""
+        return self.filter(
+            models.Q(minute__gt=minute)
+            | models.Q(minute=minute, stoppage__gt=0)
+        )
+
+
+class GoalEvent(models.Model):
+    """
+    A single goal parsed from the ``goals`` text of a :model:`team.Match`.
+
+    Rows are derived data: they are rebuilt from ``Match.goals`` whenever a
+    match is saved or imported (see :mod:`team.goals`) and removed with the
+    match, so they can be queried with indexed SQL instead of parsing text.
+
+    **Fields**
+    - ``match``: ForeignKey to the :model:`team.Match` the goal was scored in
+    - ``season``: ForeignKey to the match's :model:`team.Season`, for season-wide queries
+    - ``scorer``: Name of the goalscorer as written in the match
+    - ``minute``: Minute of the goal, if known
+    - ``stoppage``: Added-time minute for goals such as ``45+2``, if any
+    - ``is_penalty`` and ``is_own_goal``: Set from ``(pen)`` and ``(og)`` notes
+    - ``order``: Position of the goal within the match's ``goals`` text
+
+    **Methods**
+    - ``objects.top_scorers``: Scorers and goal counts, excluding own goals
+    - ``objects.after``: Goals scored after a given minute
+    """
+
+    match = models.ForeignKey(
+        Match, on_delete=models.CASCADE, related_name="goal_events"
+    )
+    season = models.ForeignKey(
+        Season, on_delete=models.CASCADE, related_name="goal_events"
+    )
+    scorer = models.CharField(max_length=100)
+    minute = models.PositiveSmallIntegerField(null=True, blank=True)
+    stoppage = models.PositiveSmallIntegerField(null=True, blank=True)
+    is_penalty = models.BooleanField(default=False)
+    is_own_goal = models.BooleanField(default=False)
+    order = models.PositiveSmallIntegerField(default=0)
+
+    objects = GoalEventQuerySet.as_manager()
+
+    def __str__(self):
+        """Return scorer and minute, e.g. 'Smith 45+2'."""
+        minute = "" if self.minute is None else f" {self.minute}"
+        stoppage = f"+{self.stoppage}" if self.stoppage else ""
+        return f"{self.scorer}{minute}{stoppage}"
+
+    class Meta:
+        ordering = ["match", "order"]
+        indexes = [
+            models.Index(fields=["scorer"], name="goalevent_scorer_idx"),
+            models.Index(
+                fields=["season", "scorer"], name="goalevent_season_scorer_idx"
+            ),
+            models.Index(
+                fields=["minute", "stoppage"], name="goalevent_minute_idx"
+            ),
+        ]
+
+
+class SeasonSummary(models.Model):
+    """
+    Stored totals of a :model:`team.Season`'s played matches.
+
+    Kept up to date incrementally: saving, deleting or importing matches
+    adds the change in each match's result to the totals (see
+    :mod:`team.summaries`), so pages listing many seasons read one row per
+    season instead of aggregating their matches. ``manage.py
+    rebuild_summaries`` recomputes every row and ``--check`` compares them
+    with the live aggregates.
+
+    **Fields**
+    - ``season``: One-to-one link to the summarised :model:`team.Season`
+    - ``played``, ``won``, ``drawn`` and ``lost``: Match counts
+    - ``goals_for`` and ``goals_against``: Goal totals
+    - ``updated_at``: When the totals last changed
+
+    **Properties**
+    - ``record``: The totals as a :class:`team.stats.Record`
+    """
+
+    season = models.OneToOneField(
+        Season,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="summary",
+    )
+    played = models.IntegerField(default=0)
+    won = models.IntegerField(default=0)
+    drawn = models.IntegerField(default=0)
+    lost = models.IntegerField(default=0)
+    goals_for = models.IntegerField(default=0)
+    goals_against = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """Return the season and its record."""
+        return (
+            f"{self.season_id}: P{self.played} W{self.won} "
+            f"D{self.drawn} L{self.lost}"
+        )
+
+    @property
+    def record(self):
+        """Return the totals as a :class:`team.stats.Record`."""
+        from .stats import Record
+
+        return Record(
+            played=self.played,
+            won=self.won,
+            drawn=self.drawn,
+            lost=self.lost,
+            goals_for=self.goals_for,
+            goals_against=self.goals_against,
+        )
+
+
+class ImportJob(models.Model):
+    """
+    A queued TSV import of :model:`team.Match` records into a :model:`team.Season`.
+
+    Jobs and their uploads (as :model:`team.ImportChunk` rows) are stored
+    in the database and picked up by the ``run_import_worker`` management
+    command, so large uploads are imported outside the request/response
+    cycle by a worker that need not share the web process's filesystem.
+
+    **Fields**
+    - ``season``: ForeignKey to the :model:`team.Season` receiving the matches
+    - ``contributor``: ForeignKey to :model:`auth.User`, the user who uploaded the file
+    - ``mode``: Import mode, either insert or upsert
+    - ``status``: One of pending, running, succeeded or failed
+    - ``rows_processed``: Number of rows validated or imported so far
+    - ``warnings``: List of non-fatal row warnings
+    - ``error``: Message explaining why the job failed
+    - ``created_at``, ``started_at`` and ``finished_at``: Job timestamps
+    - ``heartbeat_at``: When the worker running the job last reported in;
+      a running job whose heartbeat goes stale is claimed again
+    - ``attempts``: How many times a worker has claimed the job
+
+    **Properties**
+    - ``rows_per_second``: Throughput of the job so far
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    season = models.ForeignKey(
+        Season, on_delete=models.CASCADE, related_name="import_jobs"
+    )
+    contributor = models.ForeignKey(User, on_delete=models.CASCADE)
+    mode = models.CharField(max_length=10, default="insert")
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    rows_processed = models.PositiveIntegerField(default=0)
+    warnings = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    def __str__(self):
+        """Return job number and status."""
+        return f"Import #{self.pk} ({self.status})"
+
+    @property
+    def rows_per_second(self):
+        """Return rows processed per second since the job started."""
+        if not self.started_at:
+            return 0.0
+        elapsed = (
+            (self.finished_at or timezone.now()) - self.started_at
+        ).total_seconds()
+        return self.rows_processed / elapsed if elapsed > 0 else 0.0
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"], name="importjob_queue_idx"
+            )
+        ]
+
+
+class ImportChunk(models.Model):
+    """
+    One piece of the file uploaded for an :model:`team.ImportJob`.
+
+    **Fields**
+    - ``job``: ForeignKey to the :model:`team.ImportJob` the file belongs to
+    - ``index``: Position of the piece within the file
+    - ``data``: The bytes of the piece
+
+    **Constraints**
+    - Enforces uniqueness of each position within a job
+    """
+
+    job = models.ForeignKey(
+        ImportJob, on_delete=models.CASCADE, related_name="chunks"
+    )
+    index = models.PositiveIntegerField()
+    data = models.BinaryField()
+
+    def __str__(self):
+        """Return the job number and position of the piece."""
+        return f"Import #{self.job_id} chunk {self.index}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "index"], name="unique_importchunk_index"
+            )
+        ]
+
+
+class Tombstone(models.Model):
+    """
+    Records the deletion of a :model:`team.Team`, :model:`team.Season` or
+    :model:`team.Match`, so delta sync can tell clients to drop it.
+
+    Only the deleted object gets a tombstone: the seasons and matches
+    deleted with their team or season do not, since clients drop them
+    with it. ``manage.py prune_tombstones`` removes tombstones older than
+    ``settings.SYNC_TOMBSTONE_DAYS``.
+
+    **Fields**
+    - ``contributor``: ForeignKey to :model:`auth.User`, the owner of the
+      deleted team
+    - ``kind``: One of team, season or match
+    - ``object_id``: Primary key of the deleted object
+    - ``deleted_at``: When it was deleted
+
+    **Indexes**
+    - ``(contributor, deleted_at, id)``, for delta sync
+    """
+
+    class Kind(models.TextChoices):
+        TEAM = "team", "Team"
+        SEASON = "season", "Season"
+        MATCH = "match", "Match"
+
+    contributor = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+"
+    )
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        """Return the kind and id of the deleted object."""
+        return f"Deleted {self.kind} {self.object_id}"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["contributor", "deleted_at", "id"],
+                name="tombstone_sync_idx",
+            )
+        ]
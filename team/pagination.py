@@ -0,0 +1,167 @@
+"""
+Keyset (seek) pagination.
+
+Instead of skipping rows with ``OFFSET``, each page is fetched with a
+``WHERE`` clause that starts after the last row of the previous page and
+a ``LIMIT`` of one more than the page size. The rows are read in the
+order of an index, so the cost of a page does not grow with how deep it
+is. There is no ``COUNT`` query.
+
+The order must end with a unique field, normally ``id``, so that every
+row has a distinct position. Cursors are opaque URL-safe strings that
+record the position and the direction of travel.
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+
+from django.db.models import Q
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded for the requested ordering."""
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows with the cursors of the pages either side."""
+
+    items: list = field(default_factory=list)
+    next_cursor: str = None
+    previous_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+def _split(ordering):
+    return [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+
+
+def _reversed(ordering):
+    return [
+        name[1:] if name.startswith("-") else f"-{name}" for name in ordering
+    ]
+
+
+def encode_cursor(direction, values):
+    """Return an opaque cursor for a position in the given direction."""
+    payload = json.dumps([direction, values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, model, ordering):
+    """
+    Return ``(direction, values)`` from a cursor made by :func:`encode_cursor`.
+
+    Values are converted back to Python with the fields of ``model`` named
+    in ``ordering``. Raises :class:`InvalidCursor` if the cursor is
+    malformed or does not fit the ordering.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded))
+        fields = [model._meta.get_field(name) for name, _ in _split(ordering)]
+        if direction not in (NEXT, PREVIOUS) or len(values) != len(fields):
+            raise InvalidCursor(cursor)
+        return direction, [
+            None if value is None else model_field.to_python(value)
+            for model_field, value in zip(fields, values)
+        ]
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        raise InvalidCursor(cursor) from e
+
+
+def keyset_after(ordering, values):
+    """
+    Return a ``Q`` matching rows that come after ``values`` in ``ordering``.
+
+    For ``("date", "id")`` and ``(d, i)`` this is
+    ``date > d OR (date = d AND id > i)``. Descending fields compare the
+    other way. Ordering fields must not be null.
+    """
+    condition = Q()
+    equal = {}
+    for (name, descending), value in zip(_split(ordering), values):
+        lookup = "lt" if descending else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    return condition
+
+
+def _position(item, ordering):
+    if isinstance(item, dict):
+        return [item[name] for name, _ in _split(ordering)]
+    return [getattr(item, name) for name, _ in _split(ordering)]
+
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _page_rows(queryset, ordering, cursor, page_size):
+    direction, values = NEXT, None
+    if cursor:
+        direction, values = decode_cursor(cursor, queryset.model, ordering)
+    scan_order = ordering if direction == NEXT else _reversed(ordering)
+    rows = queryset.order_by(*scan_order)
+    if values is not None:
+        rows = rows.filter(keyset_after(scan_order, values))
+    return direction, rows[: page_size + 1]
+
+
+def _make_page(rows, ordering, cursor, direction, page_size):
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == PREVIOUS:
+        rows.reverse()
+
+    page = KeysetPage(items=rows)
+    if not rows:
+        return page
+    first = [_json_value(v) for v in _position(rows[0], ordering)]
+    last = [_json_value(v) for v in _position(rows[-1], ordering)]
+    if direction == NEXT:
+        page.next_cursor = encode_cursor(NEXT, last) if has_more else None
+        page.previous_cursor = (
+            encode_cursor(PREVIOUS, first) if cursor else None
+        )
+    else:
+        page.previous_cursor = (
+            encode_cursor(PREVIOUS, first) if has_more else None
+        )
+        page.next_cursor = encode_cursor(NEXT, last)
+    return page
+
+
+def paginate_keyset(queryset, ordering, cursor=None, page_size=50):
+    """
+    Return the :class:`KeysetPage` of ``queryset`` at ``cursor``.
+
+    ``ordering`` is a sequence of field names, each optionally prefixed
+    with ``-``, ending with a unique field. ``queryset`` may be a
+    ``values()`` queryset that includes those fields. Without a cursor the
+    first page is returned. Raises :class:`InvalidCursor` for a bad cursor.
+    """
+    ordering = list(ordering)
+    direction, rows = _page_rows(queryset, ordering, cursor, page_size)
+    return _make_page(list(rows), ordering, cursor, direction, page_size)
+
+
+async def apaginate_keyset(queryset, ordering, cursor=None, page_size=50):
+    """Asynchronous version of :func:`paginate_keyset`."""
+    ordering = list(ordering)
+    direction, rows = _page_rows(queryset, ordering, cursor, page_size)
+    rows = [row async for row in rows]
+    return _make_page(rows, ordering, cursor, direction, page_size)
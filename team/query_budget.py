@@ -0,0 +1,66 @@
+"""
+Query budgets for views and other code paths.
+
+:class:`query_budget` counts the SQL queries run inside it and raises
+:class:`QueryBudgetExceeded` if there are more than allowed, listing the
+queries that ran. It works as a context manager or a decorator, and counts
+queries whether or not ``DEBUG`` is on, so it can pin the number of
+queries a view makes in tests without depending on the size of the data.
+"""
+
+from contextlib import ContextDecorator
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block runs more queries than its budget allows."""
+
+
+class query_budget(ContextDecorator):
+    """
+    Fail if the wrapped block runs more than ``max_queries`` queries.
+
+    Used as a context manager, the instance exposes the ``queries`` that
+    ran, so a test can also check them once the block has finished::
+
+        with query_budget(5) as budget:
+            client.get(url)
+
+    Used as a decorator, each call is counted separately.
+    """
+
+    def __init__(self, max_queries, using=DEFAULT_DB_ALIAS):
+        self.max_queries = max_queries
+        self.using = using
+        self._context = None
+
+    def _recreate_cm(self):
+        return type(self)(self.max_queries, using=self.using)
+
+    def __enter__(self):
+        self._context = CaptureQueriesContext(connections[self.using])
+        self._context.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None and len(self) > self.max_queries:
+            listing = "\n".join(
+                f"{number}. {query['sql']}"
+                for number, query in enumerate(self.queries, start=1)
+            )
+            raise QueryBudgetExceeded(
+                f"{len(self)} queries run, budget is {self.max_queries}:"
+                f"\n{listing}"
+            )
+        return False
+
+    def __len__(self):
+        return len(self._context) if self._context else 0
+
+    @property
+    def queries(self):
+        """Return the queries captured so far, as ``{"sql", "time"}`` dicts."""
+        return self._context.captured_queries if self._context else []
@@ -0,0 +1,189 @@
+"""
+Resolution of the ``team/season/match`` URL hierarchy.
+
+Team routes are shaped ``<team_slug>/season/<season_slug>/match/<match_id>``.
+:func:`resolve_route` turns those URL arguments into the
+:model:`team.Team`, :model:`team.Season` and :model:`team.Match` they
+name. The deepest object is fetched with its parents joined in, in one
+query that also checks the team belongs to the logged-in user. The view
+receives the objects with their relations already loaded.
+
+:func:`season_condition` answers conditional GETs for pages that only
+show one season's data, using the season's version stamp. Saving a team
+touches its seasons (see :mod:`team.signals`), so a renamed team changes
+the stamp too.
+
+Both decorators accept sync and async views; async views are served with
+the async ORM.
+"""
+
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+from .models import Match, Season, Team
+
+
+def route_queryset(user, team_slug, season_slug=None, match_id=None):
+    """
+    Return a queryset of the deepest object named by the route arguments.
+
+    It matches at most one row, and none unless each level belongs to its
+    parent and the team belongs to ``user``.
+    """
+    if match_id is not None:
+        return Match.objects.select_related("season__team").filter(
+            id=match_id,
+            season__slug=season_slug,
+            season__team__slug=team_slug,
+            season__team__contributor=user,
+        )
+    if season_slug is not None:
+        return Season.objects.select_related("team").filter(
+            slug=season_slug,
+            team__slug=team_slug,
+            team__contributor=user,
+        )
+    return Team.objects.filter(slug=team_slug, contributor=user)
+
+
+def _route_objects(obj):
+    if isinstance(obj, Match):
+        return {"team": obj.season.team, "season": obj.season, "match": obj}
+    if isinstance(obj, Season):
+        return {"team": obj.team, "season": obj}
+    return {"team": obj}
+
+
+def resolve_objects(user, team_slug, season_slug=None, match_id=None):
+    """
+    Return ``{"team", "season", "match"}`` for the route arguments given.
+
+    Only the levels named by the arguments are included. Raises
+    :class:`~django.http.Http404` unless every level exists, each belongs
+    to its parent, and the team belongs to ``user``.
+    """
+    query = route_queryset(user, team_slug, season_slug, match_id)
+    return _route_objects(get_object_or_404(query))
+
+
+async def aresolve_objects(user, team_slug, season_slug=None, match_id=None):
+    """Asynchronous version of :func:`resolve_objects`."""
+    query = route_queryset(user, team_slug, season_slug, match_id)
+    try:
+        obj = await query.aget()
+    except query.model.DoesNotExist:
+        raise Http404(
+            f"No {query.model._meta.object_name} matches the given query."
+        )
+    return _route_objects(obj)
+
+
+def _route_args(kwargs):
+    return (
+        kwargs.pop("team_slug"),
+        kwargs.pop("season_slug", None),
+        kwargs.pop("match_id", None),
+    )
+
+
+def resolve_route(view):
+    """
+    Pass a view the objects named by its URL instead of their slugs and id.
+
+    ``team_slug``, ``season_slug`` and ``match_id`` are replaced by
+    ``team``, ``season`` and ``match``, resolved with
+    :func:`resolve_objects` for ``request.user``. Other URL arguments are
+    passed through unchanged. Apply it beneath ``login_required``.
+    """
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            objects = await aresolve_objects(
+                request.user, *_route_args(kwargs)
+            )
+            return await view(request, *args, **objects, **kwargs)
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        objects = resolve_objects(request.user, *_route_args(kwargs))
+        return view(request, *args, **objects, **kwargs)
+
+    return wrapper
+
+
+def _stamp_query(request, team_slug, season_slug, **kwargs):
+    return Season.objects.filter(
+        slug=season_slug,
+        team__slug=team_slug,
+        team__contributor=request.user,
+    ).only("id", "version", "updated_at")
+
+
+def _season_stamp(request, **kwargs):
+    if not hasattr(request, "_season_stamp"):
+        request._season_stamp = _stamp_query(request, **kwargs).first()
+    return request._season_stamp
+
+
+def _season_etag(request, *args, **kwargs):
+    season = _season_stamp(request, **kwargs)
+    return season.etag() if season else None
+
+
+def _season_last_modified(request, *args, **kwargs):
+    season = _season_stamp(request, **kwargs)
+    return season.updated_at if season else None
+
+
+def season_condition(view):
+    """
+    Answer ``If-None-Match`` / ``If-Modified-Since`` with 304 Not Modified
+    while the season in the URL is unchanged, after one indexed lookup of
+    its version stamp. Apply it beneath ``login_required`` and above
+    :func:`resolve_route`.
+
+    Responses are marked ``Cache-Control: private, no-cache``: they show
+    one user's data, and caches must revalidate them before reuse.
+    """
+    if not iscoroutinefunction(view):
+        conditional = condition(
+            etag_func=_season_etag, last_modified_func=_season_last_modified
+        )(view)
+
+        @wraps(view)
+        def sync_wrapper(request, *args, **kwargs):
+            response = conditional(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return sync_wrapper
+
+    # Django 4.2's condition() only wraps sync views; this mirrors it.
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        season = await _stamp_query(request, **kwargs).afirst()
+        etag = quote_etag(season.etag()) if season else None
+        last_modified = int(season.updated_at.timestamp()) if season else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = await view(request, *args, **kwargs)
+        if request.method in ("GET", "HEAD"):
+            if last_modified and not response.has_header("Last-Modified"):
+                response.headers["Last-Modified"] = http_date(last_modified)
+            if etag:
+                response.headers.setdefault("ETag", etag)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    return wrapper
@@ -0,0 +1,124 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .bulk import writing_in_bulk
+from .fragments import forget_match_row
+from .goals import sync_goal_events
+from .models import Match, Season, SeasonSummary, Team
+from .stats import Record
+from .summaries import apply_delta, rebuild_summaries, record_change
+from .sync import bury_deleted, deleted_with_parent
+
+
+def _negated(record):
+    negated = Record()
+    negated.subtract(record)
+    return negated
+
+
+@receiver(post_save, sender=Match)
+def sync_match_goal_events(sender, instance, raw=False, **kwargs):
+    """Rebuild a saved match's goal events from its ``goals`` text."""
+    if raw:
+        return
+    sync_goal_events([(instance.pk, instance.season_id, instance.goals)])
+
+
+@receiver(post_save, sender=Season)
+def create_season_summary(sender, instance, created, raw=False, **kwargs):
+    """Start every new season with an empty summary."""
+    if created and not raw:
+        SeasonSummary.objects.create(season=instance)
+
+
+@receiver(post_save, sender=Match)
+def touch_match_season(sender, instance, raw=False, **kwargs):
+    """Mark a saved match's season, and any season it left, as changed."""
+    if raw:
+        return
+    season_ids = {instance.season_id}
+    # Must run before update_season_summary, which refreshes the stash.
+    loaded = getattr(instance, "_loaded_result", None)
+    if loaded is not None:
+        season_ids.add(loaded[0])
+    Season.objects.filter(pk__in=season_ids).touch()
+
+
+@receiver(post_save, sender=Team)
+def touch_team_seasons(sender, instance, created, raw=False, **kwargs):
+    """Mark a saved team's seasons as changed; their pages show its name."""
+    if created or raw:
+        return
+    Season.objects.filter(team=instance).touch()
+
+
+@receiver(post_save, sender=Match)
+def update_season_summary(sender, instance, created, raw=False, **kwargs):
+    """Add the change in a saved match's result to its season's totals."""
+    if raw:
+        return
+    loaded = getattr(instance, "_loaded_result", None)
+    new = Record.for_score(instance.team_score, instance.opponent_score)
+    if created:
+        record_change(instance.season_id, new)
+    elif loaded is None:
+        # The result before this save is unknown, e.g. the match was
+        # saved without being loaded first.
+        rebuild_summaries([instance.season_id])
+    else:
+        old_season_id, *old_scores = loaded
+        old = Record.for_score(*old_scores)
+        if old_season_id == instance.season_id:
+            new.subtract(old)
+        else:
+            apply_delta(old_season_id, _negated(old))
+        record_change(instance.season_id, new)
+    instance._loaded_result = (
+        instance.season_id,
+        instance.team_score,
+        instance.opponent_score,
+    )
+
+
+@receiver(post_delete, sender=Match)
+def remove_from_season_summary(sender, instance, origin=None, **kwargs):
+    """
+    Subtract a deleted match's result from its season's totals.
+
+    Matches deleted with their season or team are skipped: the summary
+    goes with the season.
+    """
+    if writing_in_bulk() or deleted_with_parent(instance, origin):
+        return
+    season_id, *scores = getattr(
+        instance,
+        "_loaded_result",
+        (instance.season_id, instance.team_score, instance.opponent_score),
+    )
+    apply_delta(season_id, _negated(Record.for_score(*scores)))
+
+
+@receiver(post_delete, sender=Match)
+def touch_deleted_match_season(sender, instance, origin=None, **kwargs):
+    """Mark a deleted match's season as changed, unless it went too."""
+    if writing_in_bulk() or deleted_with_parent(instance, origin):
+        return
+    Season.objects.filter(pk=instance.season_id).touch()
+
+
+@receiver(post_delete, sender=Match)
+def forget_deleted_match_row(sender, instance, **kwargs):
+    """Drop a deleted match's cached table row."""
+    if writing_in_bulk():
+        return
+    forget_match_row(instance)
+
+
+@receiver(post_delete, sender=Match)
+@receiver(post_delete, sender=Season)
+@receiver(post_delete, sender=Team)
+def leave_tombstone(sender, instance, origin=None, **kwargs):
+    """Record a deleted team, season or match for delta sync."""
+    if writing_in_bulk():
+        return
+    bury_deleted(instance, origin)
@@ -0,0 +1,170 @@
+"""
+Season statistics computed in the database.
+
+Results are counted with conditional aggregation over the matches of a
+season, grouped by competition and venue, so a season's record and all of
+its home, away and competition splits come from one query, however many
+matches it holds. Only matches with both scores recorded count as played.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field, fields
+
+from django.db.models import Count, F, Q, Sum
+
+from .caches import season_stats_cache
+from .models import Match
+
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+
+PLAYED = Q(team_score__isnull=False, opponent_score__isnull=False)
+RECORD_AGGREGATES = {
+    "played": Count("id"),
+    "won": Count("id", filter=Q(team_score__gt=F("opponent_score"))),
+    "drawn": Count("id", filter=Q(team_score=F("opponent_score"))),
+    "lost": Count("id", filter=Q(team_score__lt=F("opponent_score"))),
+    "goals_for": Sum("team_score"),
+    "goals_against": Sum("opponent_score"),
+}
+
+
+@dataclass
+class Record:
+    """Played, won, drawn and lost counts with goals for and against."""
+
+    played: int = 0
+    won: int = 0
+    drawn: int = 0
+    lost: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+
+    @classmethod
+    def for_score(cls, team_score, opponent_score):
+        """Return the record of a single match, empty if it is unplayed."""
+        if team_score is None or opponent_score is None:
+            return cls()
+        return cls(
+            played=1,
+            won=int(team_score > opponent_score),
+            drawn=int(team_score == opponent_score),
+            lost=int(team_score < opponent_score),
+            goals_for=team_score,
+            goals_against=opponent_score,
+        )
+
+    def add(self, other, sign=1):
+        """Add another record's totals to this one, or subtract with -1."""
+        self.played += sign * other.played
+        self.won += sign * other.won
+        self.drawn += sign * other.drawn
+        self.lost += sign * other.lost
+        self.goals_for += sign * other.goals_for
+        self.goals_against += sign * other.goals_against
+
+    def subtract(self, other):
+        """Subtract another record's totals from this one."""
+        self.add(other, sign=-1)
+
+    @property
+    def goal_difference(self):
+        """Return goals for minus goals against."""
+        return self.goals_for - self.goals_against
+
+    @property
+    def points(self):
+        """Return league points: three for a win, one for a draw."""
+        return self.won * POINTS_FOR_WIN + self.drawn * POINTS_FOR_DRAW
+
+
+RECORD_FIELDS = [record_field.name for record_field in fields(Record)]
+
+
+@dataclass
+class SeasonStats:
+    """A season's overall record with home, away and competition splits."""
+
+    overall: Record = field(default_factory=Record)
+    home: Record = field(default_factory=Record)
+    away: Record = field(default_factory=Record)
+    competitions: dict = field(default_factory=dict)
+
+    def add(self, competition, is_home, record):
+        """Add the record of one competition and venue to the totals."""
+        self.overall.add(record)
+        (self.home if is_home else self.away).add(record)
+        self.competitions.setdefault(competition, Record()).add(record)
+
+
+def _record(row):
+    return Record(
+        played=row["played"],
+        won=row["won"],
+        drawn=row["drawn"],
+        lost=row["lost"],
+        goals_for=row["goals_for"] or 0,
+        goals_against=row["goals_against"] or 0,
+    )
+
+
+def _grouped_records(matches, *fields):
+    return (
+        matches.filter(PLAYED)
+        .values(*fields, "competition", "is_home")
+        .annotate(**RECORD_AGGREGATES)
+        .order_by("competition")
+    )
+
+
+def season_stats(season):
+    """Return the :class:`SeasonStats` for ``season`` using one query."""
+    stats = SeasonStats()
+    for row in _grouped_records(Match.objects.filter(season=season)):
+        stats.add(row["competition"], row["is_home"], _record(row))
+    return stats
+
+
+def cached_season_stats(season):
+    """
+    Return :func:`season_stats` for ``season`` from the cache if possible.
+
+    Entries are keyed on the season's version stamp, so any change to its
+    matches is seen at once.
+    """
+    return season_stats_cache.get_or_set(
+        season.etag(), compute=lambda: season_stats(season)
+    )
+
+
+def stats_by_season(seasons):
+    """
+    Return a dict of :class:`SeasonStats` keyed by season id.
+
+    All seasons are aggregated in a single query. Seasons without matches
+    get empty stats.
+    """
+    season_ids = [getattr(season, "pk", season) for season in seasons]
+    stats = defaultdict(SeasonStats)
+    rows = _grouped_records(
+        Match.objects.filter(season_id__in=season_ids), "season_id"
+    )
+    for row in rows:
+        stats[row["season_id"]].add(
+            row["competition"], row["is_home"], _record(row)
+        )
+    return {season_id: stats[season_id] for season_id in season_ids}
+
+
+def records_by_season(season_ids=None):
+    """
+    Return each season's overall :class:`Record`, keyed by season id.
+
+    Computed live with one grouped query, over ``season_ids`` or every
+    season with a played match.
+    """
+    matches = Match.objects.filter(PLAYED)
+    if season_ids is not None:
+        matches = matches.filter(season_id__in=season_ids)
+    rows = matches.values("season_id").annotate(**RECORD_AGGREGATES).order_by()
+    return {row["season_id"]: _record(row) for row in rows}
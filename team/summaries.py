@@ -0,0 +1,101 @@
+"""
+Incremental maintenance of :model:`team.SeasonSummary`.
+
+Each played match contributes a :class:`team.stats.Record` to its season's
+totals. When matches change, only the difference between their old and new
+contributions is added to the stored totals, with a single ``UPDATE ...
+SET won = won + ...`` per season. Matches saved or deleted one at a time
+are handled by signals (see :mod:`team.signals`); the bulk import adds up
+the change for a whole file and applies it once.
+"""
+
+from dataclasses import asdict
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Season, SeasonSummary
+from .stats import RECORD_FIELDS, Record, records_by_season
+
+
+def apply_delta(season_id, delta):
+    """
+    Add ``delta`` to a season's stored totals.
+
+    Returns False if the season has no summary row, so nothing was
+    changed.
+    """
+    if delta == Record():
+        return True
+    updated = SeasonSummary.objects.filter(season_id=season_id).update(
+        **{
+            name: F(name) + getattr(delta, name)
+            for name in RECORD_FIELDS
+            if getattr(delta, name)
+        }
+    )
+    return bool(updated)
+
+
+def record_change(season_id, delta):
+    """
+    Apply ``delta`` to a season's totals, rebuilding them if missing.
+
+    Use after matches have been written; the rebuild reads the season's
+    current matches, so it already includes the change.
+    """
+    if not apply_delta(season_id, delta):
+        rebuild_summaries([season_id])
+
+
+def rebuild_summaries(season_ids=None):
+    """
+    Recompute stored totals from the matches, replacing existing rows.
+
+    Rebuilds ``season_ids`` or, by default, every season, with one
+    aggregate query, one delete and one bulk insert. Returns the number of
+    summaries written.
+    """
+    seasons = Season.objects.all()
+    if season_ids is not None:
+        seasons = seasons.filter(pk__in=season_ids)
+    ids = list(seasons.values_list("pk", flat=True))
+    records = records_by_season(None if season_ids is None else ids)
+    summaries = [
+        SeasonSummary(
+            season_id=season_id,
+            **asdict(records.get(season_id, Record())),
+        )
+        for season_id in ids
+    ]
+    existing = SeasonSummary.objects.all()
+    if season_ids is not None:
+        existing = existing.filter(season_id__in=ids)
+    with transaction.atomic():
+        existing.delete()
+        SeasonSummary.objects.bulk_create(summaries, batch_size=500)
+    return len(summaries)
+
+
+def check_summaries(season_ids=None):
+    """
+    Compare stored totals with the live aggregates of the matches.
+
+    Returns a list of ``(season_id, stored, live)`` tuples, one for each
+    season whose summary is missing (``stored`` is None) or wrong.
+    """
+    seasons = Season.objects.all()
+    if season_ids is not None:
+        seasons = seasons.filter(pk__in=season_ids)
+    ids = list(seasons.values_list("pk", flat=True))
+    live = records_by_season(None if season_ids is None else ids)
+    summaries = SeasonSummary.objects.all()
+    if season_ids is not None:
+        summaries = summaries.filter(season_id__in=ids)
+    stored = {summary.season_id: summary.record for summary in summaries}
+    mismatches = []
+    for season_id in ids:
+        expected = live.get(season_id, Record())
+        if stored.get(season_id) != expected:
+            mismatches.append((season_id, stored.get(season_id), expected))
+    return mismatches
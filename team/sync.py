@@ -0,0 +1,178 @@
+"""
+Delta sync of a contributor's teams, seasons and matches.
+
+Every team, season and match carries an indexed ``updated_at`` stamp and
+deleting one leaves a :model:`team.Tombstone`. A client mirroring the
+data keeps the cursor returned by its last sync and asks for what changed
+since. Each stream of changes (teams, seasons, matches and tombstones) is
+read from the cursor's position in ``(stamp, id)`` order with a
+``LIMIT``, so a sync reads the rows changed since the cursor rather than
+the whole dataset. The first sync, without a cursor, reads everything.
+
+A row's stamp is taken before its transaction commits, so a row may
+become visible with a stamp older than rows already sent. Cursors
+therefore never move past ``settings.SYNC_SETTLE_SECONDS`` ago: changes
+from the last moments are sent again on the next sync, and clients apply
+changes as idempotent upserts.
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Season, Team, Tombstone
+from .pagination import InvalidCursor, keyset_after
+
+
+class CursorExpired(ValueError):
+    """Raised for a cursor older than the tombstones that are kept."""
+
+
+@dataclass
+class Changes:
+    """Changed rows by stream, with the cursor to sync from next time."""
+
+    rows: dict = field(default_factory=dict)
+    cursor: str = None
+    more: bool = False
+
+
+def bury(kind, contributor_id, ids, deleted_at=None):
+    """Record tombstones for the deleted objects of ``kind`` with ``ids``."""
+    deleted_at = deleted_at or timezone.now()
+    Tombstone.objects.bulk_create(
+        Tombstone(
+            contributor_id=contributor_id,
+            kind=kind,
+            object_id=pk,
+            deleted_at=deleted_at,
+        )
+        for pk in ids
+    )
+
+
+def _owner_id(instance):
+    if isinstance(instance, Team):
+        return instance.contributor_id
+    if isinstance(instance, Season):
+        return instance.team.contributor_id
+    return (
+        Team.objects.filter(season=instance.season_id)
+        .values_list("contributor_id", flat=True)
+        .first()
+    )
+
+
+def deleted_with_parent(instance, origin=None):
+    """
+    Return whether ``instance`` was deleted along with another object.
+
+    ``origin`` is the ``origin`` of the ``post_delete`` signal: the object
+    or queryset whose deletion was asked for. The matches of a deleted
+    season, for example, are deleted with their parent.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return origin is not None and model is not type(instance)
+
+
+def bury_deleted(instance, origin=None):
+    """
+    Record a tombstone for a deleted team, season or match.
+
+    ``origin`` is the ``origin`` of the ``post_delete`` signal. Objects
+    deleted along with another, such as the matches of a deleted season,
+    get no tombstone of their own.
+    """
+    if deleted_with_parent(instance, origin):
+        return
+    contributor_id = _owner_id(instance)
+    if contributor_id is not None:
+        bury(instance._meta.model_name, contributor_id, [instance.pk])
+
+
+def _encode(issued, positions):
+    payload = {
+        "i": issued.isoformat(),
+        "p": {
+            name: [stamp.isoformat(), pk]
+            for name, (stamp, pk) in positions.items()
+        },
+    }
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _decode(cursor, names):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        issued = parse_datetime(payload["i"])
+        positions = {}
+        for name, (stamp, pk) in payload["p"].items():
+            stamp = parse_datetime(stamp)
+            if name not in names or stamp is None or not isinstance(pk, int):
+                raise InvalidCursor(cursor)
+            positions[name] = (stamp, pk)
+        if issued is None:
+            raise InvalidCursor(cursor)
+        return issued, positions
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        raise InvalidCursor(cursor) from e
+
+
+def read_changes(sources, cursor=None, limit=100, now=None):
+    """
+    Return the :class:`Changes` in ``sources`` since ``cursor``.
+
+    ``sources`` maps each stream name to a ``(queryset, stamp)`` pair:
+    a ``values()`` queryset including ``id`` and the ``stamp`` field it
+    is synced on. At most ``limit`` rows are read from each stream; when
+    any stream has more, ``more`` is set and the returned cursor continues
+    from there. Raises :class:`team.pagination.InvalidCursor` for a bad
+    cursor and :class:`CursorExpired` for one issued longer than
+    ``settings.SYNC_TOMBSTONE_DAYS`` ago.
+    """
+    now = now or timezone.now()
+    positions = {}
+    if cursor:
+        issued, positions = _decode(cursor, sources)
+        if issued < now - timedelta(days=settings.SYNC_TOMBSTONE_DAYS):
+            raise CursorExpired(cursor)
+    settled = (now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS), 0)
+    changes = Changes()
+    for name, (queryset, stamp) in sources.items():
+        ordering = (stamp, "id")
+        position = positions.get(name)
+        rows = queryset.order_by(*ordering)
+        if position is not None:
+            # The redundant range lets the stamp indexes bound the scan.
+            rows = rows.filter(
+                keyset_after(ordering, position),
+                **{f"{stamp}__gte": position[0]},
+            )
+        rows = list(rows[: limit + 1])
+        if len(rows) > limit:
+            changes.more = True
+            rows = rows[:limit]
+        if rows:
+            position = (rows[-1][stamp], rows[-1]["id"])
+        changes.rows[name] = rows
+        positions[name] = position or settled
+    if not changes.more:
+        # Every stream has been read to the end. The next sync starts no
+        # later than the settle time, so rows still being committed with
+        # older stamps are not skipped.
+        positions = {
+            name: min(position, settled)
+            for name, position in positions.items()
+        }
+    changes.cursor = _encode(settled[0], positions)
+    return changes
@@ -0,0 +1,179 @@
+import gzip
+import json
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from team.models import Match, Season, Team
+
+
+class ApiTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        cls.team = Team.objects.create(
+            name="SWFC", country="England", contributor=cls.user
+        )
+        cls.season = Season.objects.create(
+            team=cls.team,
+            contributor=cls.user,
+            start_date=date(2024, 8, 1),
+            end_date=date(2025, 5, 31),
+            competition_list="League, FA Cup",
+        )
+        cls.matches = [
+            Match.objects.create(
+                season=cls.season,
+                date=date(2024, 8, 10) + timedelta(days=7 * number),
+                opponent=f"Opponent {number}",
+                competition="League",
+                is_home=number % 2 == 0,
+                team_score=number % 3,
+                opponent_score=1,
+            )
+            for number in range(5)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def url(self, name, *args):
+        return reverse(name, args=[self.team.slug, *args])
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        return response, json.loads(response.content)
+
+
+class TestResources(ApiTestCase):
+    def test_team_list(self):
+        """Only the user's own teams are listed."""
+        other = User.objects.create_user(username="other")
+        Team.objects.create(name="Leeds", country="England", contributor=other)
+        response, data = self.get(reverse("api_team_list"))
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual([t["slug"] for t in data["results"]], ["swfc"])
+        self.assertIsNone(data["next"])
+
+    def test_season_includes_record(self):
+        """A season carries its competitions and summary record."""
+        _, data = self.get(self.url("api_season", self.season.slug))
+        self.assertEqual(data["competitions"], ["League", "FA Cup"])
+        self.assertEqual(data["played"], 5)
+        self.assertEqual(data["won"], 1)
+
+    def test_match(self):
+        """A match is returned with JSON dates and scores."""
+        match = self.matches[0]
+        _, data = self.get(self.url("api_match", self.season.slug, match.pk))
+        self.assertEqual(data["date"], "2024-08-10")
+        self.assertEqual(data["opponent"], "Opponent 0")
+        self.assertEqual(data["version"], str(match.version))
+
+    def test_sparse_fieldset(self):
+        """``?fields=`` limits both the response and the columns read."""
+        url = self.url("api_match_list", self.season.slug)
+        with self.assertNumQueries(5) as queries:
+            _, data = self.get(url, fields="opponent,team_score")
+        self.assertEqual(
+            data["results"][0], {"opponent": "Opponent 0", "team_score": 0}
+        )
+        self.assertNotIn('"goals"', queries.captured_queries[-1]["sql"])
+
+    def test_unknown_field_is_rejected(self):
+        """An unknown field name is a 400 naming the field."""
+        response, data = self.get(
+            self.url("api_season_list"), fields="slug,nope"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("nope", data["error"])
+
+    def test_other_users_season_is_404(self):
+        """Another user's season is not found."""
+        self.client.force_login(User.objects.create_user(username="other"))
+        response, data = self.get(self.url("api_season", self.season.slug))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(data, {"error": "Not found."})
+
+    def test_anonymous_user_gets_401(self):
+        """Logged-out requests are refused with JSON, not redirected."""
+        self.client.logout()
+        response, _ = self.get(reverse("api_team_list"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_read_only(self):
+        """Unsafe methods are not allowed."""
+        response = self.client.post(reverse("api_team_list"))
+        self.assertEqual(response.status_code, 405)
+
+
+class TestPagination(ApiTestCase):
+    def test_pages_follow_cursors(self):
+        """Following ``next`` visits every match once, in order."""
+        url = self.url("api_match_list", self.season.slug)
+        seen = []
+        response, data = self.get(url, limit=2, fields="id")
+        while True:
+            seen += [row["id"] for row in data["results"]]
+            if not data["next"]:
+                break
+            response, data = self.get(data["next"])
+        self.assertEqual(seen, [m.pk for m in self.matches])
+        _, back = self.get(data["previous"])
+        self.assertEqual(len(back["results"]), 2)
+
+    def test_filters_and_sort(self):
+        """The season page's sort and filter parameters apply."""
+        _, data = self.get(
+            self.url("api_match_list", self.season.slug),
+            sort="-date",
+            venue="home",
+            fields="opponent",
+        )
+        self.assertEqual(
+            [row["opponent"] for row in data["results"]],
+            ["Opponent 4", "Opponent 2", "Opponent 0"],
+        )
+
+    def test_bad_cursor_and_limit(self):
+        """Bad pagination parameters are a 400."""
+        url = self.url("api_match_list", self.season.slug)
+        for params in ({"cursor": "nonsense"}, {"limit": "0"}):
+            response, _ = self.get(url, **params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class TestCaching(ApiTestCase):
+    def test_season_etag_gives_304(self):
+        """An unchanged season answers If-None-Match with 304."""
+        url = self.url("api_match_list", self.season.slug)
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(3):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.matches[0].save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_team_etag_gives_304(self):
+        """Team responses get an ETag from their content."""
+        url = reverse("api_team_list")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_gzip(self):
+        """Responses are compressed for clients that accept gzip."""
+        Match.objects.bulk_create(
+            Match(season=self.season, date=date(2025, 1, 1), opponent=f"X{n}")
+            for n in range(50)
+        )
+        url = self.url("api_match_list", self.season.slug)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(data["results"]), 55)
@@ -0,0 +1,167 @@
+import datetime
+import io
+import zipfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from team.archive import import_archive, infer_season_years, parse_members
+from team.importer import MatchImportError
+from team.models import Match, Season, Team
+
+SEASON_24_25 = (
+    "date\topponent\tis_home\tcompetition\n"
+    "2024-08-11\tPlymouth Argyle\tH\tChampionship\n"
+    "2025-01-11\tCoventry City\tH\tFA Cup\n"
+)
+SEASON_23_24 = (
+    "date\topponent\tis_home\tcompetition\n"
+    "2023-08-04\tSouthampton\tH\tChampionship\n"
+)
+
+
+def make_zip(files):
+    """Return an uploaded zip archive holding ``files``."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return SimpleUploadedFile("seasons.zip", buffer.getvalue())
+
+
+class TestInferSeasonYears(TestCase):
+    """Tests for working out a season from a file name and its dates."""
+
+    def test_two_digit_label(self):
+        """'24-25' resolves to the century of the matches."""
+        dates = [datetime.date(2024, 8, 11)]
+        self.assertEqual(
+            infer_season_years("Sheffield_Wednesday_24-25.tsv", dates),
+            (2024, 2025),
+        )
+
+    def test_label_spanning_a_century(self):
+        """'99-00' resolves to 1999/2000."""
+        dates = [datetime.date(1999, 8, 7)]
+        self.assertEqual(infer_season_years("99-00.tsv", dates), (1999, 2000))
+
+    def test_four_digit_labels(self):
+        """Full years and single-year seasons are recognised."""
+        self.assertEqual(infer_season_years("2024-2025.tsv", []), (2024, 2025))
+        self.assertEqual(infer_season_years("club/2024.tsv", []), (2024, 2024))
+
+    def test_falls_back_to_match_dates(self):
+        """Without a label, the earliest and latest matches are used."""
+        dates = [datetime.date(2024, 8, 11), datetime.date(2025, 5, 3)]
+        self.assertEqual(
+            infer_season_years("matches.tsv", dates), (2024, 2025)
+        )
+
+    def test_undeterminable_season_raises(self):
+        """An empty file without a label cannot be placed."""
+        with self.assertRaises(MatchImportError):
+            infer_season_years("matches.tsv", [])
+
+
+class TestImportArchive(TestCase):
+    """Tests for importing a zip of season files."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="importer", password="importpass"
+        )
+        self.client.login(username="importer", password="importpass")
+        self.team = Team.objects.create(
+            name="Sheffield Wednesday",
+            country="England",
+            city="Sheffield",
+            contributor=self.user,
+        )
+
+    def test_creates_missing_seasons_and_imports_matches(self):
+        """Each file becomes a season, created if it does not exist."""
+        existing = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=datetime.date(2023, 8, 1),
+            end_date=datetime.date(2024, 5, 31),
+        )
+        result = import_archive(
+            self.team,
+            self.user,
+            make_zip(
+                {
+                    "SWFC_23-24.tsv": SEASON_23_24,
+                    "SWFC_24-25.tsv": SEASON_24_25,
+                    "README.txt": "ignored",
+                }
+            ),
+            workers=1,
+        )
+        self.assertEqual(
+            [item.season_created for item in result.seasons], [False, True]
+        )
+        self.assertEqual(existing.match_set.count(), 1)
+        created = Season.objects.get(team=self.team, slug="24-25")
+        self.assertEqual(created.competitions, ["Championship", "FA Cup"])
+        self.assertEqual(created.start_date, datetime.date(2024, 7, 1))
+        self.assertEqual(created.match_set.count(), 2)
+
+    def test_error_in_any_file_imports_nothing(self):
+        """A bad row in one file rolls back every season."""
+        with self.assertRaisesMessage(MatchImportError, "SWFC_24-25.tsv"):
+            import_archive(
+                self.team,
+                self.user,
+                make_zip(
+                    {
+                        "SWFC_23-24.tsv": SEASON_23_24,
+                        "SWFC_24-25.tsv": SEASON_24_25
+                        + "bad\tHull City\tH\t\n",
+                    }
+                ),
+                workers=1,
+            )
+        self.assertFalse(Season.objects.exists())
+        self.assertFalse(Match.objects.exists())
+
+    def test_rejects_non_zip_upload(self):
+        """A file that is not a zip archive is rejected."""
+        with self.assertRaisesMessage(MatchImportError, "not a zip"):
+            import_archive(
+                self.team,
+                self.user,
+                SimpleUploadedFile("seasons.zip", b"date\topponent\n"),
+            )
+
+    def test_parses_in_process_pool(self):
+        """Several files are parsed in worker processes, in order."""
+        parsed = parse_members(
+            [
+                ("a_23-24.tsv", SEASON_23_24.encode()),
+                ("a_24-25.tsv", SEASON_24_25.encode()),
+            ],
+            workers=2,
+        )
+        self.assertEqual([len(rows) for rows in parsed], [1, 2])
+        self.assertEqual(parsed[1][0][1]["opponent"], "Plymouth Argyle")
+
+    def test_view_imports_archive(self):
+        """Posting an archive imports it and returns to the dashboard."""
+        response = self.client.post(
+            reverse("import_archive", args=[self.team.slug]),
+            {"zip_file": make_zip({"SWFC_24-25.tsv": SEASON_24_25})},
+        )
+        self.assertRedirects(response, reverse("dashboard"))
+        self.assertEqual(Match.objects.count(), 2)
+
+    def test_view_is_limited_to_own_team(self):
+        """Contributors cannot import into another user's team."""
+        User.objects.create_user(username="other", password="otherpass")
+        self.client.login(username="other", password="otherpass")
+        response = self.client.get(
+            reverse("import_archive", args=[self.team.slug])
+        )
+        self.assertEqual(response.status_code, 404)
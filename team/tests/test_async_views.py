@@ -0,0 +1,117 @@
+from datetime import date
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+
+from home.views import dashboard_view
+from team.models import Match, Season, Team
+from team.resolvers import aresolve_objects
+from team.views import match_detail_view, season_detail_view
+
+
+class TestAsyncViews(TestCase):
+    """The read views served with the async ORM under ASGI."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        self.async_client.force_login(self.user)
+        self.team = Team.objects.create(
+            name="SWFC", country="England", contributor=self.user
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(2024, 8, 1),
+            end_date=date(2025, 5, 31),
+        )
+        self.match = Match.objects.create(
+            season=self.season,
+            date=date(2024, 8, 10),
+            opponent="Leeds United",
+            team_score=2,
+            opponent_score=1,
+        )
+        self.season_url = reverse(
+            "season_detail", args=[self.team.slug, self.season.slug]
+        )
+        self.match_url = reverse(
+            "match_detail",
+            args=[self.team.slug, self.season.slug, self.match.id],
+        )
+
+    def test_read_views_are_async(self):
+        """The season, match and dashboard views are coroutines."""
+        for view in (season_detail_view, match_detail_view, dashboard_view):
+            self.assertTrue(iscoroutinefunction(view), view.__name__)
+
+    async def test_season_detail(self):
+        """The season page renders its matches and record."""
+        response = await self.async_client.get(self.season_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Leeds United")
+        self.assertEqual(response.context["stats"].overall.played, 1)
+
+    async def test_season_detail_bad_cursor_redirects(self):
+        """An undecodable cursor sends the user back to the first page."""
+        response = await self.async_client.get(
+            self.season_url, {"cursor": "nonsense"}
+        )
+        self.assertRedirects(
+            response, f"{self.season_url}?", fetch_redirect_response=False
+        )
+
+    async def test_match_detail(self):
+        """The match page renders the match."""
+        response = await self.async_client.get(self.match_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["match"], self.match)
+
+    async def test_dashboard(self):
+        """The dashboard renders the user's seasons."""
+        response = await self.async_client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["team"], self.team)
+        self.assertEqual(list(response.context["seasons"]), [self.season])
+
+    async def test_anonymous_user_is_redirected_to_login(self):
+        """Logged-out requests redirect to the login page."""
+        response = await AsyncClient().get(self.match_url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(f"?next={self.match_url}", response.url)
+
+    async def test_not_modified(self):
+        """A repeat request with the season's ETag gets 304."""
+        response = await self.async_client.get(self.season_url)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        response = await self.async_client.get(
+            self.season_url, headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        response = await self.async_client.get(
+            self.match_url, headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_other_users_match_is_404(self):
+        """Another user's match is not found, ETag or not."""
+        other = await sync_to_async(User.objects.create_user)("other")
+        await Team.objects.filter(pk=self.team.pk).aupdate(contributor=other)
+        response = await self.async_client.get(self.match_url)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_aresolve_objects(self):
+        """The async resolver returns the same objects as the sync one."""
+        objects = await aresolve_objects(
+            self.user, self.team.slug, self.season.slug, self.match.id
+        )
+        self.assertEqual(
+            objects,
+            {"team": self.team, "season": self.season, "match": self.match},
+        )
@@ -0,0 +1,272 @@
+import json
+from datetime import date
+from io import BytesIO
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from team.api import match_batch_api
+from team.models import GoalEvent, Match, Season, Team
+from team.summaries import check_summaries
+
+
+class TestMatchBatchApi(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        self.client.force_login(self.user)
+        self.team = Team.objects.create(
+            name="SWFC", country="England", contributor=self.user
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(2024, 8, 1),
+            end_date=date(2025, 5, 31),
+            competition_list="League, FA Cup",
+        )
+        self.won = Match.objects.create(
+            season=self.season,
+            date=date(2024, 8, 10),
+            opponent="Leeds United",
+            competition="League",
+            team_score=2,
+            opponent_score=0,
+        )
+        self.lost = Match.objects.create(
+            season=self.season,
+            date=date(2024, 8, 17),
+            opponent="Hull City",
+            competition="League",
+            team_score=0,
+            opponent_score=1,
+        )
+        self.url = reverse(
+            "api_match_batch", args=[self.team.slug, self.season.slug]
+        )
+
+    def post(self, operations):
+        response = self.client.post(
+            self.url,
+            json.dumps({"operations": operations}),
+            content_type="application/json",
+        )
+        return response, json.loads(response.content)
+
+    def test_applies_creates_updates_and_deletes(self):
+        """A mixed batch is applied with its side effects."""
+        response, data = self.post(
+            [
+                {
+                    "op": "create",
+                    "data": {
+                        "date": "2024-08-24",
+                        "opponent": "Derby County",
+                        "competition": "League",
+                        "team_score": 3,
+                        "opponent_score": 3,
+                        "goals": "Windass 10, 20, Smith 90+4",
+                    },
+                },
+                {"op": "update", "id": self.won.pk, "data": {"goals": "X 5"}},
+                {"op": "delete", "id": self.lost.pk},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        statuses = [result["status"] for result in data["results"]]
+        self.assertEqual(statuses, ["created", "updated", "deleted"])
+        created = Match.objects.get(pk=data["results"][0]["id"])
+        self.assertEqual(created.opponent, "Derby County")
+        self.assertEqual(GoalEvent.objects.filter(match=created).count(), 3)
+        self.assertEqual(
+            list(
+                GoalEvent.objects.filter(match=self.won).values_list(
+                    "scorer", flat=True
+                )
+            ),
+            ["X"],
+        )
+        self.assertFalse(Match.objects.filter(pk=self.lost.pk).exists())
+        self.assertEqual(check_summaries([self.season.pk]), [])
+        self.season.summary.refresh_from_db()
+        self.assertEqual(
+            (self.season.summary.won, self.season.summary.lost), (1, 0)
+        )
+
+    def test_update_changes_only_given_fields(self):
+        """Fields left out of an update keep their values."""
+        version = self.won.version
+        _, data = self.post(
+            [{"op": "update", "id": self.won.pk, "data": {"round": "R1"}}]
+        )
+        self.won.refresh_from_db()
+        self.assertEqual((self.won.round, self.won.team_score), ("R1", 2))
+        self.assertNotEqual(self.won.version, version)
+
+    def test_update_keeps_competition_missing_from_list(self):
+        """An imported competition not in the season's list stays valid."""
+        Match.objects.filter(pk=self.won.pk).update(competition="League One")
+        _, data = self.post(
+            [{"op": "update", "id": self.won.pk, "data": {"round": "R1"}}]
+        )
+        self.assertEqual(data["results"][0]["status"], "updated")
+        _, data = self.post(
+            [
+                {
+                    "op": "update",
+                    "id": self.lost.pk,
+                    "data": {"competition": "League One"},
+                }
+            ]
+        )
+        self.assertEqual(
+            data["results"][0]["errors"]["competition"][0]["code"],
+            "invalid_choice",
+        )
+
+    def test_unchanged_update_writes_nothing(self):
+        """An update that changes nothing is reported and skipped."""
+        version = self.won.version
+        _, data = self.post(
+            [{"op": "update", "id": self.won.pk, "data": {"team_score": 2}}]
+        )
+        self.assertEqual(data["results"][0]["status"], "unchanged")
+        self.won.refresh_from_db()
+        self.assertEqual(self.won.version, version)
+
+    def test_invalid_item_applies_nothing(self):
+        """One invalid operation rejects the batch with per-item errors."""
+        response, data = self.post(
+            [
+                {"op": "delete", "id": self.lost.pk},
+                {"op": "create", "data": {"opponent": "No Date"}},
+                {"op": "update", "id": 0, "data": {}},
+                {"op": "rename"},
+            ]
+        )
+        self.assertEqual(response.status_code, 400)
+        results = data["results"]
+        self.assertEqual(
+            [result["status"] for result in results],
+            ["valid", "invalid", "invalid", "invalid"],
+        )
+        self.assertIn("date", results[1]["errors"])
+        self.assertEqual(results[2]["errors"]["id"][0]["code"], "not_found")
+        self.assertIn("op", results[3]["errors"])
+        self.assertTrue(Match.objects.filter(pk=self.lost.pk).exists())
+
+    def test_duplicate_keys_are_rejected(self):
+        """Creates may not collide with each other or existing matches."""
+        match = {"date": "2024-08-10", "opponent": "Leeds United"}
+        _, data = self.post(
+            [
+                {"op": "create", "data": match},
+                {"op": "create", "data": {**match, "date": "2024-09-01"}},
+                {"op": "create", "data": {**match, "date": "2024-09-01"}},
+            ]
+        )
+        self.assertEqual(
+            [result["status"] for result in data["results"]],
+            ["invalid", "valid", "invalid"],
+        )
+
+    def test_deleted_key_can_be_reused(self):
+        """Deletes apply first, so their keys are free for creates."""
+        response, _ = self.post(
+            [
+                {
+                    "op": "create",
+                    "data": {"date": "2024-08-10", "opponent": "Leeds United"},
+                },
+                {"op": "delete", "id": self.won.pk},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_same_match_twice_is_rejected(self):
+        """A match may be named by only one operation."""
+        _, data = self.post(
+            [
+                {"op": "update", "id": self.won.pk, "data": {"round": "R1"}},
+                {"op": "delete", "id": self.won.pk},
+            ]
+        )
+        self.assertEqual(
+            data["results"][1]["errors"]["id"][0]["code"], "duplicate"
+        )
+
+    def test_queries_do_not_grow_with_batch(self):
+        """Creating 10 or 50 matches takes the same number of queries."""
+        counts = []
+        for offset, size in ((0, 10), (100, 50)):
+            operations = [
+                {
+                    "op": "create",
+                    "data": {
+                        "date": f"2025-01-{1 + number % 28:02}",
+                        "opponent": f"Opponent {offset + number}",
+                        "team_score": 1,
+                        "opponent_score": 0,
+                        "goals": "Smith 9",
+                    },
+                }
+                for number in range(size)
+            ]
+            # Session, user, season, keys, then one savepoint, match and
+            # goal inserts, summary, touch and release.
+            with self.assertNumQueries(10) as queries:
+                response, _ = self.post(operations)
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_malformed_body(self):
+        """A body that is not a batch is a 400."""
+        response = self.client.post(
+            self.url, "nonsense", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(MATCH_BATCH_MAX_OPERATIONS=1)
+    def test_too_many_operations(self):
+        """Batches over the operation limit are refused."""
+        response, _ = self.post([{"op": "delete", "id": self.won.pk}] * 2)
+        self.assertEqual(response.status_code, 413)
+
+    @override_settings(MATCH_BATCH_MAX_SIZE=100)
+    def test_large_body_without_length_is_refused(self):
+        """A body over the size limit is refused unread, length or not."""
+        body = json.dumps(
+            {"operations": [{"op": "delete", "id": self.won.pk}] * 10}
+        ).encode()
+        request = RequestFactory().post(
+            self.url, body, content_type="application/json"
+        )
+        # As sent with chunked transfer encoding.
+        del request.META["CONTENT_LENGTH"]
+        request._stream = BytesIO(body)
+        request.user = self.user
+        response = match_batch_api(
+            request, team_slug=self.team.slug, season_slug=self.season.slug
+        )
+        self.assertEqual(response.status_code, 413)
+        self.assertTrue(Match.objects.filter(pk=self.won.pk).exists())
+
+    def test_other_users_season_is_404(self):
+        """Batches only apply to the user's own seasons."""
+        self.client.force_login(User.objects.create_user(username="other"))
+        response, _ = self.post([{"op": "delete", "id": self.won.pk}])
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Match.objects.filter(pk=self.won.pk).exists())
+
+    def test_anonymous_user_gets_401(self):
+        """Logged-out requests are refused with JSON, not redirected."""
+        self.client.logout()
+        response, _ = self.post([{"op": "delete", "id": self.won.pk}])
+        self.assertEqual(response.status_code, 401)
+
+    def test_get_not_allowed(self):
+        """The batch endpoint only accepts POST."""
+        self.assertEqual(self.client.get(self.url).status_code, 405)
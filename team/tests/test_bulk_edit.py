@@ -0,0 +1,165 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from team.bulk import update_matches
+from team.models import GoalEvent, Match, Season, Team
+from team.summaries import check_summaries
+
+
+def formset_data(formset):
+    """Return POST data that resubmits ``formset`` unchanged."""
+    data = {
+        f"{formset.prefix}-{name}": value
+        for name, value in formset.management_form.initial.items()
+    }
+    for form in formset:
+        for field in form:
+            value = field.value()
+            if isinstance(value, bool):
+                if value:
+                    data[field.html_name] = "on"
+            elif value is not None:
+                data[field.html_name] = str(value)
+    return data
+
+
+class TestBulkEditView(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        self.client.login(username="testuser", password="testpass")
+        self.team = Team.objects.create(
+            name="SWFC", country="England", contributor=self.user
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(2024, 8, 1),
+            end_date=date(2025, 5, 31),
+            competition_list="League, FA Cup",
+        )
+        for number in range(46):
+            Match.objects.create(
+                season=self.season,
+                date=date(2024, 8, 10) + timedelta(days=7 * number),
+                opponent=f"Opponent {number}",
+                competition="League",
+                team_score=1,
+                opponent_score=0,
+            )
+        self.url = reverse(
+            "bulk_edit_matches", args=[self.team.slug, self.season.slug]
+        )
+
+    def load(self):
+        response = self.client.get(self.url)
+        formset = response.context["formset"]
+        return formset, formset_data(formset)
+
+    def versions(self):
+        return dict(self.season.match_set.values_list("id", "version"))
+
+    def test_lists_every_match(self):
+        """A season of 46 matches is edited on one page."""
+        formset, _ = self.load()
+        self.assertEqual(len(formset.forms), 46)
+
+    def test_saves_only_changed_rows(self):
+        """Two edited rows are written, with their side effects, in bulk."""
+        formset, data = self.load()
+        data["form-0-opponent_score"] = "3"
+        data["form-5-goals"] = "Windass 82, Smith 90+6"
+        before = self.versions()
+        self.season.refresh_from_db()
+        season_version = self.season.version
+
+        # Session, user, season, page, formset rows, then one savepoint,
+        # UPDATE, goal delete and insert, summary, touch and release.
+        with self.assertNumQueries(12):
+            response = self.client.post(self.url, data)
+
+        self.assertRedirects(response, self.url)
+        after = self.versions()
+        changed = {pk for pk in before if before[pk] != after[pk]}
+        edited = {formset.forms[0].instance.pk, formset.forms[5].instance.pk}
+        self.assertEqual(changed, edited)
+        self.assertEqual(
+            GoalEvent.objects.filter(match=formset.forms[5].instance).count(),
+            2,
+        )
+        self.assertEqual(check_summaries([self.season.pk]), [])
+        self.season.refresh_from_db()
+        self.assertEqual(self.season.version, season_version + 1)
+        self.assertEqual(self.season.summary.lost, 1)
+
+    def test_unchanged_post_writes_nothing(self):
+        """Resubmitting the table unchanged leaves every row alone."""
+        _, data = self.load()
+        before = self.versions()
+        self.client.post(self.url, data)
+        self.assertEqual(self.versions(), before)
+
+    def test_invalid_row_saves_nothing(self):
+        """One invalid row rejects the whole table."""
+        _, data = self.load()
+        data["form-0-opponent"] = "Renamed"
+        data["form-1-date"] = "not a date"
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Match.objects.filter(opponent="Renamed").exists())
+
+    def test_duplicate_key_is_an_error(self):
+        """Two rows cannot end up with the same date and opponent."""
+        _, data = self.load()
+        data["form-1-date"] = data["form-0-date"]
+        data["form-1-opponent"] = data["form-0-opponent"]
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["formset"].non_form_errors())
+
+    def test_other_season_match_cannot_be_edited(self):
+        """Posted ids must belong to the season being edited."""
+        other = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(2023, 8, 1),
+            end_date=date(2024, 5, 31),
+        )
+        stranger = Match.objects.create(
+            season=other, date=date(2023, 9, 1), opponent="Leeds"
+        )
+        _, data = self.load()
+        data["form-0-id"] = str(stranger.pk)
+        data["form-0-opponent"] = "Hijacked"
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 200)
+        stranger.refresh_from_db()
+        self.assertEqual(stranger.opponent, "Leeds")
+
+
+class TestUpdateMatches(TestCase):
+    def test_rejects_match_from_another_season(self):
+        """Matches must belong to the season passed in."""
+        user = User.objects.create_user(username="testuser")
+        team = Team.objects.create(
+            name="SWFC", country="England", contributor=user
+        )
+        seasons = [
+            Season.objects.create(
+                team=team,
+                contributor=user,
+                start_date=date(year, 8, 1),
+                end_date=date(year + 1, 5, 31),
+            )
+            for year in (2023, 2024)
+        ]
+        match = Match.objects.create(
+            season=seasons[0], date=date(2023, 9, 1), opponent="Leeds"
+        )
+        match.opponent = "Hull City"
+        with self.assertRaises(ValueError):
+            update_matches(seasons[1], [(match, ["opponent"])])
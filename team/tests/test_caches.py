@@ -0,0 +1,226 @@
+import os
+import tempfile
+import threading
+from datetime import date
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from seasonwatch import cache_url
+from seasonwatch.cache import CacheNamespace
+from team.caches import season_list_version
+from team.models import Match, Season, Team
+
+TEST_REDIS_URL = os.environ.get("TEST_REDIS_URL")
+
+
+class TestCacheUrl(SimpleTestCase):
+    def test_locmem(self):
+        """locmem URLs name a per-process cache with a large entry limit."""
+        config = cache_url.parse("locmem://seasons?timeout=60")
+        self.assertEqual(config["LOCATION"], "seasons")
+        self.assertEqual(config["TIMEOUT"], 60)
+        self.assertEqual(config["OPTIONS"]["MAX_ENTRIES"], 20000)
+
+    def test_file(self):
+        """file URLs use the path as the cache directory."""
+        config = cache_url.parse("file:///var/tmp/sw?max_entries=50")
+        self.assertTrue(config["BACKEND"].endswith("FileBasedCache"))
+        self.assertEqual(config["LOCATION"], "/var/tmp/sw")
+        self.assertEqual(config["OPTIONS"]["MAX_ENTRIES"], 50)
+
+    def test_redis(self):
+        """redis URLs are passed through without their query string."""
+        config = cache_url.parse(
+            "redis://cache:6379/2?timeout=none&key_prefix=sw"
+        )
+        self.assertTrue(config["BACKEND"].endswith("RedisCache"))
+        self.assertEqual(config["LOCATION"], "redis://cache:6379/2")
+        self.assertIsNone(config["TIMEOUT"])
+        self.assertEqual(config["KEY_PREFIX"], "sw")
+        self.assertNotIn("OPTIONS", config)
+
+    def test_unknown_scheme(self):
+        """Unsupported schemes are rejected."""
+        with self.assertRaisesMessage(ValueError, "memcached"):
+            cache_url.parse("memcached://localhost:11211")
+
+
+class CacheNamespaceTests:
+    """Behaviour shared by every backend; mixed into a test per backend."""
+
+    def setUp(self):
+        caches["shared"].clear()
+        self.namespace = CacheNamespace("test", alias="shared")
+
+    def test_get_or_set_computes_once(self):
+        """A value is computed on the first miss and then read back."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"answer": 42}
+
+        for _ in range(3):
+            value = self.namespace.get_or_set("a", 1, compute=compute)
+        self.assertEqual(value, {"answer": 42})
+        self.assertEqual(len(calls), 1)
+
+    def test_versioned_keys(self):
+        """Different key parts, such as versions, are separate entries."""
+        self.namespace.set("season", 1, value="old")
+        self.assertEqual(self.namespace.get("season", 1), "old")
+        self.assertIsNone(self.namespace.get("season", 2))
+
+    def test_invalidate_retires_namespace(self):
+        """Invalidating a namespace hides its entries, not others'."""
+        other = CacheNamespace("other", alias="shared")
+        self.namespace.set("a", value=1)
+        other.set("a", value=2)
+        self.namespace.invalidate()
+        self.assertIsNone(self.namespace.get("a"))
+        self.assertEqual(other.get("a"), 2)
+
+    def test_cached_none_is_a_hit(self):
+        """A computed None is cached like any other value."""
+        calls = []
+        for _ in range(2):
+            self.namespace.get_or_set("none", compute=lambda: calls.append(1))
+        self.assertEqual(len(calls), 1)
+
+    def test_concurrent_misses_compute_once(self):
+        """Callers missing together wait for one computation."""
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "value"
+
+        results = []
+
+        def read():
+            results.append(self.namespace.get_or_set("slow", compute=compute))
+
+        first = threading.Thread(target=read)
+        first.start()
+        started.wait(5)
+        others = [threading.Thread(target=read) for _ in range(4)]
+        for thread in others:
+            thread.start()
+        release.set()
+        for thread in [first, *others]:
+            thread.join(10)
+        self.assertEqual(results, ["value"] * 5)
+        self.assertEqual(len(calls), 1)
+
+
+@override_settings(
+    CACHES={
+        "default": cache_url.parse("locmem://"),
+        "shared": cache_url.parse("locmem://shared"),
+    }
+)
+class TestLocmemNamespace(CacheNamespaceTests, SimpleTestCase):
+    pass
+
+
+class TestFileNamespace(CacheNamespaceTests, SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            CACHES={
+                "default": cache_url.parse("locmem://"),
+                "shared": cache_url.parse(f"file://{directory.name}"),
+            }
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        super().setUp()
+
+
+@skipUnless(TEST_REDIS_URL, "set TEST_REDIS_URL to test a Redis server")
+@override_settings(
+    CACHES={
+        "default": cache_url.parse("locmem://"),
+        "shared": cache_url.parse(TEST_REDIS_URL or "redis://localhost"),
+    }
+)
+class TestRedisNamespace(CacheNamespaceTests, SimpleTestCase):
+    pass
+
+
+class TestCachedReads(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        self.client.login(username="testuser", password="testpass")
+        self.team = Team.objects.create(
+            name="SWFC", country="England", contributor=self.user
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(2024, 8, 1),
+            end_date=date(2025, 5, 31),
+        )
+
+    def test_dashboard_is_served_from_cache(self):
+        """A repeat dashboard visit reads the session, user and version."""
+        self.client.get(reverse("dashboard"))
+        with self.assertNumQueries(3):
+            self.client.get(reverse("dashboard"))
+
+    def test_dashboard_sees_new_results(self):
+        """A new match retires the cached record cards."""
+        self.client.get(reverse("dashboard"))
+        Match.objects.create(
+            season=self.season,
+            date=date(2024, 8, 10),
+            opponent="Leeds United",
+            team_score=3,
+            opponent_score=0,
+        )
+        response = self.client.get(reverse("dashboard"))
+        self.assertContains(response, "P1 · W1 · D0 · L0")
+
+    def test_dashboard_sees_renames_and_deletes(self):
+        """Renaming the team or deleting a season changes the version."""
+        self.client.get(reverse("dashboard"))
+        self.team.name = "Sheffield Wednesday"
+        self.team.save()
+        response = self.client.get(reverse("dashboard"))
+        self.assertContains(response, "Sheffield Wednesday")
+        url = self.season.get_absolute_url()
+        self.season.delete()
+        response = self.client.get(reverse("dashboard"))
+        self.assertNotContains(response, url)
+
+    def test_other_users_changes_keep_the_version(self):
+        """Another contributor's writes do not retire the user's list."""
+        version = season_list_version(self.user)
+        other = User.objects.create_user(username="other")
+        Team.objects.create(name="Leeds", country="England", contributor=other)
+        self.assertEqual(season_list_version(self.user), version)
+
+    def test_season_stats_follow_the_season_version(self):
+        """Season statistics are reused until a match changes."""
+        url = self.season.get_absolute_url()
+        self.client.get(url)
+        Match.objects.create(
+            season=self.season,
+            date=date(2024, 8, 10),
+            opponent="Leeds United",
+            team_score=1,
+            opponent_score=1,
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.context["stats"].overall.drawn, 1)
@@ -0,0 +1,135 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from team.importer import import_matches
+from team.models import Match, Season, Team
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        self.client.login(username="testuser", password="testpass")
+        self.team = Team.objects.create(
+            name="SWFC", country="England", contributor=self.user
+        )
+        self.season = self.make_season(2024)
+        self.match = Match.objects.create(
+            season=self.season,
+            date=date(2024, 8, 10),
+            opponent="Leeds United",
+            team_score=1,
+            opponent_score=0,
+        )
+
+    def make_season(self, year):
+        return Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(year, 8, 1),
+            end_date=date(year + 1, 5, 31),
+        )
+
+    def version(self, season=None):
+        return Season.objects.get(pk=(season or self.season).pk).version
+
+
+class TestSeasonVersion(ConditionalGetTestCase):
+    def test_match_save_and_delete_bump_version(self):
+        """Saving or deleting a match bumps its season's version."""
+        before = self.version()
+        self.match.goals = "Smith 12"
+        self.match.save()
+        self.assertEqual(self.version(), before + 1)
+        self.match.delete()
+        self.assertEqual(self.version(), before + 2)
+
+    def test_moving_a_match_bumps_both_seasons(self):
+        """A match moved to another season changes both seasons."""
+        other = self.make_season(2023)
+        match = Match.objects.get(pk=self.match.pk)
+        before, other_before = self.version(), self.version(other)
+        match.season = other
+        match.save()
+        self.assertEqual(self.version(), before + 1)
+        self.assertEqual(self.version(other), other_before + 1)
+
+    def test_import_bumps_version_only_on_change(self):
+        """An import that writes matches bumps the version once."""
+        lines = ["date\topponent\tis_home", "2024-08-17\tHull City\tH"]
+        before = self.version()
+        import_matches(self.season, lines, mode="upsert")
+        self.assertEqual(self.version(), before + 1)
+        import_matches(self.season, lines, mode="upsert")
+        self.assertEqual(self.version(), before + 1)
+
+    def test_team_save_bumps_its_seasons(self):
+        """Renaming a team changes the version of each of its seasons."""
+        before = self.version()
+        self.team.name = "Sheffield Wednesday"
+        self.team.save()
+        self.assertEqual(self.version(), before + 1)
+
+
+class TestConditionalGet(ConditionalGetTestCase):
+    def urls(self):
+        return [
+            self.season.get_absolute_url(),
+            reverse(
+                "match_detail",
+                args=[self.team.slug, self.season.slug, self.match.id],
+            ),
+        ]
+
+    def test_unchanged_page_is_not_modified(self):
+        """A repeat request with the ETag gets 304 after one lookup."""
+        for url in self.urls():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                etag = response["ETag"]
+                self.assertTrue(response.has_header("Last-Modified"))
+                # Session, user and the season's version stamp.
+                with self.assertNumQueries(3):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+    def test_changed_page_is_rendered_again(self):
+        """Editing a match in the season invalidates the ETag."""
+        etags = [self.client.get(url)["ETag"] for url in self.urls()]
+        Match.objects.create(
+            season=self.season, date=date(2024, 8, 17), opponent="Hull City"
+        )
+        for url, etag in zip(self.urls(), etags):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+
+    def test_renamed_team_is_rendered_again(self):
+        """A team rename is not answered with 304 and a stale name."""
+        etag = self.client.get(self.urls()[0])["ETag"]
+        self.team.name = "Sheffield Wednesday"
+        self.team.save()
+        response = self.client.get(self.urls()[0], HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, "Sheffield Wednesday")
+
+    def test_responses_must_be_revalidated(self):
+        """Pages and 304s are private and revalidated before reuse."""
+        response = self.client.get(self.urls()[0])
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        response = self.client.get(
+            self.urls()[0], HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_other_users_do_not_get_304(self):
+        """The ETag check does not reveal another user's season."""
+        etag = self.client.get(self.urls()[0])["ETag"]
+        User.objects.create_user(username="visitor", password="testpass")
+        self.client.login(username="visitor", password="testpass")
+        response = self.client.get(self.urls()[0], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 404)
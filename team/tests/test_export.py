@@ -0,0 +1,187 @@
+import csv
+import datetime
+import io
+import zipfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from team.archive import import_archive
+from team.importer import UPSERT, import_matches
+from team.models import Match, Season, Team
+
+FIELDS = [
+    "date",
+    "time",
+    "competition",
+    "round",
+    "opponent",
+    "is_home",
+    "team_score",
+    "opponent_score",
+    "goals",
+    "attendance",
+]
+
+
+def match_values(season):
+    """Return the season's matches as comparable tuples."""
+    return list(
+        season.match_set.order_by("date", "opponent").values_list(*FIELDS)
+    )
+
+
+class TestExport(TestCase):
+    """Tests for streaming season and team exports."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="exporter", password="exportpass"
+        )
+        self.client.login(username="exporter", password="exportpass")
+        self.team = Team.objects.create(
+            name="Sheffield Wednesday",
+            country="England",
+            city="Sheffield",
+            contributor=self.user,
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=datetime.date(2024, 7, 1),
+            end_date=datetime.date(2025, 6, 30),
+        )
+        Match.objects.create(
+            season=self.season,
+            date=datetime.date(2024, 8, 11),
+            time=datetime.time(16, 30),
+            opponent="Plymouth Argyle",
+            is_home=True,
+            competition="Championship",
+            team_score=4,
+            opponent_score=0,
+            goals='Windass 15, 45+2, "Smith" 70',
+            attendance=28000,
+        )
+        Match.objects.create(
+            season=self.season,
+            date=datetime.date(2025, 1, 11),
+            opponent="Coventry City, FC",
+            is_home=False,
+            competition="FA Cup",
+            round="Third Round",
+        )
+
+    def export(self, season, export_format="tsv"):
+        response = self.client.get(
+            reverse("export_season", args=[self.team.slug, season.slug]),
+            {"format": export_format},
+        )
+        return response, b"".join(response.streaming_content)
+
+    def new_season(self, team=None):
+        return Season.objects.create(
+            team=team or self.team,
+            contributor=self.user,
+            start_date=datetime.date(2023, 7, 1),
+            end_date=datetime.date(2025, 6, 30),
+            slug="copy",
+        )
+
+    def test_season_export_is_streamed_tsv(self):
+        """A season is exported as a TSV attachment with a header row."""
+        response, content = self.export(self.season)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Type"],
+            "text/tab-separated-values; charset=utf-8",
+        )
+        self.assertIn(
+            "sheffield-wednesday_24-25.tsv", response["Content-Disposition"]
+        )
+        lines = content.decode("utf-8").splitlines()
+        self.assertEqual(lines[0], "\t".join(FIELDS))
+        self.assertEqual(len(lines), 3)
+
+    def test_season_export_round_trips_through_import(self):
+        """Importing an exported season reproduces every match exactly."""
+        _, content = self.export(self.season)
+        copy = self.new_season()
+        result = import_matches(
+            copy, content.decode("utf-8").splitlines(keepends=True)
+        )
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.warnings, [])
+        self.assertEqual(match_values(copy), match_values(self.season))
+
+    def test_reimporting_export_leaves_season_unchanged(self):
+        """Upserting a season's own export updates nothing."""
+        _, content = self.export(self.season)
+        result = import_matches(
+            self.season,
+            content.decode("utf-8").splitlines(keepends=True),
+            mode=UPSERT,
+        )
+        self.assertEqual((result.created, result.updated), (0, 0))
+        self.assertEqual(result.unchanged, 2)
+
+    def test_csv_export_matches_tsv(self):
+        """The CSV export quotes values and holds the same rows as TSV."""
+        response, content = self.export(self.season, "csv")
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        csv_text = content.decode("utf-8")
+        self.assertIn('"Coventry City, FC"', csv_text)
+        tsv_text = self.export(self.season)[1].decode("utf-8")
+        self.assertEqual(
+            list(csv.reader(io.StringIO(csv_text))),
+            list(csv.reader(io.StringIO(tsv_text), delimiter="\t")),
+        )
+
+    def test_team_export_round_trips_through_archive_import(self):
+        """A team's zip export can be loaded by the archive import."""
+        Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=datetime.date(2023, 7, 1),
+            end_date=datetime.date(2024, 6, 30),
+        )
+        response = self.client.get(
+            reverse("export_team", args=[self.team.slug])
+        )
+        self.assertEqual(response["Content-Type"], "application/zip")
+        content = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertEqual(
+                archive.namelist(),
+                [
+                    "sheffield-wednesday_23-24.tsv",
+                    "sheffield-wednesday_24-25.tsv",
+                ],
+            )
+
+        other = Team.objects.create(
+            name="Hull City",
+            country="England",
+            city="Hull",
+            contributor=self.user,
+        )
+        import_archive(
+            other, self.user, SimpleUploadedFile("export.zip", content)
+        )
+        imported = Season.objects.get(team=other, slug="24-25")
+        self.assertEqual(match_values(imported), match_values(self.season))
+
+    def test_other_users_cannot_export(self):
+        """Exports are only available to the team's contributor."""
+        User.objects.create_user(username="other", password="otherpass")
+        self.client.login(username="other", password="otherpass")
+        response = self.client.get(
+            reverse("export_season", args=[self.team.slug, self.season.slug])
+        )
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(
+            reverse("export_team", args=[self.team.slug])
+        )
+        self.assertEqual(response.status_code, 404)
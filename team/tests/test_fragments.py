@@ -0,0 +1,98 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from team.fragments import match_row_key
+from team.importer import UPSERT, import_matches
+from team.models import Match, Season, Team
+
+
+class TestMatchRowCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        self.client.login(username="testuser", password="testpass")
+        self.team = Team.objects.create(
+            name="SWFC", country="England", contributor=self.user
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(2024, 8, 1),
+            end_date=date(2025, 5, 31),
+        )
+        self.match = Match.objects.create(
+            season=self.season,
+            date=date(2024, 8, 10),
+            opponent="Leeds United",
+            team_score=1,
+            opponent_score=0,
+        )
+        self.url = self.season.get_absolute_url()
+
+    def cached_row(self, match):
+        match = Match.objects.select_related("season__team").get(pk=match.pk)
+        return cache.get(match_row_key(match, match.season))
+
+    def test_rendered_rows_are_cached(self):
+        """Rendering the season stores each row under its match key."""
+        self.client.get(self.url)
+        self.assertIn("Leeds United", self.cached_row(self.match))
+
+    def test_save_changes_version(self):
+        """Saving a match gives it a new version, and so a new row key."""
+        version = self.match.version
+        self.match.save(update_fields=["goals"])
+        self.match.refresh_from_db()
+        self.assertNotEqual(self.match.version, version)
+
+    def test_upsert_changes_version_of_changed_rows_only(self):
+        """An upsert import gives only the rows it changes a new version."""
+        other = Match.objects.create(
+            season=self.season, date=date(2024, 8, 17), opponent="Hull City"
+        )
+        versions = dict(Match.objects.values_list("opponent", "version"))
+        lines = [
+            "date\topponent\tis_home\tteam_score\topponent_score",
+            "2024-08-10\tLeeds United\tH\t2\t0",
+            "2024-08-17\tHull City\tH\t\t",
+        ]
+        result = import_matches(self.season, lines, mode=UPSERT)
+        self.assertEqual((result.updated, result.unchanged), (1, 1))
+        self.match.refresh_from_db()
+        other.refresh_from_db()
+        self.assertNotEqual(self.match.version, versions["Leeds United"])
+        self.assertEqual(other.version, versions["Hull City"])
+
+    def test_edited_row_is_rendered_again(self):
+        """An edited match shows its new values; others come from cache."""
+        other = Match.objects.create(
+            season=self.season, date=date(2024, 8, 17), opponent="Hull City"
+        )
+        self.client.get(self.url)
+        other_row = self.cached_row(other)
+        self.match.opponent = "Leeds Utd"
+        self.match.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, "Leeds Utd")
+        self.assertNotContains(response, "Leeds United")
+        self.assertEqual(self.cached_row(other), other_row)
+
+    def test_delete_drops_cached_row(self):
+        """Deleting a match through its page removes its cached row."""
+        self.client.get(self.url)
+        key = match_row_key(self.match, self.season)
+        self.assertIsNotNone(cache.get(key))
+        self.client.post(
+            reverse(
+                "delete_match",
+                args=[self.team.slug, self.season.slug, self.match.pk],
+            )
+        )
+        self.assertFalse(Match.objects.filter(pk=self.match.pk).exists())
+        self.assertIsNone(cache.get(key))
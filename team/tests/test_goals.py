@@ -0,0 +1,162 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from team.goal_parser import (
+    GoalIssue,
+    ParsedGoal,
+    check_goals,
+    parse_goals,
+    parse_goals_batch,
+)
+from team.importer import UPSERT, import_matches
+from team.models import GoalEvent, Match, Season, Team
+
+
+class TestParseGoals(TestCase):
+    """Tests for reading goals from the ``Match.goals`` text."""
+
+    def test_follow_on_minutes_and_stoppage_time(self):
+        """Bare minutes belong to the previous scorer; '+' is added time."""
+        self.assertEqual(
+            parse_goals("Smith 45+2, 76, Windass 83"),
+            (
+                ParsedGoal("Smith", 45, 2),
+                ParsedGoal("Smith", 76),
+                ParsedGoal("Windass", 83),
+            ),
+        )
+
+    def test_penalties_own_goals_and_names(self):
+        """Notes are recognised and names may contain dots and accents."""
+        self.assertEqual(
+            parse_goals("J. Lowe 35 (pen), Börner 4 (og)"),
+            (
+                ParsedGoal("J. Lowe", 35, is_penalty=True),
+                ParsedGoal("Börner", 4, is_own_goal=True),
+            ),
+        )
+
+    def test_unreadable_fragments_are_reported(self):
+        """Skipped fragments are reported with their position in the text."""
+        goals, issues = check_goals("90, 45 Smith, , Bannan 12, 7x")
+        self.assertEqual(goals, (ParsedGoal("Bannan", 12),))
+        self.assertEqual(
+            issues,
+            (
+                GoalIssue(0, 2, "90", "has no scorer before it."),
+                GoalIssue(4, 12, "45 Smith", "is not a scorer and minute."),
+                GoalIssue(27, 29, "7x", "is not a scorer and minute."),
+            ),
+        )
+        self.assertEqual(
+            str(issues[1]),
+            "'45 Smith' (characters 5-12) is not a scorer and minute.",
+        )
+
+    def test_results_are_cached(self):
+        """Parsing the same string again is served from the cache."""
+        check_goals.cache_clear()
+        parse_goals("Smith 45+2")
+        parse_goals("Smith 45+2")
+        self.assertEqual(check_goals.cache_info().hits, 1)
+
+    def test_batch_matches_single_parses(self):
+        """The batch API returns one result per string, in order."""
+        texts = ["Smith 45+2, 76", "", "Windass 83", "Smith 45+2, 76"]
+        self.assertEqual(
+            parse_goals_batch(texts), [parse_goals(text) for text in texts]
+        )
+
+
+class TestGoalEventSync(TestCase):
+    """Tests for keeping GoalEvent rows in step with Match.goals."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="u", password="p")
+        self.team = Team.objects.create(
+            name="Sheffield Wednesday",
+            country="England",
+            city="Sheffield",
+            contributor=self.user,
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=datetime.date(2024, 7, 1),
+            end_date=datetime.date(2025, 6, 30),
+        )
+
+    def events(self):
+        return list(
+            GoalEvent.objects.order_by("match__date", "order").values_list(
+                "scorer", "minute", "stoppage"
+            )
+        )
+
+    def test_save_and_delete_keep_events_in_sync(self):
+        """Saving a match rebuilds its events; deleting removes them."""
+        match = Match.objects.create(
+            season=self.season,
+            date=datetime.date(2024, 8, 11),
+            opponent="Plymouth Argyle",
+            goals="Windass 15, 90+3",
+        )
+        self.assertEqual(
+            self.events(), [("Windass", 15, None), ("Windass", 90, 3)]
+        )
+        match.goals = "Smith 70"
+        match.save()
+        self.assertEqual(self.events(), [("Smith", 70, None)])
+        match.delete()
+        self.assertEqual(self.events(), [])
+
+    def test_import_builds_events(self):
+        """Bulk imports build events in both insert and upsert mode."""
+        header = "date\topponent\tgoals\n"
+        import_matches(
+            self.season,
+            [header, "2024-08-11\tPlymouth Argyle\tWindass 15\n"],
+        )
+        self.assertEqual(self.events(), [("Windass", 15, None)])
+        import_matches(
+            self.season,
+            [
+                header,
+                "2024-08-11\tPlymouth Argyle\tSmith 20, 91\n",
+                "2024-08-17\tLeeds United\tBannan 45+1\n",
+            ],
+            mode=UPSERT,
+        )
+        self.assertEqual(
+            self.events(),
+            [("Smith", 20, None), ("Smith", 91, None), ("Bannan", 45, 1)],
+        )
+        self.assertEqual(
+            GoalEvent.objects.filter(season=self.season).count(), 3
+        )
+
+    def test_leaderboard_and_late_goal_queries(self):
+        """Top scorers exclude own goals; 'after 90' includes added time."""
+        import_matches(
+            self.season,
+            [
+                "date\topponent\tgoals\n",
+                "2024-08-11\tPlymouth Argyle\tSmith 20, 90+2, Jones 5 (og)\n",
+                "2024-08-17\tLeeds United\tSmith 90, Windass 112\n",
+            ],
+        )
+        self.assertEqual(
+            list(GoalEvent.objects.top_scorers()),
+            [
+                {"scorer": "Smith", "goals": 3},
+                {"scorer": "Windass", "goals": 1},
+            ],
+        )
+        self.assertEqual(
+            sorted(
+                GoalEvent.objects.after(90).values_list("minute", flat=True)
+            ),
+            [90, 112],
+        )
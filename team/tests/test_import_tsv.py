@@ -113,6 +113,46 @@ class TestTSVImportView(TestCase):
         match = Match.objects.first()
         self.assertIsNone(match.time)
 
+    def test_upsert_mode_updates_existing_matches(self):
+        """Re-uploading a corrected file in upsert mode avoids duplicates."""
+        self.post_tsv("date\topponent\tteam_score\n2024-08-10\tWigan\t1")
+        file = SimpleUploadedFile(
+            "matches.tsv",
+            b"date\topponent\tteam_score\n2024-08-10\tWigan\t2",
+        )
+        self.client.post(self.url, {"tsv_file": file, "mode": "upsert"})
+        self.assertEqual(Match.objects.count(), 1)
+        self.assertEqual(Match.objects.get().team_score, 2)
+
+    def test_validate_action_reports_without_importing(self):
+        """Validate Only renders a report and writes nothing."""
+        file = SimpleUploadedFile(
+            "matches.tsv", b"date\topponent\n2024-08-10\tWigan\nbad\tHull"
+        )
+        response = self.client.post(
+            self.url, {"tsv_file": file, "action": "validate"}
+        )
+        self.assertEqual(Match.objects.count(), 0)
+        self.assertTemplateUsed(response, "team/import_report.html")
+        report = response.context["report"]
+        self.assertEqual(report.rows, 2)
+        self.assertEqual(len(report.errors), 1)
+
+    def test_report_action_downloads_tsv(self):
+        """Download Report streams the issues as a TSV attachment."""
+        file = SimpleUploadedFile(
+            "matches.tsv",
+            b"date\topponent\tis_home\nbad\tHull\tH\n2024-08-10\t\tA",
+        )
+        response = self.client.post(
+            self.url, {"tsv_file": file, "action": "report"}
+        )
+        self.assertEqual(Match.objects.count(), 0)
+        self.assertIn("attachment", response["Content-Disposition"])
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].startswith("3\topponent\terror"))
+
     def test_get_request_renders_import_form(self):
         """GET request returns the TSV import form page."""
         response = self.client.get(self.url)
@@ -0,0 +1,314 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from team.models import Team, Season, Match
+from team.importer import (
+    UPSERT,
+    MatchImportError,
+    get_batch_size,
+    import_matches,
+    iter_report_tsv,
+    iter_text_lines,
+    parse_match_row,
+    validate_tsv,
+)
+import datetime
+
+
+class TestParseMatchRow(TestCase):
+    """Tests for conversion of a single TSV row into Match fields."""
+
+    def test_parses_all_columns(self):
+        """Every supported column is converted to its field type."""
+        fields, warnings = parse_match_row(
+            {
+                "date": "2024-08-11",
+                "time": "16:00",
+                "opponent": "Plymouth Argyle",
+                "is_home": "H",
+                "competition": " Championship ",
+                "round": "",
+                "team_score": "4",
+                "opponent_score": "0",
+                "goals": "Windass 82, Smith 90+6",
+                "attendance": "29535",
+            },
+            2,
+        )
+        self.assertEqual(warnings, [])
+        self.assertEqual(fields["date"], datetime.date(2024, 8, 11))
+        self.assertEqual(fields["time"], datetime.time(16, 0))
+        self.assertTrue(fields["is_home"])
+        self.assertEqual(fields["competition"], "Championship")
+        self.assertEqual(fields["team_score"], 4)
+        self.assertEqual(fields["opponent_score"], 0)
+        self.assertEqual(fields["attendance"], 29535)
+
+    def test_unrecognized_is_home_warns(self):
+        """An unknown venue value defaults to away with a warning."""
+        fields, warnings = parse_match_row(
+            {"date": "2024-08-11", "opponent": "Hull", "is_home": "?"}, 5
+        )
+        self.assertFalse(fields["is_home"])
+        self.assertIn("Row 5", warnings[0])
+
+    def test_unreadable_goal_warns_with_position(self):
+        """A goal fragment that cannot be read is reported, not fatal."""
+        fields, warnings = parse_match_row(
+            {
+                "date": "2024-08-11",
+                "opponent": "Hull",
+                "is_home": "H",
+                "goals": "Smith 45, 7x",
+            },
+            4,
+        )
+        self.assertEqual(fields["goals"], "Smith 45, 7x")
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("Row 4", warnings[0])
+        self.assertIn("'7x' (characters 11-12)", warnings[0])
+
+    def test_invalid_date_raises_with_row_number(self):
+        """A malformed date raises MatchImportError naming the row."""
+        with self.assertRaisesMessage(MatchImportError, "Row 3"):
+            parse_match_row({"date": "11/08/2024", "opponent": "Hull"}, 3)
+
+
+class TestIterTextLines(TestCase):
+    """Tests for incremental decoding of uploaded files."""
+
+    def lines(self, content, chunk_size):
+        file = SimpleUploadedFile("matches.tsv", content)
+        return list(iter_text_lines(file, chunk_size=chunk_size))
+
+    def test_multibyte_character_split_across_chunks(self):
+        """A UTF-8 sequence split between chunks decodes correctly."""
+        content = "opponent\nAtlético Madrid\n".encode("utf-8")
+        for chunk_size in range(1, len(content) + 1):
+            self.assertEqual(
+                self.lines(content, chunk_size),
+                ["opponent\n", "Atlético Madrid\n"],
+            )
+
+    def test_crlf_split_across_chunks(self):
+        """A CRLF pair split between chunks yields a single line ending."""
+        content = b"date\r\n2024-08-10\r\n"
+        self.assertEqual(
+            self.lines(content, 5), ["date\r\n", "2024-08-10\r\n"]
+        )
+
+    def test_final_line_without_newline(self):
+        """The last line is yielded even without a trailing newline."""
+        self.assertEqual(self.lines(b"a\nb", 64), ["a\n", "b"])
+
+    def test_invalid_utf8_raises(self):
+        """Undecodable bytes raise a UnicodeDecodeError."""
+        with self.assertRaises(UnicodeDecodeError):
+            self.lines(b"date\n\xff\xfe\n", 2)
+
+
+class TestImportMatches(TestCase):
+    """Tests for the transactional bulk import engine."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="importer", password="importpass"
+        )
+        self.team = Team.objects.create(
+            name="Charlton Athletic",
+            country="England",
+            city="London",
+            contributor=self.user,
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=datetime.date(2024, 8, 1),
+            end_date=datetime.date(2025, 5, 30),
+        )
+
+    def make_lines(self, count):
+        """Return TSV lines for ``count`` home matches."""
+        start = datetime.date(2024, 8, 1)
+        return ["date\topponent\tis_home"] + [
+            f"{start + datetime.timedelta(days=i)}\tOpponent {i}\tH"
+            for i in range(count)
+        ]
+
+    def test_imports_in_batches(self):
+        """Rows are written with one INSERT per batch."""
+        with self.assertNumQueries(6):
+            # SAVEPOINT, 3 x INSERT, UPDATE season version, RELEASE SAVEPOINT
+            result = import_matches(
+                self.season, self.make_lines(25), batch_size=10
+            )
+        self.assertEqual(result.created, 25)
+        self.assertEqual(Match.objects.filter(season=self.season).count(), 25)
+
+    def test_invalid_row_writes_nothing(self):
+        """A bad row late in the file aborts the import without writes."""
+        lines = self.make_lines(20) + ["not-a-date\tWigan Athletic\tH"]
+        with self.assertRaisesMessage(MatchImportError, "Row 22"):
+            import_matches(self.season, lines)
+        self.assertEqual(Match.objects.count(), 0)
+
+    def test_imports_from_streamed_upload(self):
+        """Lines streamed from an upload are imported in full."""
+        content = "\n".join(self.make_lines(30)).encode("utf-8")
+        file = SimpleUploadedFile("matches.tsv", content)
+        result = import_matches(
+            self.season, iter_text_lines(file, chunk_size=16)
+        )
+        self.assertEqual(result.created, 30)
+        self.assertEqual(Match.objects.filter(season=self.season).count(), 30)
+
+    def test_reports_rows_per_second(self):
+        """The result reports a positive write throughput."""
+        result = import_matches(self.season, self.make_lines(3))
+        self.assertGreater(result.elapsed, 0)
+        self.assertGreater(result.rows_per_second, 0)
+
+    @override_settings(MATCH_IMPORT_BATCH_SIZE=42)
+    def test_batch_size_defaults_to_setting(self):
+        """The batch size falls back to MATCH_IMPORT_BATCH_SIZE."""
+        self.assertEqual(get_batch_size(), 42)
+        self.assertEqual(get_batch_size(7), 7)
+
+    def test_batch_size_must_be_positive(self):
+        """A non-positive batch size is rejected."""
+        with self.assertRaises(ValueError):
+            get_batch_size(0)
+
+
+class TestUpsertImport(TestCase):
+    """Tests for idempotent re-imports keyed on (season, date, opponent)."""
+
+    HEADER = "date\topponent\tis_home\tteam_score\topponent_score"
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="importer")
+        self.team = Team.objects.create(
+            name="Charlton Athletic",
+            country="England",
+            city="London",
+            contributor=self.user,
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=datetime.date(2024, 8, 1),
+            end_date=datetime.date(2025, 5, 30),
+        )
+        self.lines = [
+            self.HEADER,
+            "2024-08-10\tWigan Athletic\tH\t2\t0",
+            "2024-08-17\tLeeds United\tA\t1\t1",
+            "2024-08-24\tHull City\tH\t0\t3",
+        ]
+        import_matches(self.season, self.lines)
+
+    def test_reimport_of_same_file_writes_nothing(self):
+        """Re-importing an unchanged file only reads the existing keys."""
+        with self.assertNumQueries(3):
+            # SAVEPOINT, SELECT existing, RELEASE SAVEPOINT
+            result = import_matches(self.season, self.lines, mode=UPSERT)
+        self.assertEqual(result.unchanged, 3)
+        self.assertEqual((result.created, result.updated), (0, 0))
+        self.assertEqual(Match.objects.count(), 3)
+
+    def test_changed_and_new_rows_are_written_in_bulk(self):
+        """Changed rows are updated and new rows inserted in one batch."""
+        lines = self.lines[:2] + [
+            "2024-08-17\tLeeds United\tA\t2\t1",
+            "2024-08-24\tHull City\tH\t0\t3",
+            "2024-08-31\tMillwall\tA\t1\t0",
+        ]
+        with self.assertNumQueries(6):
+            # SAVEPOINT, SELECT existing, INSERT ... ON CONFLICT,
+            # UPDATE season summary, UPDATE season version, RELEASE
+            result = import_matches(self.season, lines, mode=UPSERT)
+        self.assertEqual(
+            (result.created, result.updated, result.unchanged), (1, 1, 2)
+        )
+        self.assertEqual(Match.objects.count(), 4)
+        leeds = Match.objects.get(opponent="Leeds United")
+        self.assertEqual(leeds.team_score, 2)
+
+    def test_repeated_key_in_file_last_row_wins(self):
+        """A key repeated within the file takes the values of its last row."""
+        lines = [
+            self.HEADER,
+            "2024-09-14\tBlackburn Rovers\tH\t1\t0",
+            "2024-09-14\tBlackburn Rovers\tH\t3\t0",
+        ]
+        import_matches(self.season, lines, mode=UPSERT)
+        match = Match.objects.get(opponent="Blackburn Rovers")
+        self.assertEqual(match.team_score, 3)
+
+    def test_insert_mode_rejects_existing_matches(self):
+        """Insert mode refuses to duplicate an existing match."""
+        with self.assertRaisesMessage(MatchImportError, "update mode"):
+            import_matches(self.season, self.lines)
+        self.assertEqual(Match.objects.count(), 3)
+
+    def test_unknown_mode_is_rejected(self):
+        """Only the insert and upsert modes are accepted."""
+        with self.assertRaises(ValueError):
+            import_matches(self.season, self.lines, mode="replace")
+
+
+class TestValidateTSV(TestCase):
+    """Tests for the dry-run validation report."""
+
+    def test_reports_every_problem_in_the_file(self):
+        """All rows are checked instead of stopping at the first error."""
+        report = validate_tsv(
+            [
+                "date\topponent\tis_home\tattendance\tvenue",
+                "2024-08-10\tWigan Athletic\tH\t25000\tThe Valley",
+                "08/10/2024\tLeeds United\tA\t\tElland Road",
+                "2024-08-24\t\tH\tlots\t",
+                "2024-08-10\tWigan Athletic\tX\t\t",
+            ]
+        )
+        self.assertEqual(report.rows, 4)
+        self.assertFalse(report.is_valid)
+        self.assertEqual(
+            [(i.row, i.column) for i in report.errors],
+            [(3, "date"), (4, "opponent")],
+        )
+        self.assertEqual(
+            [(i.row, i.column) for i in report.warnings],
+            [
+                (1, "venue"),
+                (4, "attendance"),
+                (5, "is_home"),
+                (5, "date, opponent"),
+            ],
+        )
+
+    def test_valid_file_has_no_errors(self):
+        """A clean file produces an empty, valid report."""
+        report = validate_tsv(
+            ["date\topponent\tis_home", "2024-08-10\tHull\tH"]
+        )
+        self.assertTrue(report.is_valid)
+        self.assertEqual(report.issues, [])
+
+    def test_missing_header_stops_validation(self):
+        """Header errors are reported without checking the rows."""
+        report = validate_tsv(["date\ttime", "2024-08-10\t15:00"])
+        self.assertEqual(len(report.errors), 1)
+        self.assertIn("Missing required fields", report.errors[0].message)
+
+    def test_validation_does_not_touch_the_database(self):
+        """Validation issues no queries at all."""
+        with self.assertNumQueries(0):
+            validate_tsv(["date\topponent", "bad\tHull"])
+
+    def test_report_is_tsv(self):
+        """The report renders as TSV with one line per issue."""
+        report = validate_tsv(["date\topponent", "bad\tHull"])
+        lines = list(iter_report_tsv(report.issues))
+        self.assertEqual(lines[0], "row\tcolumn\tlevel\tmessage\tvalue\n")
+        self.assertTrue(lines[1].startswith("2\tdate\terror\t"))
@@ -0,0 +1,217 @@
+import datetime
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from team.jobs import (
+    StoredUpload,
+    claim_next_job,
+    enqueue_import,
+    run_job,
+    run_worker,
+)
+from team.models import ImportChunk, ImportJob, Match, Season, Team
+
+
+class TestImportJobs(TestCase):
+    """Tests for the database-backed background import queue."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="importer", password="importpass"
+        )
+        self.client.login(username="importer", password="importpass")
+        self.team = Team.objects.create(
+            name="Charlton Athletic",
+            country="England",
+            city="London",
+            contributor=self.user,
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=datetime.date(2024, 8, 1),
+            end_date=datetime.date(2025, 5, 30),
+        )
+
+    def upload(self, content):
+        return SimpleUploadedFile("matches.tsv", content.encode("utf-8"))
+
+    def test_jobs_are_claimed_oldest_first(self):
+        """The worker claims pending jobs in order of creation."""
+        first = enqueue_import(self.season, self.upload("a"), self.user)
+        enqueue_import(self.season, self.upload("b"), self.user)
+        job = claim_next_job()
+        self.assertEqual(job, first)
+        self.assertEqual(job.status, ImportJob.Status.RUNNING)
+        self.assertIsNotNone(job.started_at)
+
+    def test_upload_is_stored_in_chunks(self):
+        """Uploads are stored in the database, split into chunks."""
+        content = "date\topponent\n" + "2024-08-10\tWigan Athletic\n" * 10
+        with patch("team.jobs.CHUNK_SIZE", 100):
+            job = enqueue_import(self.season, self.upload(content), self.user)
+        self.assertEqual(job.chunks.count(), 3)
+        data = b"".join(StoredUpload(job).chunks())
+        self.assertEqual(data, content.encode("utf-8"))
+
+    def test_stale_running_job_is_claimed_again(self):
+        """A running job whose worker stopped reporting is reclaimed."""
+        job = enqueue_import(self.season, self.upload("a"), self.user)
+        claim_next_job()
+        self.assertIsNone(claim_next_job())
+        ImportJob.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        job = claim_next_job()
+        self.assertEqual(job.status, ImportJob.Status.RUNNING)
+        self.assertEqual(job.attempts, 2)
+
+    def test_reclaimed_job_is_imported_once(self):
+        """The worker that lost a job to a reclaim imports nothing."""
+        job = enqueue_import(
+            self.season,
+            self.upload("date\topponent\n2024-08-10\tWigan Athletic\n"),
+            self.user,
+        )
+        first = claim_next_job()
+        ImportJob.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        second = claim_next_job()
+        run_job(first)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.RUNNING)
+        self.assertEqual(Match.objects.count(), 0)
+        self.assertTrue(job.chunks.exists())
+        run_job(second)
+        run_job(first)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.SUCCEEDED)
+        self.assertEqual(Match.objects.count(), 1)
+
+    @override_settings(MATCH_IMPORT_JOB_ATTEMPTS=1)
+    def test_stale_job_fails_after_last_attempt(self):
+        """A stale job already claimed too often is failed, not retried."""
+        job = enqueue_import(self.season, self.upload("a"), self.user)
+        claim_next_job()
+        ImportJob.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertIsNone(claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.FAILED)
+        self.assertIn("stopped 1 times", job.error)
+        self.assertFalse(job.chunks.exists())
+
+    def test_claim_returns_none_when_queue_empty(self):
+        """No job is claimed from an empty queue."""
+        self.assertIsNone(claim_next_job())
+
+    def test_successful_job_imports_matches(self):
+        """A valid file is imported and the job records its progress."""
+        enqueue_import(
+            self.season,
+            self.upload(
+                "date\topponent\tis_home\n"
+                "2024-08-10\tWigan Athletic\tH\n"
+                "2024-08-17\tLeeds United\t?\n"
+            ),
+            self.user,
+        )
+        job = run_job(claim_next_job())
+        self.assertEqual(job.status, ImportJob.Status.SUCCEEDED)
+        self.assertEqual(job.rows_processed, 2)
+        self.assertEqual(len(job.warnings), 1)
+        self.assertFalse(ImportChunk.objects.exists())
+        self.assertEqual(Match.objects.filter(season=self.season).count(), 2)
+
+    def test_failed_job_records_error_and_writes_nothing(self):
+        """An invalid row fails the job without importing any matches."""
+        enqueue_import(
+            self.season,
+            self.upload(
+                "date\topponent\n2024-08-10\tWigan Athletic\nbad\tLeeds\n"
+            ),
+            self.user,
+        )
+        job = run_job(claim_next_job())
+        self.assertEqual(job.status, ImportJob.Status.FAILED)
+        self.assertIn("Row 3", job.error)
+        self.assertEqual(Match.objects.count(), 0)
+
+    def test_worker_once_drains_queue(self):
+        """The worker command processes every pending job and exits."""
+        for opponent in ("Wigan Athletic", "Leeds United"):
+            enqueue_import(
+                self.season,
+                self.upload(f"date\topponent\n2024-08-10\t{opponent}\n"),
+                self.user,
+            )
+        call_command("run_import_worker", "--once", stdout=StringIO())
+        self.assertFalse(
+            ImportJob.objects.exclude(
+                status=ImportJob.Status.SUCCEEDED
+            ).exists()
+        )
+        self.assertEqual(run_worker(once=True), 0)
+
+    @override_settings(MATCH_IMPORT_BACKGROUND_THRESHOLD=10)
+    def test_large_upload_is_queued(self):
+        """Uploads above the threshold are queued instead of imported."""
+        url = reverse(
+            "import_matches", args=[self.team.slug, self.season.slug]
+        )
+        response = self.client.post(
+            url,
+            {
+                "tsv_file": self.upload(
+                    "date\topponent\n2024-08-10\tWigan Athletic\n"
+                )
+            },
+        )
+        self.assertRedirects(response, url)
+        self.assertEqual(Match.objects.count(), 0)
+        job = ImportJob.objects.get()
+        self.assertEqual(job.status, ImportJob.Status.PENDING)
+        self.assertEqual(job.contributor, self.user)
+
+    def test_status_endpoint_reports_progress(self):
+        """The status endpoint returns the job's progress as JSON."""
+        enqueue_import(
+            self.season,
+            self.upload("date\topponent\n2024-08-10\tWigan Athletic\n"),
+            self.user,
+        )
+        job = run_job(claim_next_job())
+        response = self.client.get(
+            reverse(
+                "import_job_status",
+                args=[self.team.slug, self.season.slug, job.id],
+            )
+        )
+        data = response.json()
+        self.assertEqual(data["status"], "succeeded")
+        self.assertEqual(data["rows_processed"], 1)
+        self.assertIn("rows_per_second", data)
+        self.assertEqual(data["error"], "")
+
+    def test_status_endpoint_hides_other_users_jobs(self):
+        """Contributors cannot see another user's import jobs."""
+        job = enqueue_import(self.season, self.upload("a"), self.user)
+        User.objects.create_user(username="other", password="otherpass")
+        self.client.login(username="other", password="otherpass")
+        response = self.client.get(
+            reverse(
+                "import_job_status",
+                args=[self.team.slug, self.season.slug, job.id],
+            )
+        )
+        self.assertEqual(response.status_code, 404)
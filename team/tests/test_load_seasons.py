@@ -0,0 +1,103 @@
+import datetime
+import tempfile
+import uuid
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from team.importer import ImportResult, iter_copy_lines
+from team.models import Match, Season, Team
+
+DATA_DIR = Path(settings.BASE_DIR) / "data"
+
+
+class TestLoadSeasonsCommand(TestCase):
+    """Tests for the load_seasons bulk loading command."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="loader")
+        self.team = Team.objects.create(
+            name="Sheffield Wednesday",
+            country="England",
+            city="Sheffield",
+            contributor=self.user,
+        )
+
+    def test_loads_every_file_in_directory(self):
+        """Each TSV in data/ becomes a season with its matches."""
+        out = StringIO()
+        call_command(
+            "load_seasons",
+            str(DATA_DIR),
+            team=self.team.slug,
+            workers=1,
+            stdout=out,
+        )
+        files = sorted(DATA_DIR.glob("*.tsv"))
+        self.assertEqual(
+            Season.objects.filter(team=self.team).count(), len(files)
+        )
+        rows = sum(len(path.read_text().splitlines()) - 1 for path in files)
+        self.assertEqual(Match.objects.count(), rows)
+        output = out.getvalue()
+        self.assertIn(files[0].name, output)
+        self.assertIn("rows/s", output)
+
+    def test_missing_directory_is_an_error(self):
+        """A path that is not a directory is rejected."""
+        with self.assertRaises(CommandError):
+            call_command("load_seasons", "/no/such/dir", team=self.team.slug)
+
+    def test_unknown_team_is_an_error(self):
+        """The team slug must match exactly one team."""
+        with self.assertRaisesMessage(CommandError, "found none"):
+            call_command("load_seasons", str(DATA_DIR), team="nobody")
+
+    def test_bad_file_loads_nothing(self):
+        """An invalid row fails the command without writing any rows."""
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, "SWFC_24-25.tsv").write_text(
+                "date\topponent\tis_home\nbad\tHull City\tH\n"
+            )
+            with self.assertRaisesMessage(CommandError, "SWFC_24-25.tsv"):
+                call_command(
+                    "load_seasons", directory, team=self.team.slug, workers=1
+                )
+        self.assertFalse(Season.objects.exists())
+
+
+class TestCopyLines(TestCase):
+    """Tests for encoding rows in PostgreSQL's COPY text format."""
+
+    def test_values_are_escaped(self):
+        """NULLs, booleans, dates and special characters are encoded."""
+        season = Season(pk=7)
+        result = ImportResult()
+        fields = {
+            "date": datetime.date(2024, 8, 11),
+            "opponent": "Back\\slash\tTab",
+            "is_home": True,
+            "competition": "Championship",
+            "round": "",
+            "goals": "Windass 82\nSmith 90+6",
+            "attendance": None,
+            "team_score": 4,
+            "opponent_score": 0,
+            "time": datetime.time(16, 0),
+        }
+        (line,) = iter_copy_lines(season, [(2, fields, ["w"])], result)
+        values, version, created_at, updated_at = line.rsplit("\t", 3)
+        self.assertEqual(
+            values,
+            "7\t2024-08-11\tBack\\\\slash\\tTab\tt\tChampionship\t\t"
+            "Windass 82\\nSmith 90+6\t\\N\t4\t0\t16:00:00",
+        )
+        # Each row gets a fresh match version and change stamps.
+        uuid.UUID(version)
+        self.assertEqual(f"{created_at}\n", updated_at)
+        datetime.datetime.fromisoformat(created_at)
+        self.assertEqual((result.created, result.warnings), (1, ["w"]))
@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from team.models import Match, Season, Team
+from team.pagination import InvalidCursor, paginate_keyset
+
+
+class KeysetTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        cls.team = Team.objects.create(
+            name="SWFC", country="England", contributor=cls.user
+        )
+        cls.season = Season.objects.create(
+            team=cls.team,
+            contributor=cls.user,
+            start_date=date(2024, 8, 1),
+            end_date=date(2025, 5, 31),
+            competition_list="League, FA Cup",
+        )
+        # Two matches a day, so pages must break date ties on id.
+        Match.objects.bulk_create(
+            Match(
+                season=cls.season,
+                date=date(2024, 8, 1) + timedelta(days=number // 2),
+                opponent=f"Opponent {number:02}",
+                competition="FA Cup" if number % 5 == 0 else "League",
+                is_home=number % 2 == 0,
+                team_score=number % 3,
+                opponent_score=1,
+            )
+            for number in range(23)
+        )
+        cls.matches = cls.season.match_set.all()
+
+
+class TestPaginateKeyset(KeysetTestCase):
+    def walk(self, ordering, page_size=5):
+        pages = []
+        cursor = None
+        while True:
+            page = paginate_keyset(self.matches, ordering, cursor, page_size)
+            pages.append(page)
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+
+    def test_forward_pages_cover_every_row_once(self):
+        """Following next cursors visits every match once, in order."""
+        pages = self.walk(("date", "id"))
+        ids = [match.id for page in pages for match in page.items]
+        expected = list(
+            self.matches.order_by("date", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+        self.assertEqual([len(page.items) for page in pages], [5] * 4 + [3])
+        self.assertFalse(pages[0].has_previous)
+
+    def test_previous_cursors_return_the_same_pages(self):
+        """Following previous cursors from the end revisits each page."""
+        pages = self.walk(("-date", "-id"))
+        page = pages[-1]
+        for expected in reversed(pages[:-1]):
+            page = paginate_keyset(
+                self.matches, ("-date", "-id"), page.previous_cursor, 5
+            )
+            self.assertEqual(page.items, expected.items)
+        self.assertFalse(page.has_previous)
+
+    def test_deep_page_is_one_limited_query(self):
+        """A deep page seeks to its position instead of using OFFSET."""
+        cursor = self.walk(("date", "id"), page_size=4)[-2].next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            paginate_keyset(self.matches, ("date", "id"), cursor, 4)
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]["sql"]
+        self.assertIn("LIMIT 5", sql)
+        self.assertNotIn("OFFSET", sql)
+
+    def test_invalid_cursor(self):
+        """A malformed cursor is rejected."""
+        for cursor in ("not-a-cursor", "WyJ4IiwgWzFdXQ"):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursor):
+                    paginate_keyset(self.matches, ("date", "id"), cursor)
+
+
+class TestSeasonDetailPagination(KeysetTestCase):
+    def setUp(self):
+        self.client.login(username="testuser", password="testpass")
+        self.url = self.season.get_absolute_url()
+
+    def test_short_season_fits_on_one_page(self):
+        """A season shorter than a page has no page links."""
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context["matches"]), 23)
+        self.assertFalse(response.context["next_query"])
+        self.assertFalse(response.context["previous_query"])
+
+    def test_filters(self):
+        """Competition, outcome and venue narrow the matches shown."""
+        cases = {
+            "competition=FA+Cup": self.matches.filter(competition="FA Cup"),
+            "outcome=W": self.matches.filter(team_score=2),
+            "outcome=D": self.matches.filter(team_score=1),
+            "venue=away": self.matches.filter(is_home=False),
+            "venue=home&outcome=L": self.matches.filter(
+                is_home=True, team_score=0
+            ),
+        }
+        for query, expected in cases.items():
+            with self.subTest(query=query):
+                response = self.client.get(f"{self.url}?{query}")
+                self.assertCountEqual(response.context["matches"], expected)
+
+    def test_sort_newest_first(self):
+        """Sorting by newest first reverses the date order."""
+        response = self.client.get(f"{self.url}?sort=-date")
+        dates = [match.date for match in response.context["matches"]]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_invalid_values_are_ignored(self):
+        """Unknown sort and filter values fall back to the full table."""
+        response = self.client.get(f"{self.url}?sort=attendance&venue=moon")
+        self.assertEqual(len(response.context["matches"]), 23)
+
+    def test_invalid_cursor_redirects_to_first_page(self):
+        """A bad cursor redirects to the first page, keeping filters."""
+        response = self.client.get(f"{self.url}?venue=home&cursor=junk")
+        self.assertRedirects(response, f"{self.url}?venue=home")
+
+    @patch("team.views.MATCHES_PER_PAGE", 10)
+    def test_next_and_previous_links(self):
+        """Page links carry the cursor and keep the other parameters."""
+        first = self.client.get(f"{self.url}?sort=-date")
+        second = self.client.get(f"{self.url}?{first.context['next_query']}")
+        self.assertIn("sort=-date", first.context["next_query"])
+        self.assertEqual(len(second.context["matches"]), 10)
+        self.assertTrue(second.context["previous_query"])
+        self.assertLessEqual(
+            second.context["matches"][0].date,
+            first.context["matches"][-1].date,
+        )
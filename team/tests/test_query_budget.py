@@ -0,0 +1,157 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from team.models import ImportJob, Match, Season, Team
+from team.query_budget import QueryBudgetExceeded, query_budget
+
+DATASET_SIZES = (1, 100, 10_000)
+
+# Maximum queries per GET of each view, including the session and user
+# lookups made by the login check, and for the season and match pages the
+# version stamp read for conditional GETs. None of them may grow with the
+# number of matches in the season.
+VIEW_BUDGETS = {
+    "choose_team": 3,
+    "create_season": 3,
+    "season_detail": 6,
+    "create_match": 3,
+    "edit_match": 3,
+    "bulk_edit_matches": 5,
+    "delete_match": 3,
+    "match_detail": 4,
+    "import_matches": 4,
+    "import_archive": 3,
+    "import_job_status": 3,
+    "export_season": 4,
+    "export_team": 5,
+    "api_team_list": 3,
+    "api_team": 3,
+    "api_season_list": 4,
+    "api_season": 4,
+    "api_match_list": 5,
+    "api_match": 4,
+    "api_changes": 6,
+}
+
+
+class TestQueryBudget(TestCase):
+    def test_within_budget(self):
+        """A block within its budget records its queries."""
+        with query_budget(1) as budget:
+            Team.objects.count()
+        self.assertEqual(len(budget), 1)
+        self.assertIn("COUNT", budget.queries[0]["sql"])
+
+    def test_over_budget_lists_queries(self):
+        """A block over its budget fails and lists the queries run."""
+        with self.assertRaisesMessage(
+            QueryBudgetExceeded, "2 queries run, budget is 1"
+        ):
+            with query_budget(1):
+                Team.objects.count()
+                Season.objects.count()
+
+    def test_decorator_counts_each_call(self):
+        """As a decorator, every call gets its own budget."""
+
+        @query_budget(1)
+        def count_teams():
+            return Team.objects.count()
+
+        count_teams()
+        count_teams()
+
+
+class TestViewQueryBudgets(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        cls.team = Team.objects.create(
+            name="SWFC", country="England", contributor=cls.user
+        )
+        cls.seasons = {}
+        for offset, size in enumerate(DATASET_SIZES):
+            year = 2000 + offset
+            season = Season.objects.create(
+                team=cls.team,
+                contributor=cls.user,
+                start_date=date(year, 8, 1),
+                end_date=date(year + 1, 5, 31),
+                competition_list="League, FA Cup",
+            )
+            Match.objects.bulk_create(
+                Match(
+                    season=season,
+                    date=date(year, 8, 1) + timedelta(days=number % 300),
+                    opponent=f"Opponent {number}",
+                    competition="League",
+                    is_home=number % 2 == 0,
+                    team_score=number % 4,
+                    opponent_score=number % 3,
+                    goals="Smith 45+2, 76",
+                )
+                for number in range(size)
+            )
+            cls.seasons[size] = season
+        cls.job = ImportJob.objects.create(
+            season=cls.seasons[1],
+            contributor=cls.user,
+        )
+
+    def setUp(self):
+        self.client.login(username="testuser", password="testpass")
+
+    def urls(self, season):
+        team_slug = self.team.slug
+        match_id = season.match_set.values_list("id", flat=True).first()
+        match_args = [team_slug, season.slug, match_id]
+        return {
+            "choose_team": reverse("choose_team"),
+            "create_season": reverse("create_season", args=[team_slug]),
+            "season_detail": season.get_absolute_url(),
+            "create_match": season.get_create_match_url(),
+            "edit_match": reverse("edit_match", args=match_args),
+            "bulk_edit_matches": reverse(
+                "bulk_edit_matches", args=[team_slug, season.slug]
+            ),
+            "delete_match": reverse("delete_match", args=match_args),
+            "match_detail": reverse("match_detail", args=match_args),
+            "import_matches": reverse(
+                "import_matches", args=[team_slug, season.slug]
+            ),
+            "import_archive": reverse("import_archive", args=[team_slug]),
+            "import_job_status": reverse(
+                "import_job_status",
+                args=[team_slug, self.job.season.slug, self.job.id],
+            ),
+            "export_season": reverse(
+                "export_season", args=[team_slug, season.slug]
+            ),
+            "export_team": reverse("export_team", args=[team_slug]),
+            "api_team_list": reverse("api_team_list"),
+            "api_team": reverse("api_team", args=[team_slug]),
+            "api_season_list": reverse("api_season_list", args=[team_slug]),
+            "api_season": reverse("api_season", args=[team_slug, season.slug]),
+            "api_match_list": reverse(
+                "api_match_list", args=[team_slug, season.slug]
+            ),
+            "api_match": reverse("api_match", args=match_args),
+            "api_changes": reverse("api_changes"),
+        }
+
+    def test_views_stay_within_budget(self):
+        """Every team view stays within its budget at each dataset size."""
+        for size in DATASET_SIZES:
+            urls = self.urls(self.seasons[size])
+            for name, budget in VIEW_BUDGETS.items():
+                with self.subTest(view=name, matches=size):
+                    with query_budget(budget):
+                        response = self.client.get(urls[name])
+                        if response.streaming:
+                            b"".join(response.streaming_content)
+                    self.assertLess(response.status_code, 400)
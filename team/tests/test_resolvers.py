@@ -0,0 +1,108 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.http import Http404
+from django.test import TestCase
+from django.urls import reverse
+
+from team.models import Match, Season, Team
+from team.resolvers import resolve_objects
+
+
+class TestResolveObjects(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        self.team = Team.objects.create(
+            name="SWFC", country="England", contributor=self.user
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(2024, 8, 1),
+            end_date=date(2025, 5, 31),
+        )
+        self.other_season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(2023, 8, 1),
+            end_date=date(2024, 5, 31),
+        )
+        self.match = Match.objects.create(
+            season=self.season, date=date(2024, 8, 10), opponent="Leeds"
+        )
+
+    def test_match_route_resolves_in_one_query(self):
+        """A match, its season and team come from a single query."""
+        with self.assertNumQueries(1):
+            objects = resolve_objects(
+                self.user, self.team.slug, self.season.slug, self.match.id
+            )
+            self.assertEqual(objects["match"], self.match)
+            self.assertEqual(objects["season"], self.season)
+            self.assertEqual(objects["team"].name, "SWFC")
+            self.assertIs(objects["match"].season, objects["season"])
+
+    def test_season_route_resolves_in_one_query(self):
+        """A season and its team come from a single query."""
+        with self.assertNumQueries(1):
+            objects = resolve_objects(
+                self.user, self.team.slug, self.season.slug
+            )
+            self.assertEqual(objects["season"].team.slug, self.team.slug)
+        self.assertNotIn("match", objects)
+
+    def test_team_route(self):
+        """A team route resolves only the team."""
+        objects = resolve_objects(self.user, self.team.slug)
+        self.assertEqual(objects, {"team": self.team})
+
+    def test_match_must_belong_to_season(self):
+        """A match under another season's slug is not found."""
+        with self.assertRaises(Http404):
+            resolve_objects(
+                self.user,
+                self.team.slug,
+                self.other_season.slug,
+                self.match.id,
+            )
+
+    def test_team_must_belong_to_user(self):
+        """Another user's team, season or match is not found."""
+        other_user = User.objects.create_user(username="other")
+        for args in (
+            (self.team.slug,),
+            (self.team.slug, self.season.slug),
+            (self.team.slug, self.season.slug, self.match.id),
+        ):
+            with self.subTest(args=args):
+                with self.assertRaises(Http404):
+                    resolve_objects(other_user, *args)
+
+
+class TestResolveRoute(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(username="owner")
+        team = Team.objects.create(
+            name="SWFC", country="England", contributor=owner
+        )
+        season = Season.objects.create(
+            team=team,
+            contributor=owner,
+            start_date=date(2024, 8, 1),
+            end_date=date(2025, 5, 31),
+        )
+        match = Match.objects.create(
+            season=season, date=date(2024, 8, 10), opponent="Leeds"
+        )
+        self.url = reverse(
+            "match_detail", args=[team.slug, season.slug, match.id]
+        )
+        User.objects.create_user(username="visitor", password="testpass")
+        self.client.login(username="visitor", password="testpass")
+
+    def test_other_users_match_is_not_found(self):
+        """Match pages are only shown to the team's contributor."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,80 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from team.models import Match, Season, Team
+from team.stats import Record, season_stats, stats_by_season
+
+
+class TestSeasonStats(TestCase):
+    """Tests for database-side season statistics."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="u", password="p")
+        self.team = Team.objects.create(
+            name="Sheffield Wednesday",
+            country="England",
+            city="Sheffield",
+            contributor=self.user,
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=datetime.date(2024, 7, 1),
+            end_date=datetime.date(2025, 6, 30),
+        )
+        results = [
+            ("Championship", True, 2, 0),
+            ("Championship", False, 1, 1),
+            ("Championship", False, 0, 3),
+            ("FA Cup", True, 4, 1),
+            ("FA Cup", False, None, None),
+        ]
+        for day, (competition, is_home, scored, conceded) in enumerate(
+            results, 1
+        ):
+            Match.objects.create(
+                season=self.season,
+                date=datetime.date(2024, 8, day),
+                opponent=f"Opponent {day}",
+                competition=competition,
+                is_home=is_home,
+                team_score=scored,
+                opponent_score=conceded,
+            )
+
+    def test_overall_record_and_points(self):
+        """Only matches with both scores count; a win is worth three."""
+        stats = season_stats(self.season)
+        self.assertEqual(stats.overall, Record(4, 2, 1, 1, 7, 5))
+        self.assertEqual(stats.overall.points, 7)
+        self.assertEqual(stats.overall.goal_difference, 2)
+
+    def test_home_away_and_competition_splits(self):
+        """Splits by venue and competition add up to the overall record."""
+        stats = season_stats(self.season)
+        self.assertEqual(stats.home, Record(2, 2, 0, 0, 6, 1))
+        self.assertEqual(stats.away, Record(2, 0, 1, 1, 1, 4))
+        self.assertEqual(list(stats.competitions), ["Championship", "FA Cup"])
+        self.assertEqual(
+            stats.competitions["FA Cup"], Record(1, 1, 0, 0, 4, 1)
+        )
+
+    def test_one_query_per_season(self):
+        """A season's stats, however many matches, take a single query."""
+        with self.assertNumQueries(1):
+            season_stats(self.season)
+
+    def test_stats_for_many_seasons_in_one_query(self):
+        """Several seasons are aggregated together, empty ones included."""
+        empty = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=datetime.date(2023, 7, 1),
+            end_date=datetime.date(2024, 6, 30),
+        )
+        with self.assertNumQueries(1):
+            stats = stats_by_season([self.season, empty])
+        self.assertEqual(stats[self.season.pk], season_stats(self.season))
+        self.assertEqual(stats[empty.pk].overall, Record())
@@ -0,0 +1,153 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from team.importer import UPSERT, import_matches
+from team.models import Match, Season, SeasonSummary, Team
+from team.stats import Record
+from team.summaries import check_summaries
+
+
+class TestSeasonSummary(TestCase):
+    """Tests for the incrementally maintained season totals."""
+
+    HEADER = "date\topponent\tteam_score\topponent_score\n"
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="u", password="p")
+        self.team = Team.objects.create(
+            name="Sheffield Wednesday",
+            country="England",
+            city="Sheffield",
+            contributor=self.user,
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=datetime.date(2024, 7, 1),
+            end_date=datetime.date(2025, 6, 30),
+        )
+
+    def summary(self, season=None):
+        return SeasonSummary.objects.get(season=season or self.season).record
+
+    def add_match(self, day, team_score, opponent_score):
+        return Match.objects.create(
+            season=self.season,
+            date=datetime.date(2024, 8, day),
+            opponent=f"Opponent {day}",
+            team_score=team_score,
+            opponent_score=opponent_score,
+        )
+
+    def test_new_season_starts_empty(self):
+        """Creating a season creates an empty summary."""
+        self.assertEqual(self.summary(), Record())
+
+    def test_save_edit_and_delete_apply_deltas(self):
+        """Saving, editing and deleting matches adjust the totals."""
+        win = self.add_match(1, 2, 0)
+        self.add_match(2, None, None)
+        self.assertEqual(self.summary(), Record(1, 1, 0, 0, 2, 0))
+
+        win = Match.objects.get(pk=win.pk)
+        win.opponent_score = 2
+        win.save()
+        self.assertEqual(self.summary(), Record(1, 0, 1, 0, 2, 2))
+
+        win.delete()
+        self.assertEqual(self.summary(), Record())
+        self.assertEqual(check_summaries(), [])
+
+    def test_deleting_season_removes_summary(self):
+        """A season deleted with its matches takes its summary with it."""
+        self.add_match(1, 2, 0)
+        self.season.delete()
+        self.assertFalse(SeasonSummary.objects.exists())
+
+    def count_delete_queries(self, parent, matches):
+        team = Team.objects.create(
+            name=f"{parent} {matches}",
+            country="England",
+            city="Sheffield",
+            contributor=self.user,
+        )
+        season = Season.objects.create(
+            team=team,
+            contributor=self.user,
+            start_date=datetime.date(2024, 7, 1),
+            end_date=datetime.date(2025, 6, 30),
+        )
+        for day in range(1, matches + 1):
+            Match.objects.create(
+                season=season,
+                date=datetime.date(2024, 8, day),
+                opponent=f"Opponent {day}",
+                team_score=1,
+                opponent_score=0,
+            )
+        with CaptureQueriesContext(connection) as queries:
+            (team if parent == "team" else season).delete()
+        return len(queries)
+
+    def test_cascaded_match_deletes_skip_the_summary(self):
+        """Deleting a season or team costs the same for 1 or 20 matches."""
+        for parent in ("season", "team"):
+            with self.subTest(parent=parent):
+                self.assertEqual(
+                    self.count_delete_queries(parent, 20),
+                    self.count_delete_queries(parent, 1),
+                )
+
+    def test_edit_applies_a_single_update(self):
+        """An edited match updates the summary without re-aggregating."""
+        match = Match.objects.get(pk=self.add_match(1, 2, 0).pk)
+        match.team_score = 3
+        with self.assertNumQueries(4):
+            # UPDATE match, goal event sync (DELETE), UPDATE season version,
+            # UPDATE summary
+            match.save()
+        self.assertEqual(self.summary().goals_for, 3)
+
+    def test_import_applies_one_delta(self):
+        """Bulk imports, including upserts, keep the totals correct."""
+        import_matches(
+            self.season,
+            [
+                self.HEADER,
+                "2024-08-01\tHull City\t1\t0\n",
+                "2024-08-08\tLeeds United\t0\t2\n",
+            ],
+        )
+        self.assertEqual(self.summary(), Record(2, 1, 0, 1, 1, 2))
+        import_matches(
+            self.season,
+            [
+                self.HEADER,
+                "2024-08-08\tLeeds United\t2\t2\n",
+                "2024-08-15\tMillwall\t\t\n",
+            ],
+            mode=UPSERT,
+        )
+        self.assertEqual(self.summary(), Record(2, 1, 1, 0, 3, 2))
+        self.assertEqual(check_summaries(), [])
+
+    def test_check_and_rebuild_command(self):
+        """--check reports drift and a rebuild repairs it."""
+        self.add_match(1, 3, 1)
+        SeasonSummary.objects.update(won=5)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_summaries", "--check", stdout=StringIO())
+        self.assertEqual(len(check_summaries()), 1)
+
+        call_command("rebuild_summaries", stdout=StringIO())
+        self.assertEqual(self.summary(), Record(1, 1, 0, 0, 3, 1))
+        out = StringIO()
+        call_command("rebuild_summaries", "--check", stdout=out)
+        self.assertIn("up to date", out.getvalue())
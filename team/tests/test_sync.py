@@ -0,0 +1,225 @@
+import json
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from team.bulk import write_matches
+from team.importer import UPSERT, import_matches
+from team.models import Match, Season, Team, Tombstone
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class TestChangesApi(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass"
+        )
+        self.client.force_login(self.user)
+        self.team = Team.objects.create(
+            name="SWFC", country="England", contributor=self.user
+        )
+        self.season = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(2024, 8, 1),
+            end_date=date(2025, 5, 31),
+        )
+        self.matches = [
+            Match.objects.create(
+                season=self.season,
+                date=date(2024, 8, 10) + timedelta(days=7 * number),
+                opponent=f"Opponent {number}",
+                team_score=1,
+                opponent_score=0,
+            )
+            for number in range(3)
+        ]
+        self.url = reverse("api_changes")
+
+    def sync(self, cursor=None, **params):
+        if cursor:
+            params["since"] = cursor
+        response = self.client.get(self.url, params)
+        return response, json.loads(response.content)
+
+    def changed(self, data):
+        return {
+            name: [row["id"] for row in data[name]]
+            for name in ("teams", "seasons", "matches")
+        }
+
+    def test_first_sync_returns_everything(self):
+        """Without a cursor every row is returned, then nothing is."""
+        response, data = self.sync()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.changed(data),
+            {
+                "teams": [self.team.pk],
+                "seasons": [self.season.pk],
+                "matches": [m.pk for m in self.matches],
+            },
+        )
+        self.assertEqual(data["seasons"][0]["team"], self.team.pk)
+        self.assertEqual(data["matches"][0]["season"], self.season.pk)
+        self.assertFalse(data["more"])
+        _, data = self.sync(data["cursor"])
+        self.assertEqual(
+            self.changed(data), {"teams": [], "seasons": [], "matches": []}
+        )
+
+    def test_changed_match_and_its_season(self):
+        """Saving a match sends it and its season, whose record changed."""
+        _, data = self.sync()
+        self.matches[1].team_score = 0
+        self.matches[1].save()
+        _, data = self.sync(data["cursor"])
+        self.assertEqual(
+            self.changed(data),
+            {
+                "teams": [],
+                "seasons": [self.season.pk],
+                "matches": [self.matches[1].pk],
+            },
+        )
+        self.assertEqual(data["seasons"][0]["drawn"], 1)
+
+    def test_deleted_rows_leave_tombstones(self):
+        """A deleted season gets one tombstone, not one per match."""
+        _, data = self.sync()
+        match_pk = self.matches[0].pk
+        self.matches[0].delete()
+        other = Season.objects.create(
+            team=self.team,
+            contributor=self.user,
+            start_date=date(2023, 8, 1),
+            end_date=date(2024, 5, 31),
+        )
+        Match.objects.create(
+            season=other, date=date(2023, 9, 1), opponent="Leeds United"
+        )
+        other_pk = other.pk
+        other.delete()
+        _, data = self.sync(data["cursor"])
+        self.assertEqual(
+            [(row["type"], row["id"]) for row in data["deleted"]],
+            [("match", match_pk), ("season", other_pk)],
+        )
+
+    def test_bulk_writes_are_tracked(self):
+        """Batch updates are stamped and batch deletes leave tombstones."""
+        _, data = self.sync()
+        first, second, third = self.matches
+        first.round = "R1"
+        write_matches(
+            self.season, changed=[(first, ["round"])], deleted=[second]
+        )
+        _, data = self.sync(data["cursor"])
+        self.assertEqual(self.changed(data)["matches"], [first.pk])
+        self.assertEqual(
+            [(row["type"], row["id"]) for row in data["deleted"]],
+            [("match", second.pk)],
+        )
+
+    def test_upsert_import_is_tracked(self):
+        """Matches changed by an upsert import are sent."""
+        _, data = self.sync()
+        import_matches(
+            self.season,
+            [
+                "date\topponent\tteam_score\topponent_score",
+                "2024-08-17\tOpponent 1\t5\t0",
+            ],
+            mode=UPSERT,
+        )
+        _, data = self.sync(data["cursor"])
+        self.assertEqual(self.changed(data)["matches"], [self.matches[1].pk])
+
+    def test_pages_follow_the_cursor(self):
+        """With a small limit, following ``more`` reads every row once."""
+        seen = []
+        cursor = None
+        while True:
+            _, data = self.sync(cursor, limit=1)
+            seen += self.changed(data)["matches"]
+            cursor = data["cursor"]
+            if not data["more"]:
+                break
+        self.assertEqual(seen, [m.pk for m in self.matches])
+
+    def test_other_users_changes_are_hidden(self):
+        """Only the user's own rows and tombstones are sent."""
+        Tombstone.objects.create(
+            contributor=self.user, kind="team", object_id=9
+        )
+        self.client.force_login(User.objects.create_user(username="other"))
+        _, data = self.sync()
+        self.assertEqual(
+            self.changed(data), {"teams": [], "seasons": [], "matches": []}
+        )
+        self.assertEqual(data["deleted"], [])
+
+    def test_queries_do_not_grow_with_changes(self):
+        """A sync reads each stream with one query."""
+        _, data = self.sync()
+        for match in self.matches:
+            match.save()
+        with self.assertNumQueries(6):
+            _, data = self.sync(data["cursor"])
+        self.assertEqual(len(data["matches"]), 3)
+
+    def test_bad_cursor(self):
+        """A malformed cursor is a 400."""
+        response, _ = self.sync("nonsense")
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(SYNC_TOMBSTONE_DAYS=0)
+    def test_expired_cursor(self):
+        """A cursor older than the kept tombstones must resync: 410."""
+        _, data = self.sync()
+        response, _ = self.sync(data["cursor"])
+        self.assertEqual(response.status_code, 410)
+
+    def test_anonymous_user_gets_401(self):
+        """Logged-out requests are refused with JSON."""
+        self.client.logout()
+        response, _ = self.sync()
+        self.assertEqual(response.status_code, 401)
+
+
+class TestSettling(TestCase):
+    def test_recent_changes_are_sent_again(self):
+        """Changes within the settle time are repeated on the next sync."""
+        user = User.objects.create_user(username="testuser")
+        team = Team.objects.create(
+            name="SWFC", country="England", contributor=user
+        )
+        self.client.force_login(user)
+        url = reverse("api_changes")
+        data = json.loads(self.client.get(url).content)
+        data = json.loads(
+            self.client.get(url, {"since": data["cursor"]}).content
+        )
+        self.assertEqual([row["id"] for row in data["teams"]], [team.pk])
+
+
+class TestPruneTombstones(TestCase):
+    def test_removes_old_tombstones(self):
+        """Tombstones older than the retention period are deleted."""
+        user = User.objects.create_user(username="testuser")
+        old = timezone.now() - timedelta(days=100)
+        Tombstone.objects.create(
+            contributor=user, kind="match", object_id=1, deleted_at=old
+        )
+        recent = Tombstone.objects.create(
+            contributor=user, kind="match", object_id=2
+        )
+        out = StringIO()
+        call_command("prune_tombstones", days=90, stdout=out)
+        self.assertEqual(list(Tombstone.objects.all()), [recent])
+        self.assertIn("Deleted 1 tombstone(s)", out.getvalue())
@@ -180,6 +180,21 @@ class TestSeasonDetailView(TestCase):
             content.index("Millwall") < content.index("Sunderland")
         )
 
+    def test_season_stats_are_shown(self):
+        """The season's record is aggregated and shown above the matches."""
+        Match.objects.create(
+            season=self.season,
+            date=date(2024, 8, 10),
+            opponent="Millwall",
+            competition="Championship",
+            team_score=2,
+            opponent_score=0,
+        )
+        response = self.client.get(self.url)
+        stats = response.context["stats"]
+        self.assertEqual((stats.overall.played, stats.overall.points), (1, 3))
+        self.assertContains(response, "Pts")
+
 
 class TestCreateMatchView(TestCase):
     def setUp(self):
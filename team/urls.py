@@ -5,13 +5,28 @@ from .views import (
     season_detail_view,
     create_match_view,
     edit_match_view,
+    bulk_edit_matches_view,
     delete_match_view,
     import_matches_view,
+    import_archive_view,
+    import_job_status_view,
+    export_season_view,
+    export_team_view,
     match_detail_view,
 )
 
 urlpatterns = [
     path("choose-team/", choose_team_view, name="choose_team"),
+    path(
+        "<slug:team_slug>/import/",
+        import_archive_view,
+        name="import_archive",
+    ),
+    path(
+        "<slug:team_slug>/export/",
+        export_team_view,
+        name="export_team",
+    ),
     path(
         "<slug:team_slug>/season/create/",
         create_season_view,
@@ -27,6 +42,21 @@ urlpatterns = [
         import_matches_view,
         name="import_matches",
     ),
+    path(
+        "<slug:team_slug>/season/<slug:season_slug>/import/jobs/<int:job_id>/",
+        import_job_status_view,
+        name="import_job_status",
+    ),
+    path(
+        "<slug:team_slug>/season/<slug:season_slug>/export/",
+        export_season_view,
+        name="export_season",
+    ),
+    path(
+        "<slug:team_slug>/season/<slug:season_slug>/match/edit/",
+        bulk_edit_matches_view,
+        name="bulk_edit_matches",
+    ),
     path(
         "<slug:team_slug>/season/<slug:season_slug>/match/create/",
         create_match_view,
@@ -1,10 +1,42 @@
-import csv
-from datetime import date, time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from .models import Team, Season, Match
-from .forms import TeamSelectionForm, SeasonForm, MatchForm, MatchImportForm
+from django.db import IntegrityError
+from seasonwatch.decorators import login_required
+
+from .models import Team, ImportJob
+from .forms import (
+    TeamSelectionForm,
+    SeasonForm,
+    MatchForm,
+    MatchImportForm,
+    ArchiveImportForm,
+    MatchFilterForm,
+    MatchBulkFormSet,
+)
+from .archive import import_archive
+from .bulk import update_matches
+from .exporter import (
+    EXPORT_FORMATS,
+    iter_season_export,
+    iter_team_export,
+    season_file_name,
+)
+from .importer import (
+    IMPORT_MODES,
+    INSERT,
+    import_matches,
+    iter_issues,
+    iter_report_tsv,
+    iter_text_lines,
+    validate_tsv,
+)
+from .jobs import enqueue_import
+from .pagination import InvalidCursor, apaginate_keyset, paginate_keyset
+from .resolvers import resolve_route, season_condition
+from .stats import cached_season_stats
 
 
 @login_required
@@ -38,7 +70,8 @@ def choose_team_view(request):
 
 
 @login_required
-def create_season_view(request, team_slug):
+@resolve_route
+def create_season_view(request, team):
     """
     Allows a contributor to create a new :model:`team.Season` for their selected :model:`team.Team`.
 
@@ -54,8 +87,6 @@ def create_season_view(request, team_slug):
 
     :template:`team/season_form.html`
     """
-    team = get_object_or_404(Team, slug=team_slug, contributor=request.user)
-
     if request.method == "POST":
         form = SeasonForm(request.POST)
         if form.is_valid():
@@ -75,42 +106,98 @@ def create_season_view(request, team_slug):
     )
 
 
+MATCHES_PER_PAGE = 50
+# Enough for a full season on one page while staying within Django's
+# DATA_UPLOAD_MAX_NUMBER_FIELDS (11 fields per match).
+BULK_EDIT_PER_PAGE = 80
+
+
+def _query_with(query, **params):
+    query = query.copy()
+    for name, value in params.items():
+        query.pop(name, None)
+        if value is not None:
+            query[name] = value
+    return query.urlencode()
+
+
 @login_required
-def season_detail_view(request, team_slug, season_slug):
+@season_condition
+@resolve_route
+async def season_detail_view(request, team, season):
     """
     Displays all :model:`team.Match` instances for a given :model:`team.Season`.
 
+    Conditional GETs are answered with 304 while the season is unchanged.
+
     **Context**
 
     ``season``
         An instance of :model:`team.Season`.
 
     ``matches``
-        A queryset of :model:`team.Match` objects ordered by date.
+        One page of :model:`team.Match` objects, sorted and filtered by
+        ``filter_form`` and paginated with a keyset cursor taken from
+        ``?cursor=``.
+
+    ``page``
+        The :class:`team.pagination.KeysetPage` holding ``matches``.
+
+    ``filter_form``
+        A :form:`team.MatchFilterForm` bound to the query string.
+
+    ``next_query`` / ``previous_query``
+        Query strings for the neighbouring pages, or ``False`` at either end.
+
+    ``row_cache_timeout``
+        Seconds each rendered match row is cached for; rows are keyed on
+        the match version (see :mod:`team.fragments`).
+
+    ``stats``
+        The season's record with home, away and competition splits,
+        aggregated in the database by :func:`team.stats.season_stats` and
+        cached against the season's version stamp.
 
     **Template:**
 
     :template:`team/season_detail.html`
     """
-    season = get_object_or_404(
-        Season,
-        slug=season_slug,
-        team__slug=team_slug,
-        contributor=request.user,
-    )
-    matches = season.match_set.order_by("date")
-    return render(
+    filter_form = MatchFilterForm(request.GET, season=season)
+    try:
+        page = await apaginate_keyset(
+            filter_form.filter(season.match_set.all()),
+            filter_form.ordering,
+            cursor=request.GET.get("cursor"),
+            page_size=MATCHES_PER_PAGE,
+        )
+    except InvalidCursor:
+        return redirect(
+            f"{request.path}?{_query_with(request.GET, cursor=None)}"
+        )
+    stats = await sync_to_async(cached_season_stats)(season)
+    # Rendering reads cached row fragments, which is blocking I/O with a
+    # file or Redis cache, so it runs in a thread.
+    return await sync_to_async(render)(
         request,
         "team/season_detail.html",
         {
             "season": season,
-            "matches": matches,
+            "matches": page.items,
+            "page": page,
+            "filter_form": filter_form,
+            "next_query": page.has_next
+            and _query_with(request.GET, cursor=page.next_cursor),
+            "previous_query": page.has_previous
+            and _query_with(request.GET, cursor=page.previous_cursor),
+            "stats": stats,
+            "row_cache_timeout": settings.MATCH_ROW_CACHE_TIMEOUT,
         },
     )
 
 
 @login_required
-def create_match_view(request, team_slug, season_slug):
+@resolve_route
+def create_match_view(request, team, season):
     """
     Allows a contributor to create a new :model:`team.Match` within a given :model:`team.Season`.
 
@@ -126,11 +213,6 @@ def create_match_view(request, team_slug, season_slug):
 
     :template:`team/match_form.html`
     """
-    team = get_object_or_404(Team, slug=team_slug, contributor=request.user)
-    season = get_object_or_404(
-        Season, slug=season_slug, team=team, contributor=request.user
-    )
-
     if request.method == "POST":
         form = MatchForm(request.POST, season=season)
         if form.is_valid():
@@ -155,7 +237,8 @@ def create_match_view(request, team_slug, season_slug):
 
 
 @login_required
-def edit_match_view(request, team_slug, season_slug, match_id):
+@resolve_route
+def edit_match_view(request, team, season, match):
     """
     Allows a contributor to edit an existing :model:`team.Match`.
 
@@ -174,10 +257,6 @@ def edit_match_view(request, team_slug, season_slug, match_id):
 
     :template:`team/match_form.html`
     """
-    team = get_object_or_404(Team, slug=team_slug, contributor=request.user)
-    season = get_object_or_404(Season, slug=season_slug, team=team)
-    match = get_object_or_404(Match, id=match_id, season=season)
-
     if request.method == "POST":
         form = MatchForm(request.POST, instance=match, season=season)
         if form.is_valid():
@@ -201,7 +280,79 @@ def edit_match_view(request, team_slug, season_slug, match_id):
 
 
 @login_required
-def delete_match_view(request, team_slug, season_slug, match_id):
+@resolve_route
+def bulk_edit_matches_view(request, team, season):
+    """
+    Edits every :model:`team.Match` of a :model:`team.Season` in one table.
+
+    Matches are shown oldest first, :data:`BULK_EDIT_PER_PAGE` to a page.
+    On POST only the rows that changed are written, with
+    :func:`team.bulk.update_matches` in one transaction.
+
+    **Context**
+
+    ``season``
+        The :model:`team.Season` being edited.
+
+    ``formset``
+        A :form:`team.MatchBulkFormSet` of the page's matches.
+
+    ``next_query`` / ``previous_query``
+        Query strings for the neighbouring pages, or ``False`` at either end.
+
+    **Template:**
+
+    :template:`team/match_bulk_form.html`
+    """
+    try:
+        page = paginate_keyset(
+            season.match_set.all(),
+            ("date", "id"),
+            cursor=request.GET.get("cursor"),
+            page_size=BULK_EDIT_PER_PAGE,
+        )
+    except InvalidCursor:
+        return redirect(request.path)
+    formset = MatchBulkFormSet(
+        request.POST or None,
+        queryset=season.match_set.filter(
+            pk__in=[match.pk for match in page.items]
+        ).order_by("date", "id"),
+        form_kwargs={"season": season},
+    )
+    if request.method == "POST" and formset.is_valid():
+        formset.save(commit=False)
+        try:
+            updated = update_matches(season, formset.changed_objects)
+        except IntegrityError:
+            formset.non_form_errors().append(
+                "Another match in this season already has that date and "
+                "opponent."
+            )
+        else:
+            messages.success(
+                request,
+                f"{updated} match{'es' if updated != 1 else ''} updated.",
+            )
+            return redirect(request.get_full_path())
+
+    return render(
+        request,
+        "team/match_bulk_form.html",
+        {
+            "season": season,
+            "formset": formset,
+            "next_query": page.has_next
+            and _query_with(request.GET, cursor=page.next_cursor),
+            "previous_query": page.has_previous
+            and _query_with(request.GET, cursor=page.previous_cursor),
+        },
+    )
+
+
+@login_required
+@resolve_route
+def delete_match_view(request, team, season, match):
     """
     Confirms and deletes a specific :model:`team.Match` instance.
 
@@ -217,10 +368,6 @@ def delete_match_view(request, team_slug, season_slug, match_id):
 
     :template:`team/match_confirm_delete.html`
     """
-    team = get_object_or_404(Team, slug=team_slug, contributor=request.user)
-    season = get_object_or_404(Season, slug=season_slug, team=team)
-    match = get_object_or_404(Match, id=match_id, season=season)
-
     if request.method == "POST":
         match.delete()
         messages.success(request, "Match deleted successfully.")
@@ -238,14 +385,23 @@ def delete_match_view(request, team_slug, season_slug, match_id):
     )
 
 
-REQUIRED_FIELDS = {"date", "opponent"}
+VALIDATION_ISSUES_SHOWN = 500
 
 
 @login_required
-def import_matches_view(request, team_slug, season_slug):
+@resolve_route
+def import_matches_view(request, team, season):
     """
     Imports multiple :model:`team.Match` records from a TSV file upload.
 
+    Files larger than ``settings.MATCH_IMPORT_BACKGROUND_THRESHOLD`` bytes
+    are queued as an :model:`team.ImportJob` for the background worker;
+    smaller files are imported immediately.
+
+    Submitting with ``action=validate`` checks the whole file without
+    writing anything and renders :template:`team/import_report.html`;
+    ``action=report`` streams the same checks back as a TSV download.
+
     **Context**
 
     ``season``
@@ -254,116 +410,71 @@ def import_matches_view(request, team_slug, season_slug):
     ``form``
         An instance of :form:`team.MatchImportForm`.
 
+    ``jobs``
+        The most recent :model:`team.ImportJob` instances for the season.
+
     **Template:**
 
     :template:`team/import_matches.html`
     """
-    team = get_object_or_404(Team, slug=team_slug, contributor=request.user)
-    season = get_object_or_404(Season, slug=season_slug, team=team)
-
     if request.method == "POST" and request.FILES.get("tsv_file"):
         file = request.FILES["tsv_file"]
-        try:
-            decoded_file = file.read().decode("utf-8").splitlines()
-            reader = csv.DictReader(decoded_file, delimiter="\t")
-
-            if not reader.fieldnames:
-                messages.error(
-                    request,
-                    "The uploaded file is empty or missing a header row.",
-                )
+        action = request.POST.get("action")
+        if action == "validate":
+            try:
+                report = validate_tsv(iter_text_lines(file))
+            except Exception as e:
+                messages.error(request, f"Validation failed: {e}")
                 return redirect(
-                    "season_detail",
+                    "import_matches",
                     team_slug=team.slug,
                     season_slug=season.slug,
                 )
+            return render(
+                request,
+                "team/import_report.html",
+                {
+                    "season": season,
+                    "file_name": file.name,
+                    "report": report,
+                    "issues": report.issues[:VALIDATION_ISSUES_SHOWN],
+                },
+            )
+        if action == "report":
+            response = StreamingHttpResponse(
+                iter_report_tsv(iter_issues(iter_text_lines(file))),
+                content_type="text/tab-separated-values; charset=utf-8",
+            )
+            response["Content-Disposition"] = (
+                f'attachment; filename="{season.slug}-validation.tsv"'
+            )
+            return response
 
-            missing = REQUIRED_FIELDS - set(reader.fieldnames)
-            if missing:
-                messages.error(
-                    request, f"Missing required fields: {', '.join(missing)}"
-                )
-                return redirect(
-                    "season_detail",
-                    team_slug=team.slug,
-                    season_slug=season.slug,
-                )
-
-            created_count = 0
-            for row in reader:
-                # Required
-                match_date = date.fromisoformat(row["date"])
-                opponent = row["opponent"]
-
-                # Optional fields
-                is_home = row.get("is_home", "TRUE").strip().lower() == "true"
-                competition = row.get("competition", "").strip()
-                match_round = row.get("round", "").strip()
-                goals = row.get("goals", "").strip()
-
-                team_score = row.get("team_score")
-                opponent_score = row.get("opponent_score")
-                team_score = (
-                    int(team_score)
-                    if team_score and team_score.isdigit()
-                    else None
-                )
-                opponent_score = (
-                    int(opponent_score)
-                    if opponent_score and opponent_score.isdigit()
-                    else None
-                )
-
-                attendance = row.get("attendance")
-                attendance = (
-                    int(attendance)
-                    if attendance and attendance.isdigit()
-                    else None
-                )
-
-                match_time = row.get("time")
-                try:
-                    match_time = (
-                        time.fromisoformat(match_time.strip())
-                        if match_time
-                        else None
-                    )
-                except ValueError:
-                    match_time = None
-
-                home_field = row.get("is_home", "").strip().lower()
-                valid_home_values = {"home", "h", "true", "yes", "1"}
-                valid_away_values = {"away", "a", "false", "no", "0"}
-
-                if home_field in valid_home_values:
-                    is_home = True
-                elif home_field in valid_away_values:
-                    is_home = False
-                else:
-                    is_home = False
-                    messages.warning(
-                        request,
-                        f"Row {reader.line_num}: Unrecognized value '{home_field}' for is_home. Defaulting to away.",
-                    )
-
-                Match.objects.create(
-                    season=season,
-                    date=match_date,
-                    opponent=opponent,
-                    is_home=is_home,
-                    competition=competition,
-                    round=match_round,
-                    goals=goals,
-                    attendance=attendance,
-                    team_score=team_score,
-                    opponent_score=opponent_score,
-                    time=match_time,
-                )
-                created_count += 1
+        mode = request.POST.get("mode") or INSERT
+        if mode not in dict(IMPORT_MODES):
+            messages.error(request, f"Import failed: unknown mode '{mode}'.")
+            return redirect(
+                "import_matches", team_slug=team.slug, season_slug=season.slug
+            )
+        if file.size > settings.MATCH_IMPORT_BACKGROUND_THRESHOLD:
+            job = enqueue_import(season, file, request.user, mode=mode)
+            messages.info(
+                request,
+                f"Import #{job.pk} queued. Its progress is shown below.",
+            )
+            return redirect(
+                "import_matches", team_slug=team.slug, season_slug=season.slug
+            )
 
+        try:
+            result = import_matches(season, iter_text_lines(file), mode=mode)
+            for warning in result.warnings:
+                messages.warning(request, warning)
             messages.success(
                 request,
-                f"{created_count} match record(s) imported successfully.",
+                f"{result.created} match record(s) imported successfully, "
+                f"{result.updated} updated and {result.unchanged} unchanged "
+                f"({result.rows_per_second:,.0f} rows/s).",
             )
         except Exception as e:
             messages.error(request, f"Import failed: {e}")
@@ -378,15 +489,146 @@ def import_matches_view(request, team_slug, season_slug):
         {
             "season": season,
             "form": MatchImportForm(),
+            "jobs": season.import_jobs.order_by("-created_at")[:10],
         },
     )
 
 
 @login_required
-def match_detail_view(request, team_slug, season_slug, match_id):
+@resolve_route
+def import_archive_view(request, team):
+    """
+    Imports a zip archive of season TSV files into a :model:`team.Team`.
+
+    Each file's :model:`team.Season` is inferred from its name or match
+    dates and created if missing; all seasons are imported in a single
+    transaction.
+
+    **Context**
+
+    ``team``
+        The contributor's :model:`team.Team` receiving the seasons.
+
+    ``form``
+        A bound or unbound instance of :form:`team.ArchiveImportForm`.
+
+    **Template:**
+
+    :template:`team/import_archive.html`
+    """
+    if request.method == "POST":
+        form = ArchiveImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                result = import_archive(
+                    team,
+                    request.user,
+                    form.cleaned_data["zip_file"],
+                    mode=form.cleaned_data["mode"] or INSERT,
+                )
+            except Exception as e:
+                messages.error(request, f"Import failed: {e}")
+            else:
+                for item in result.seasons:
+                    messages.success(
+                        request,
+                        f"{item.file_name}: {item.result.created} match "
+                        f"record(s) imported into {item.season}"
+                        f"{' (new season)' if item.season_created else ''}, "
+                        f"{item.result.updated} updated and "
+                        f"{item.result.unchanged} unchanged.",
+                    )
+                return redirect("dashboard")
+    else:
+        form = ArchiveImportForm()
+
+    return render(
+        request, "team/import_archive.html", {"form": form, "team": team}
+    )
+
+
+@login_required
+def import_job_status_view(request, team_slug, season_slug, job_id):
+    """
+    Returns the progress of an :model:`team.ImportJob` as JSON.
+
+    The response reports the job status, rows processed, warnings, any
+    error and the throughput in rows per second.
+    """
+    job = get_object_or_404(
+        ImportJob,
+        id=job_id,
+        season__slug=season_slug,
+        season__team__slug=team_slug,
+        contributor=request.user,
+    )
+    return JsonResponse(
+        {
+            "id": job.id,
+            "status": job.status,
+            "rows_processed": job.rows_processed,
+            "rows_per_second": round(job.rows_per_second, 1),
+            "warnings": job.warnings,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+    )
+
+
+def _export_format(request):
+    export_format = request.GET.get("format", "tsv")
+    return export_format if export_format in EXPORT_FORMATS else "tsv"
+
+
+@login_required
+@resolve_route
+def export_season_view(request, team, season):
+    """
+    Streams every :model:`team.Match` of a :model:`team.Season` as a file.
+
+    The file uses the import columns, so it can be imported again
+    unchanged. ``?format=csv`` selects CSV instead of the default TSV.
+    """
+    export_format = _export_format(request)
+    _, content_type = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(
+        iter_season_export(season, export_format),
+        content_type=f"{content_type}; charset=utf-8",
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{season_file_name(season, export_format)}"'
+    )
+    return response
+
+
+@login_required
+@resolve_route
+def export_team_view(request, team):
+    """
+    Streams a zip archive of every :model:`team.Season` of a :model:`team.Team`.
+
+    The archive holds one file per season and can be loaded again with
+    the archive import. ``?format=csv`` selects CSV files instead of TSV.
+    """
+    response = StreamingHttpResponse(
+        iter_team_export(team, _export_format(request)),
+        content_type="application/zip",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{team.slug}.zip"'
+    return response
+
+
+@login_required
+@season_condition
+@resolve_route
+async def match_detail_view(request, team, season, match):
     """
     Displays detailed information for a single :model:`team.Match`.
 
+    Conditional GETs are answered with 304 while its season is unchanged.
+
     **Context**
 
     ``team``
@@ -402,11 +644,7 @@ def match_detail_view(request, team_slug, season_slug, match_id):
 
     :template:`team/match_detail.html`
     """
-    team = get_object_or_404(Team, slug=team_slug)
-    season = get_object_or_404(Season, slug=season_slug, team=team)
-    match = get_object_or_404(Match, id=match_id, season=season)
-
-    return render(
+    return await sync_to_async(render)(
         request,
         "team/match_detail.html",
         {